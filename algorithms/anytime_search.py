@@ -0,0 +1,155 @@
+from data_strucutres.descriptors import AnytimeSearchResult, SearchStats
+from data_strucutres.node_store import NodeStore
+from data_strucutres.search_budget import SearchBudget
+from algorithms.search_algorithms import getSuccessorFunction
+from array import array
+import heapq
+import time
+
+
+class ARA_STAR:
+    """Anytime repairing A*, weighted A* searches with decreasing weight reusing each other's work"""
+    @staticmethod
+    def search(starting_state, ending_states, transitions, heuristic, weight: float = 3.0, weight_step: float = 0.5,
+            budget: SearchBudget = None, stats: SearchStats = None) -> AnytimeSearchResult:
+        """Finds a path quickly and improves it until it is optimal or the budget runs out
+
+        Every iteration expands states by f = g + weight * h until no open state can improve the best solution.
+        States whose cost decreased after they were expanded are kept aside as inconsistent. The next
+        iteration lowers the weight, moves inconsistent states back to open and reorders open, so states
+        are only expanded again if a cheaper path to them was found.
+
+        The bound is the lower of the weight of the last finished iteration and cost / min(g + h) over open
+        and inconsistent states, the latter holds even when the budget stops an iteration halfway.
+
+        Args:
+            starting_state: State from which to start search
+            ending_states: States which end the search if found
+            transitions: dict of transitions or StateSpace generating them on demand
+            heuristic: Admissible heuristic value of every state, indexed by state
+            weight (float): Heuristic weight of the first iteration, at least 1
+            weight_step (float): Amount by which weight is lowered after every iteration
+            budget (SearchBudget): Limits after which the best solution found so far is returned, counted over all iterations
+            stats (SearchStats): Filled with counters of the search if given
+
+        Returns:
+            AnytimeSearchResult: Best solution and its suboptimality bound, states_visited counts expansions of all iterations.
+                BudgetExceededResult if budget ran out before any solution was found
+        """
+        inf = float("inf")
+        if(weight < 1 or weight_step <= 0):
+            raise ValueError(f"Invalid weight {weight} or weight step {weight_step}, expected weight >= 1 and step > 0")
+        start_ns = time.perf_counter_ns()
+        next_check = budget.nextCheck(0) if budget is not None else inf
+        successors, state_name = getSuccessorFunction(transitions)
+        goals = set(ending_states)
+        store = NodeStore()
+        ids = store.ids
+        states = store.states
+        costs = store.costs
+        parents = store.parents
+        closed = store.closed
+        add = store.add
+        heuristics = array('d')
+
+        starting_id = add(starting_state, -1, 0.0)
+        heuristics.append(heuristic[starting_state])
+        open_ids = {starting_id}
+        inconsistent = set()
+        heap = [(weight * heuristics[starting_id], starting_id)]
+        best_goal = starting_id if starting_state in goals else -1
+        best_cost = 0.0 if best_goal != -1 else inf
+        solutions = []
+        bound = inf
+        exceeded = None
+        expanded = 0
+        generated = 0
+        pushes = 1
+        pops = 0
+        stale_pops = 0
+        reopenings = 0
+        peak_frontier = 0
+
+        while(True):
+            #improve path with current weight
+            while(heap):
+                if(len(open_ids) > peak_frontier):
+                    peak_frontier = len(open_ids)
+                f, state = heap[0]
+                if(state not in open_ids or f != costs[state] + weight * heuristics[state]):
+                    #entry of a state already expanded or of an outdated cost or weight
+                    heapq.heappop(heap)
+                    stale_pops += 1
+                    continue
+                if(best_cost <= f):
+                    break
+                if(expanded >= next_check):
+                    exceeded = budget.check(start_ns, expanded, len(open_ids))
+                    if(exceeded is not None):
+                        break
+                    next_check = budget.nextCheck(expanded)
+                heapq.heappop(heap)
+                pops += 1
+                open_ids.remove(state)
+                closed[state] = 1
+                expanded += 1
+
+                cost = costs[state]
+                neighbour_states = successors(states[state])
+                generated += len(neighbour_states)
+                for next_state, transition_cost in neighbour_states:
+                    next_cost = cost + transition_cost
+                    next_id = ids.get(next_state)
+                    if(next_id is None):
+                        next_id = add(next_state, state, next_cost)
+                        heuristics.append(heuristic[next_state])
+                    elif(next_cost < costs[next_id]):
+                        parents[next_id] = state
+                        costs[next_id] = next_cost
+                    else:
+                        continue
+                    if(next_cost < best_cost and next_state in goals):
+                        best_cost = next_cost
+                        best_goal = next_id
+                    if(closed[next_id]):
+                        #expanded in this iteration already, it is expanded again only in the next one
+                        inconsistent.add(next_id)
+                    else:
+                        open_ids.add(next_id)
+                        heapq.heappush(heap, (next_cost + weight * heuristics[next_id], next_id))
+                        pushes += 1
+
+            #every cheaper path passes through an open or inconsistent state, so min(g + h) of them is a lower bound of optimal cost
+            lower_bound = min((costs[x] + heuristics[x] for x in open_ids | inconsistent), default=inf)
+            if(best_goal != -1):
+                #bound of an earlier iteration still holds, the solution can only have improved since
+                bound = min(bound, 1.0 if best_cost <= lower_bound else (best_cost / lower_bound if lower_bound > 0 else inf))
+                if(exceeded is None):
+                    bound = min(bound, weight)
+                if(not solutions or best_cost < solutions[-1][1] or bound < solutions[-1][2]):
+                    solutions.append(((time.perf_counter_ns() - start_ns) / 1e6, best_cost, bound))
+            if(exceeded is not None or bound <= 1.0 or (not open_ids and not inconsistent)):
+                break
+
+            weight = max(1.0, weight - weight_step)
+            reopenings += len(inconsistent)
+            open_ids |= inconsistent
+            inconsistent = set()
+            closed[:] = bytes(len(closed))
+            heap = [(costs[x] + weight * heuristics[x], x) for x in open_ids]
+            heapq.heapify(heap)
+            pushes += len(heap)
+
+        if(stats is not None):
+            stats.record(time.perf_counter_ns() - start_ns, expanded=expanded, generated=generated, pushes=pushes, pops=pops + stale_pops,
+                stale_pops=stale_pops, reopenings=reopenings, peak_frontier=peak_frontier, peak_closed=len(store))
+        if(best_goal == -1):
+            return exceeded if exceeded is not None else AnytimeSearchResult(False, weight=weight)
+        search_result = store.buildSearchResult(best_goal, expanded, state_name)
+        #cost of a state may have dropped after its successors on the path were reached, so the path can be cheaper than g of the goal
+        path_states = [states[x] for x in store.getPathIds(best_goal)]
+        total_cost = 0.0
+        for state, next_state in zip(path_states, path_states[1:]):
+            total_cost += min(cost for x, cost in successors(state) if x == next_state)
+        return AnytimeSearchResult(True, search_result.states_visited, search_result.path_length, total_cost, search_result.path, search_result.node,
+            bound, weight, solutions, exceeded.reason if exceeded is not None else None)
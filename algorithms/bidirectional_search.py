@@ -0,0 +1,236 @@
+from data_strucutres.descriptors import SearchResult, SearchStats
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.search_budget import SearchBudget
+import heapq
+import time
+
+
+def buildBidirectionalResult(graph: CompiledGraph, parents: list[int], next_states: list[int], meet_from: int, meet_to: int, total_cost: float, states_visited: int) -> SearchResult:
+    """Joins forward and backward search trees at the meeting transition and maps path back to state names
+
+    Args:
+        graph (CompiledGraph): Graph that was searched
+        parents (list[int]): Previous state on the forward path for every state reached from start, -1 for starting state
+        next_states (list[int]): Next state on the backward path for every state reached from goals, -1 for ending states
+        meet_from (int): Last state of forward path
+        meet_to (int): First state of backward path, same as meet_from if searches met in a state
+        total_cost (float): Cost of the path
+        states_visited (int): Number of states both searches visited
+
+    Returns:
+        SearchResult: Information about search
+    """
+    path_ids = []
+    state = meet_from
+    while(state != -1):
+        path_ids.append(state)
+        state = parents[state]
+    path_ids.reverse()
+    state = meet_to if meet_to != meet_from else next_states[meet_from]
+    while(state != -1):
+        path_ids.append(state)
+        state = next_states[state]
+    names = graph.names
+    path = " => ".join([names[x] for x in path_ids]) + " "
+
+    return SearchResult(True, states_visited, len(path_ids), total_cost, path)
+
+
+class BidirectionalUCS:
+    """Bidirectional Dijkstra between starting state and the set of ending states"""
+    @staticmethod
+    def search(graph: CompiledGraph, reversed_graph: CompiledGraph, starting_state: int = None, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds shortest path by searching forward from starting state and backward from all ending states
+
+        Side with the cheaper frontier top is expanded. Search stops once the sum of both frontier tops
+        is not lower than the cheapest path found so far, which is then optimal.
+
+        Args:
+            graph (CompiledGraph): Graph to search
+            reversed_graph (CompiledGraph): graph.reversed()
+            starting_state (int): Id of the state from which to start search, graph.starting_state if None
+            stats (SearchStats): Filled with counters of the search if given, frontier and closed sizes are summed over both sides
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        if(starting_state is None):
+            starting_state = graph.starting_state
+        if(not graph.canReachGoal(starting_state)):
+            #starting state is a dead end of the pruned graph
+            return SearchResult(False)
+        n = graph.num_states
+        inf = float("inf")
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        dist = [[inf] * n, [inf] * n]
+        #parents of forward search, next states of backward search
+        links = [[-1] * n, [-1] * n]
+        closed = [bytearray(n), bytearray(n)]
+        adjacency = [(graph.offsets, graph.targets, graph.costs), (reversed_graph.offsets, reversed_graph.targets, reversed_graph.costs)]
+        queues = [[(0.0, starting_state)], []]
+        dist[0][starting_state] = 0.0
+        for state in graph.ending_states:
+            dist[1][state] = 0.0
+            queues[1].append((0.0, state))
+        heapq.heapify(queues[1])
+
+        best_cost = inf
+        meet = None
+        if(graph.goal_mask[starting_state]):
+            best_cost = 0.0
+            meet = (starting_state, starting_state)
+        states_visited = 0
+        generated = 0
+        pushes = len(queues[0]) + len(queues[1])
+        pops = 0
+        peak_frontier = 0
+        exceeded = None
+
+        while(queues[0] and queues[1]):
+            if(queues[0][0][0] + queues[1][0][0] >= best_cost):
+                break
+            if(len(queues[0]) + len(queues[1]) > peak_frontier):
+                peak_frontier = len(queues[0]) + len(queues[1])
+            if(states_visited >= next_check):
+                exceeded = budget.check(start_ns, states_visited, len(queues[0]) + len(queues[1]))
+                if(exceeded is not None):
+                    break
+                next_check = budget.nextCheck(states_visited)
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            cost, state = heappop(queues[side])
+            pops += 1
+            side_closed = closed[side]
+            if(side_closed[state]):
+                continue
+            side_closed[state] = 1
+            states_visited += 1
+            side_dist = dist[side]
+            other_dist = dist[side ^ 1]
+            side_links = links[side]
+            offsets, targets, costs = adjacency[side]
+            generated += offsets[state + 1] - offsets[state]
+            for edge in range(offsets[state], offsets[state + 1]):
+                next_state = targets[edge]
+                next_cost = cost + costs[edge]
+                if(next_cost < side_dist[next_state]):
+                    side_dist[next_state] = next_cost
+                    side_links[next_state] = state
+                    heappush(queues[side], (next_cost, next_state))
+                    pushes += 1
+                #path through this transition joins both searches
+                total_cost = next_cost + other_dist[next_state]
+                if(total_cost < best_cost):
+                    best_cost = total_cost
+                    meet = (state, next_state) if side == 0 else (next_state, state)
+
+        if(stats is not None):
+            stats.record(time.perf_counter_ns() - start_ns, expanded=states_visited, generated=generated, pushes=pushes, pops=pops,
+                stale_pops=pops - states_visited, peak_frontier=peak_frontier, peak_closed=states_visited)
+        if(exceeded is not None):
+            return exceeded
+        if(meet is None):
+            return SearchResult(False)
+        return buildBidirectionalResult(graph, links[0], links[1], meet[0], meet[1], best_cost, states_visited)
+
+
+class BidirectionalBFS:
+    """Bidirectional breadth first search between starting state and the set of ending states"""
+    @staticmethod
+    def search(graph: CompiledGraph, reversed_graph: CompiledGraph, starting_state: int = None, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds path with the least transitions by searching forward from starting state and backward from all ending states
+
+        Whole layers are expanded, always on the side with the smaller frontier. Once a layer reaches
+        states seen by the other side, the meeting with the fewest transitions is taken.
+
+        Args:
+            graph (CompiledGraph): Graph to search
+            reversed_graph (CompiledGraph): graph.reversed()
+            starting_state (int): Id of the state from which to start search, graph.starting_state if None
+            stats (SearchStats): Filled with counters of the search if given, frontier and closed sizes are summed over both sides
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        if(starting_state is None):
+            starting_state = graph.starting_state
+        if(not graph.canReachGoal(starting_state)):
+            #starting state is a dead end of the pruned graph
+            return SearchResult(False)
+        n = graph.num_states
+        if(graph.goal_mask[starting_state]):
+            if(stats is not None):
+                stats.record(time.perf_counter_ns() - start_ns, pushes=1, pops=1, peak_frontier=1, peak_closed=1)
+            return SearchResult(True, 1, 1, 0.0, graph.names[starting_state] + " ")
+
+        #number of transitions and their cost from starting state or to ending states, -1 if not reached
+        depth = [[-1] * n, [-1] * n]
+        dist = [[0.0] * n, [0.0] * n]
+        links = [[-1] * n, [-1] * n]
+        adjacency = [(graph.offsets, graph.targets, graph.costs), (reversed_graph.offsets, reversed_graph.targets, reversed_graph.costs)]
+        layers = [[starting_state], list(graph.ending_states)]
+        depth[0][starting_state] = 0
+        for state in graph.ending_states:
+            depth[1][state] = 0
+        states_visited = 0
+        generated = 0
+        pushes = len(layers[0]) + len(layers[1])
+        peak_frontier = 0
+        search_result = SearchResult(False)
+        exceeded = None
+
+        while(layers[0] and layers[1]):
+            if(len(layers[0]) + len(layers[1]) > peak_frontier):
+                peak_frontier = len(layers[0]) + len(layers[1])
+            side = 0 if len(layers[0]) <= len(layers[1]) else 1
+            side_depth = depth[side]
+            other_depth = depth[side ^ 1]
+            side_dist = dist[side]
+            side_links = links[side]
+            offsets, targets, costs = adjacency[side]
+            best = None
+            next_layer = []
+            for state in layers[side]:
+                if(states_visited >= next_check):
+                    exceeded = budget.check(start_ns, states_visited, len(layers[0]) + len(layers[1]) + len(next_layer))
+                    if(exceeded is not None):
+                        break
+                    next_check = budget.nextCheck(states_visited)
+                states_visited += 1
+                state_depth = side_depth[state] + 1
+                state_cost = side_dist[state]
+                generated += offsets[state + 1] - offsets[state]
+                for edge in range(offsets[state], offsets[state + 1]):
+                    next_state = targets[edge]
+                    if(other_depth[next_state] != -1):
+                        transitions = state_depth + other_depth[next_state]
+                        if(best is None or transitions < best[0]):
+                            best = (transitions, state, next_state, state_cost + costs[edge])
+                    if(side_depth[next_state] == -1):
+                        side_depth[next_state] = state_depth
+                        side_dist[next_state] = state_cost + costs[edge]
+                        side_links[next_state] = state
+                        next_layer.append(next_state)
+            pushes += len(next_layer)
+            if(exceeded is not None):
+                search_result = exceeded
+                break
+            if(best is not None):
+                transitions, state, next_state, cost = best
+                total_cost = cost + dist[side ^ 1][next_state]
+                meet = (state, next_state) if side == 0 else (next_state, state)
+                search_result = buildBidirectionalResult(graph, links[0], links[1], meet[0], meet[1], total_cost, states_visited)
+                break
+            layers[side] = next_layer
+
+        if(stats is not None):
+            stats.record(time.perf_counter_ns() - start_ns, expanded=states_visited, generated=generated, pushes=pushes, pops=states_visited,
+                peak_frontier=peak_frontier, peak_closed=states_visited)
+        return search_result
@@ -0,0 +1,280 @@
+from data_strucutres.descriptors import SearchResult, SearchStats
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.frontiers import selectFrontier
+from data_strucutres.search_budget import SearchBudget
+from collections import deque
+import time
+
+
+def buildSearchResult(graph: CompiledGraph, parents: list[int], goal: int, total_cost: float, states_visited: int) -> SearchResult:
+    """Reconstructs path to goal from parent ids and maps it back to state names
+
+    Args:
+        graph (CompiledGraph): Graph that was searched
+        parents (list[int]): Id of the previous state on the path for every reached state, -1 for starting state
+        goal (int): Id of the goal state that was found
+        total_cost (float): Cost of the path to goal
+        states_visited (int): Number of states algorithm visited during search
+
+    Returns:
+        SearchResult: Information about search
+    """
+    path_ids = []
+    state = goal
+    while(state != -1):
+        path_ids.append(state)
+        state = parents[state]
+    path_ids.reverse()
+    names = graph.names
+    path = " => ".join([names[x] for x in path_ids]) + " "
+
+    return SearchResult(True, states_visited, len(path_ids), total_cost, path)
+
+
+class CompiledUCS:
+    """Uniform cost search over CompiledGraph"""
+    @staticmethod
+    def search(graph: CompiledGraph, starting_state: int = None, frontier: str = "heap", stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds shortest path
+
+        Args:
+            graph (CompiledGraph): Graph to search
+            starting_state (int): Id of the state from which to start search, graph.starting_state if None
+            frontier (str): Frontier backend, see data_strucutres.frontiers.selectFrontier
+            stats (SearchStats): Filled with counters of the search if given
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        if(starting_state is None):
+            starting_state = graph.starting_state
+        if(not graph.canReachGoal(starting_state)):
+            #starting state is a dead end of the pruned graph
+            return SearchResult(False)
+        n = graph.num_states
+        offsets = graph.offsets
+        targets = graph.targets
+        costs = graph.costs
+        goal_mask = graph.goal_mask
+        inf = float("inf")
+        dist = [inf] * n
+        parents = [-1] * n
+        closed = bytearray(n)
+        states_visited = 0
+        p_q = selectFrontier(frontier, graph)
+        push = p_q.push
+        pop = p_q.pop
+
+        search_result = SearchResult(False)
+        generated = 0
+        pushes = 1
+        peak_frontier = 0
+        #counters are only updated if stats are collected
+        counting = stats is not None
+
+        dist[starting_state] = 0.0
+        push(starting_state, 0.0)
+        while(p_q.size):
+            if(counting and p_q.size > peak_frontier):
+                peak_frontier = p_q.size
+            if(states_visited >= next_check):
+                exceeded = budget.check(start_ns, states_visited, p_q.size)
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(states_visited)
+            state = pop()[1]
+            cost = dist[state]
+            closed[state] = 1
+            states_visited += 1
+            #found solution
+            if(goal_mask[state]):
+                search_result = buildSearchResult(graph, parents, state, cost, states_visited)
+                break
+            if(counting):
+                generated += offsets[state + 1] - offsets[state]
+            for edge in range(offsets[state], offsets[state + 1]):
+                next_state = targets[edge]
+                if(closed[next_state]):
+                    continue
+                next_cost = cost + costs[edge]
+                if(next_cost < dist[next_state]):
+                    dist[next_state] = next_cost
+                    parents[next_state] = state
+                    push(next_state, next_cost)
+                    if(counting):
+                        pushes += 1
+
+        if(stats is not None):
+            stats.record(time.perf_counter_ns() - start_ns, expanded=states_visited - search_result.found_solution, generated=generated,
+                pushes=pushes, pops=states_visited, peak_frontier=peak_frontier, peak_closed=states_visited)
+        return search_result
+
+
+class CompiledBFS:
+    """Breadth first search over CompiledGraph"""
+    @staticmethod
+    def search(graph: CompiledGraph, starting_state: int = None, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds path with the least transitions
+
+        Args:
+            graph (CompiledGraph): Graph to search
+            starting_state (int): Id of the state from which to start search, graph.starting_state if None
+            stats (SearchStats): Filled with counters of the search if given
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        if(starting_state is None):
+            starting_state = graph.starting_state
+        if(not graph.canReachGoal(starting_state)):
+            #starting state is a dead end of the pruned graph
+            return SearchResult(False)
+        n = graph.num_states
+        offsets = graph.offsets
+        targets = graph.targets
+        costs = graph.costs
+        goal_mask = graph.goal_mask
+        dist = [0.0] * n
+        parents = [-1] * n
+        seen = bytearray(n)
+        states_visited = 0
+
+        search_result = SearchResult(False)
+        generated = 0
+        peak_frontier = 0
+        #counters are only updated if stats are collected
+        counting = stats is not None
+
+        seen[starting_state] = 1
+        q = deque([starting_state])
+        while(q):
+            if(counting and len(q) > peak_frontier):
+                peak_frontier = len(q)
+            if(states_visited >= next_check):
+                exceeded = budget.check(start_ns, states_visited, len(q))
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(states_visited)
+            state = q.popleft()
+            states_visited += 1
+            if(goal_mask[state]):
+                search_result = buildSearchResult(graph, parents, state, dist[state], states_visited)
+                break
+            cost = dist[state]
+            if(counting):
+                generated += offsets[state + 1] - offsets[state]
+            for edge in range(offsets[state], offsets[state + 1]):
+                next_state = targets[edge]
+                #don't make cycles
+                if(not seen[next_state]):
+                    seen[next_state] = 1
+                    dist[next_state] = cost + costs[edge]
+                    parents[next_state] = state
+                    q.append(next_state)
+
+        if(stats is not None):
+            #every state is pushed once, when it is seen
+            stats.record(time.perf_counter_ns() - start_ns, expanded=states_visited - search_result.found_solution, generated=generated,
+                pushes=states_visited + len(q), pops=states_visited, peak_frontier=peak_frontier, peak_closed=states_visited)
+        return search_result
+
+
+class CompiledA_STAR:
+    """A* shortest path algorithm over CompiledGraph"""
+    @staticmethod
+    def search(graph: CompiledGraph, heuristic, starting_state: int = None, frontier: str = "heap", stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds shortest path
+
+        Args:
+            graph (CompiledGraph): Graph to search
+            heuristic: Heuristic value of every state indexed by state id, see CompiledGraph.compileHeuristic
+            starting_state (int): Id of the state from which to start search, graph.starting_state if None
+            frontier (str): Frontier backend, see data_strucutres.frontiers.selectFrontier
+            stats (SearchStats): Filled with counters of the search if given
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        if(starting_state is None):
+            starting_state = graph.starting_state
+        if(not graph.canReachGoal(starting_state)):
+            #starting state is a dead end of the pruned graph
+            return SearchResult(False)
+        n = graph.num_states
+        offsets = graph.offsets
+        targets = graph.targets
+        costs = graph.costs
+        goal_mask = graph.goal_mask
+        inf = float("inf")
+        g = [inf] * n
+        parents = [-1] * n
+        closed = bytearray(n)
+        closed_count = 0
+        open = selectFrontier(frontier, graph, heuristic)
+        push = open.push
+        pop = open.pop
+
+        search_result = SearchResult(False)
+        expanded = 0
+        generated = 0
+        pushes = 1
+        reopenings = 0
+        peak_frontier = 0
+        peak_closed = 0
+        #counters are only updated if stats are collected
+        counting = stats is not None
+
+        g[starting_state] = 0.0
+        push(starting_state, heuristic[starting_state])
+        while(open.size):
+            if(counting and open.size > peak_frontier):
+                peak_frontier = open.size
+            if(expanded >= next_check):
+                exceeded = budget.check(start_ns, expanded, open.size)
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(expanded)
+            state = pop()[1]
+            cost = g[state]
+            if(goal_mask[state]):
+                search_result = buildSearchResult(graph, parents, state, cost, closed_count)
+                break
+            closed[state] = 1
+            closed_count += 1
+            expanded += 1
+
+            if(counting):
+                generated += offsets[state + 1] - offsets[state]
+            for edge in range(offsets[state], offsets[state + 1]):
+                next_state = targets[edge]
+                next_cost = cost + costs[edge]
+                if(next_cost < g[next_state]):
+                    if(closed[next_state]):
+                        #we found better path -> reopen state
+                        if(closed_count > peak_closed):
+                            peak_closed = closed_count
+                        reopenings += 1
+                        closed[next_state] = 0
+                        closed_count -= 1
+                    g[next_state] = next_cost
+                    parents[next_state] = state
+                    push(next_state, next_cost + heuristic[next_state])
+                    if(counting):
+                        pushes += 1
+
+        if(stats is not None):
+            stats.record(time.perf_counter_ns() - start_ns, expanded=expanded, generated=generated, pushes=pushes,
+                pops=expanded + search_result.found_solution, reopenings=reopenings, peak_frontier=peak_frontier, peak_closed=max(peak_closed, closed_count))
+        return search_result
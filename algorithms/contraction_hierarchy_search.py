@@ -0,0 +1,118 @@
+from data_strucutres.descriptors import SearchResult, SearchStats
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.contraction_hierarchy import ContractionHierarchy
+from data_strucutres.search_budget import SearchBudget
+import heapq
+import time
+
+
+class ContractionHierarchySearch:
+    """Bidirectional search over contraction hierarchy"""
+    @staticmethod
+    def search(graph: CompiledGraph, hierarchy: ContractionHierarchy, starting_state: int = None, ending_states: list[int] = None, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds shortest path by searching upward from starting state and upward over reversed edges from all ending states
+
+        Each side stops once its frontier top is not lower than the cheapest path found so far, since
+        paths in the hierarchy only go up and then down. Shortcuts on the path are unpacked into transitions of graph.
+
+        Args:
+            graph (CompiledGraph): Graph hierarchy was built from
+            hierarchy (ContractionHierarchy): Hierarchy of graph
+            starting_state (int): Id of the state from which to start search, graph.starting_state if None
+            ending_states (list[int]): Ids of the states which end the search, graph.ending_states if None
+            stats (SearchStats): Filled with counters of the search if given, frontier and closed sizes are summed over both sides
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search, states_visited counts states settled by both sides
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        if(starting_state is None):
+            starting_state = graph.starting_state
+        if(ending_states is None):
+            ending_states = graph.ending_states
+        inf = float("inf")
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        #costs and edges leading to reached states, edge is (previous state, middle)
+        dist = [{starting_state: 0.0}, {state: 0.0 for state in ending_states}]
+        links = [{starting_state: None}, {state: None for state in ending_states}]
+        closed = [set(), set()]
+        queues = [[(0.0, starting_state)], [(0.0, state) for state in dist[1]]]
+        heapq.heapify(queues[1])
+        adjacency = [(hierarchy.up_offsets, hierarchy.up_targets, hierarchy.up_costs, hierarchy.up_middles),
+            (hierarchy.down_offsets, hierarchy.down_targets, hierarchy.down_costs, hierarchy.down_middles)]
+        best_cost = inf
+        meet = None
+        states_visited = 0
+        generated = 0
+        pushes = len(queues[0]) + len(queues[1])
+        pops = 0
+        peak_frontier = 0
+        exceeded = None
+
+        while(True):
+            tops = [queues[0][0][0] if queues[0] else inf, queues[1][0][0] if queues[1] else inf]
+            if(min(tops) >= best_cost):
+                break
+            if(len(queues[0]) + len(queues[1]) > peak_frontier):
+                peak_frontier = len(queues[0]) + len(queues[1])
+            if(states_visited >= next_check):
+                exceeded = budget.check(start_ns, states_visited, len(queues[0]) + len(queues[1]))
+                if(exceeded is not None):
+                    break
+                next_check = budget.nextCheck(states_visited)
+            side = 0 if tops[0] <= tops[1] else 1
+            cost, state = heappop(queues[side])
+            pops += 1
+            side_closed = closed[side]
+            if(state in side_closed):
+                continue
+            side_closed.add(state)
+            states_visited += 1
+            other_cost = dist[side ^ 1].get(state)
+            if(other_cost is not None and cost + other_cost < best_cost):
+                best_cost = cost + other_cost
+                meet = state
+            side_dist = dist[side]
+            side_links = links[side]
+            offsets, targets, costs, middles = adjacency[side]
+            generated += offsets[state + 1] - offsets[state]
+            for edge in range(offsets[state], offsets[state + 1]):
+                next_state = targets[edge]
+                next_cost = cost + costs[edge]
+                if(next_cost < side_dist.get(next_state, inf)):
+                    side_dist[next_state] = next_cost
+                    side_links[next_state] = (state, middles[edge])
+                    heappush(queues[side], (next_cost, next_state))
+                    pushes += 1
+
+        if(stats is not None):
+            stats.record(time.perf_counter_ns() - start_ns, expanded=states_visited, generated=generated, pushes=pushes, pops=pops,
+                stale_pops=pops - states_visited, peak_frontier=peak_frontier, peak_closed=states_visited)
+        if(exceeded is not None):
+            return exceeded
+        if(meet is None):
+            return SearchResult(False)
+
+        #forward part from meeting state back to start, then backward part from meeting state to goal
+        forward = []
+        state = meet
+        while(links[0][state] is not None):
+            prev_state, middle = links[0][state]
+            forward.append((prev_state, state, middle))
+            state = prev_state
+        path_ids = [starting_state]
+        for prev_state, state, middle in reversed(forward):
+            path_ids += hierarchy.unpack(prev_state, state, middle)
+        state = meet
+        while(links[1][state] is not None):
+            next_state, middle = links[1][state]
+            path_ids += hierarchy.unpack(state, next_state, middle)
+            state = next_state
+        names = graph.names
+        path = " => ".join([names[x] for x in path_ids]) + " "
+
+        return SearchResult(True, states_visited, len(path_ids), best_cost, path)
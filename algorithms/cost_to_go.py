@@ -0,0 +1,201 @@
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.descriptors import SearchResult
+from collections import OrderedDict
+from array import array
+import heapq
+
+
+class ReverseDijkstra:
+    """Multi-source Dijkstra over reversed graph used to find cost of the cheapest path to any ending state"""
+    @staticmethod
+    def search(graph: CompiledGraph, reversed_graph: CompiledGraph = None) -> array:
+        """Finds true cost-to-go (h*) of every state in one pass
+
+        Args:
+            graph (CompiledGraph): Graph whose ending states seed the search
+            reversed_graph (CompiledGraph): graph.reversed(), built if None
+
+        Returns:
+            array: Cost of the cheapest path to any ending state indexed by state id, inf if no ending state is reachable
+        """
+        return ShortestPathTree(graph, graph.ending_states, reversed_graph).distances()
+
+
+class ShortestPathTree:
+    """Reverse shortest path tree of a set of ending states, grown lazily
+
+    Multi-source Dijkstra over reversed graph is paused as soon as the requested state is settled
+    and resumed by the next request, so every state is settled at most once per tree.
+
+    Attributes:
+        graph (CompiledGraph): Graph whose paths are searched
+        ending_states (tuple[int, ...]): Ids of the roots of the tree, sorted
+        dist (array): Cost of the cheapest path to any ending state indexed by state id, inf if not reached yet
+        next_states (array): Next state on that path indexed by state id, -1 for ending states and unreached states
+        closed (bytearray): closed[i] is 1 if dist[i] is final
+        states_settled (int): Number of closed states
+    """
+    def __init__(self, graph: CompiledGraph, ending_states: list[int], reversed_graph: CompiledGraph = None):
+        if(reversed_graph is None):
+            reversed_graph = graph.reversed()
+        n = graph.num_states
+        self.graph = graph
+        self.reversed_graph = reversed_graph
+        self.ending_states = tuple(sorted(set(ending_states)))
+        self.dist = array('d', [float("inf")]) * n
+        self.next_states = array('i', [-1]) * n
+        self.closed = bytearray(n)
+        self.states_settled = 0
+        self.p_q = []
+        for state in self.ending_states:
+            self.dist[state] = 0.0
+            self.p_q.append((0.0, state))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by arrays of the tree"""
+        return len(self.dist) * (self.dist.itemsize + self.next_states.itemsize + 1) + 64 * len(self.p_q)
+
+    def settle(self, target: int = None) -> None:
+        """Resumes search until target is settled or every reachable state is settled
+
+        Args:
+            target (int): Id of the state whose distance is needed, None to complete the tree
+        """
+        closed = self.closed
+        if(target is not None and closed[target]):
+            return
+        offsets = self.reversed_graph.offsets
+        targets = self.reversed_graph.targets
+        costs = self.reversed_graph.costs
+        dist = self.dist
+        next_states = self.next_states
+        p_q = self.p_q
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        states_settled = self.states_settled
+
+        while(p_q):
+            cost, state = heappop(p_q)
+            if(closed[state]):
+                continue
+            closed[state] = 1
+            states_settled += 1
+            for edge in range(offsets[state], offsets[state + 1]):
+                prev_state = targets[edge]
+                prev_cost = cost + costs[edge]
+                if(prev_cost < dist[prev_state]):
+                    dist[prev_state] = prev_cost
+                    next_states[prev_state] = state
+                    heappush(p_q, (prev_cost, prev_state))
+            if(state == target):
+                break
+
+        self.states_settled = states_settled
+
+    def distances(self) -> array:
+        """Completes the tree
+
+        Returns:
+            array: Cost of the cheapest path to any ending state indexed by state id, inf if no ending state is reachable
+        """
+        self.settle()
+        return self.dist
+
+    def search(self, starting_state: int) -> SearchResult:
+        """Finds shortest path from starting state to any ending state of the tree
+
+        Once starting state is settled the path is read from the tree in O(path length).
+
+        Args:
+            starting_state (int): Id of the state from which to start
+
+        Returns:
+            SearchResult: Information about search, states_visited is number of states settled by this call
+        """
+        states_settled = self.states_settled
+        self.settle(starting_state)
+        total_cost = self.dist[starting_state]
+        if(total_cost == float("inf")):
+            return SearchResult(False)
+        path_ids = [starting_state]
+        next_states = self.next_states
+        state = next_states[starting_state]
+        while(state != -1):
+            path_ids.append(state)
+            state = next_states[state]
+        names = self.graph.names
+        path = " => ".join([names[x] for x in path_ids]) + " "
+
+        return SearchResult(True, self.states_settled - states_settled, len(path_ids), total_cost, path)
+
+
+class ShortestPathTreeCache:
+    """LRU cache of shortest path trees keyed by set of ending states
+
+    Attributes:
+        graph (CompiledGraph): Graph whose trees are cached
+        max_bytes (int): Trees are evicted, least recently used first, while their memory exceeds max_bytes.
+            The most recently used tree is always kept
+        trees (OrderedDict): Cached trees keyed by sorted tuple of ending state ids, least recently used first
+    """
+    def __init__(self, graph: CompiledGraph, max_bytes: int = 256 * 1024 * 1024, reversed_graph: CompiledGraph = None):
+        self.graph = graph
+        self.max_bytes = max_bytes
+        self._reversed_graph = reversed_graph
+        self.trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def reversed_graph(self) -> CompiledGraph:
+        """graph.reversed(), built once on first use and shared by all trees"""
+        if(self._reversed_graph is None):
+            self._reversed_graph = self.graph.reversed()
+        return self._reversed_graph
+
+    def get(self, ending_states: list[int] = None) -> ShortestPathTree:
+        """Gets tree of ending states, creating empty tree on miss
+
+        Args:
+            ending_states (list[int]): Ids of the ending states, graph.ending_states if None
+
+        Returns:
+            ShortestPathTree: Tree which is filled lazily by its searches
+        """
+        if(ending_states is None):
+            ending_states = self.graph.ending_states
+        key = tuple(sorted(set(ending_states)))
+        tree = self.trees.get(key)
+        if(tree is not None):
+            self.hits += 1
+            self.trees.move_to_end(key)
+            return tree
+
+        self.misses += 1
+        tree = ShortestPathTree(self.graph, key, self.reversed_graph)
+        self.trees[key] = tree
+        self.evict()
+        return tree
+
+    def evict(self) -> None:
+        """Evicts least recently used trees until memory limit is met"""
+        trees = self.trees
+        while(len(trees) > 1 and sum(tree.nbytes for tree in trees.values()) > self.max_bytes):
+            trees.popitem(last=False)
+
+    def search(self, starting_state: int, ending_states: list[int] = None) -> SearchResult:
+        """Finds shortest path using the cached tree of ending states
+
+        Args:
+            starting_state (int): Id of the state from which to start
+            ending_states (list[int]): Ids of the ending states, graph.ending_states if None
+
+        Returns:
+            SearchResult: Information about search, see ShortestPathTree.search
+        """
+        tree = self.get(ending_states)
+        search_result = tree.search(starting_state)
+        #tree may have grown
+        self.evict()
+        return search_result
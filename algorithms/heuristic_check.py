@@ -1,24 +1,65 @@
-from data_strucutres.descriptors import StateSpaceDescriptor, HeuristicDescriptor, ConsistentDescriptor, OptimisticDescriptor
-from algorithms.search_algorithms import UCS
+from data_strucutres.descriptors import StateSpaceDescriptor, HeuristicDescriptor, ConsistentDescriptor, OptimisticDescriptor, EdgeConsistentDescriptor
+from data_strucutres.compiled_graph import CompiledGraph
+from algorithms.cost_to_go import ReverseDijkstra, ShortestPathTreeCache
+from array import array
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class HeuristicCheck:
     @staticmethod
-    def checkConsistent(state_space_descriptor: StateSpaceDescriptor, heuristic_descriptor: HeuristicDescriptor):
+    def checkConsistent(state_space_descriptor: StateSpaceDescriptor, heuristic_descriptor: HeuristicDescriptor) -> ConsistentDescriptor:
+        """Checks h(from) <= h(to) + c for every transition, conditions are evaluated while the report is written"""
         states = sorted(state_space_descriptor.states, key=lambda x: x)
-        consistent_descriptor = ConsistentDescriptor()
-        for state_from in states:
-            states_to = state_space_descriptor.getStateTransitions(state_from)
-            for state_to, cost in states_to:
-                consistent_descriptor.addEntry(state_from, state_to, heuristic_descriptor.getStateHeuristic(state_from), heuristic_descriptor.getStateHeuristic(state_to), cost)
-        
-        return consistent_descriptor
-
-    def checkOptimisitc(state_space_descriptor: StateSpaceDescriptor, heuristic_descriptor: HeuristicDescriptor):
+
+        return ConsistentDescriptor(states, state_space_descriptor, heuristic_descriptor.pairs)
+
+    @staticmethod
+    def checkConsistentVectorized(graph: CompiledGraph, heuristic, violations_only: bool = False) -> EdgeConsistentDescriptor:
+        """Checks h(from) <= h(to) + c for every transition at once over edge arrays
+
+        Uses a single NumPy operation if NumPy is installed, otherwise a single pass over the arrays.
+
+        Args:
+            graph (CompiledGraph): Compiled state space
+            heuristic: Heuristic value of every state indexed by state id, see CompiledGraph.compileHeuristic
+            violations_only (bool): If True formatted output contains only violated conditions
+
+        Returns:
+            EdgeConsistentDescriptor: Indices of violated transitions
+        """
+        n = graph.num_states
+        offsets = graph.offsets
+        if(numpy is not None):
+            np_offsets = numpy.asarray(offsets, dtype=numpy.int64)
+            sources = numpy.repeat(numpy.arange(n, dtype=numpy.int32), numpy.diff(np_offsets))
+            np_targets = numpy.asarray(graph.targets, dtype=numpy.int32)
+            np_heuristic = numpy.asarray(heuristic, dtype=numpy.float64)
+            consistent = np_heuristic[sources] <= np_heuristic[np_targets] + numpy.asarray(graph.costs, dtype=numpy.float64)
+            violations = numpy.flatnonzero(~consistent).tolist()
+            sources = array('i', sources.tobytes())
+        else:
+            sources = array('i', bytes(4 * graph.num_transitions))
+            for state in range(n):
+                for edge in range(offsets[state], offsets[state + 1]):
+                    sources[edge] = state
+            h_from = [heuristic[x] for x in sources]
+            h_to = [heuristic[x] for x in graph.targets]
+            violations = [edge for edge, (a, b, c) in enumerate(zip(h_from, h_to, graph.costs)) if not a <= b + c]
+
+        return EdgeConsistentDescriptor(graph.names, sources, graph.targets, graph.costs, heuristic, violations, violations_only)
+
+    @staticmethod
+    def checkOptimisitc(state_space_descriptor: StateSpaceDescriptor, heuristic_descriptor: HeuristicDescriptor, cache: ShortestPathTreeCache = None) -> OptimisticDescriptor:
         states = sorted(state_space_descriptor.states, key=lambda x: x)
-        optimistic_descriptor = OptimisticDescriptor()
+        #true cost-to-go of every state from a single search over reversed graph
+        if(cache is not None):
+            #tree of ending states may already be (partly) built by searches
+            graph = cache.graph
+            costs_to_go = cache.get().distances()
+        else:
+            graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+            costs_to_go = ReverseDijkstra.search(graph)
 
-        for state in states:
-            search_result = UCS.search(state, state_space_descriptor.ending_states, state_space_descriptor.transitions)
-            optimistic_descriptor.addEntry(state, search_result.total_cost, heuristic_descriptor.getStateHeuristic(state))
-        
-        return optimistic_descriptor
\ No newline at end of file
+        return OptimisticDescriptor(states, graph, costs_to_go, heuristic_descriptor.pairs)
\ No newline at end of file
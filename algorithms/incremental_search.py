@@ -0,0 +1,240 @@
+from data_strucutres.descriptors import SearchResult, SearchStats
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.search_budget import SearchBudget
+from array import array
+import heapq
+import time
+
+
+class LPA_STAR:
+    """Lifelong planning A*, repeated A* on a graph whose transitions change between searches
+
+    Every state keeps its cost g and a one step lookahead rhs = min(g(p) + c(p, s)) over its predecessors.
+    A state is consistent when both are equal. Changing a transition only recomputes rhs of its target,
+    search then expands inconsistent states by key (min(g, rhs) + h, min(g, rhs)) until the goal is
+    consistent and no open state could lower its cost. States unaffected by the changes keep their costs
+    from earlier searches, so a small change is repaired by expanding only the states whose cost it changed.
+
+    All ending states are connected to a virtual goal by transitions of cost 0, so the engine needs
+    a heuristic only towards ending states, the same one A* gets. Transitions are kept in dicts of both
+    directions, parallel transitions are merged into the cheapest one. Every transition has to cost more
+    than 0, a cycle of transitions of cost 0 would keep supporting rhs of its states after the path into it
+    got more expensive.
+
+    Attributes:
+        graph (CompiledGraph): Graph from which transitions were copied, state ids and names are those of the graph
+        starting_state (int): Id of the state from which paths are searched
+    """
+    def __init__(self, graph: CompiledGraph, heuristic = None, starting_state: int = None):
+        """
+        Args:
+            graph (CompiledGraph): Graph to search, it is not modified by later changes
+            heuristic: Heuristic of every state id, e.g. from graph.compileHeuristic. It has to stay consistent
+                after every change, which holds when costs only increase. Zero heuristic if None
+            starting_state (int): Id of the state from which to start search, graph.starting_state if None
+
+        Raises:
+            ValueError: If graph has a transition which does not cost more than 0
+        """
+        inf = float("inf")
+        n = graph.num_states
+        self.graph = graph
+        self.goal = n
+        self.starting_state = graph.starting_state if starting_state is None else starting_state
+        self.successors = [{} for i in range(n + 1)]
+        self.predecessors = [{} for i in range(n + 1)]
+        offsets = graph.offsets
+        targets = graph.targets
+        costs = graph.costs
+        for state in range(n):
+            state_successors = self.successors[state]
+            for edge in range(offsets[state], offsets[state + 1]):
+                next_state = targets[edge]
+                cost = costs[edge]
+                if(not cost > 0):
+                    raise ValueError(f"Invalid transition cost {cost} from {graph.names[state]}, expected more than 0")
+                if(cost < state_successors.get(next_state, inf)):
+                    state_successors[next_state] = cost
+                    self.predecessors[next_state][state] = cost
+        for state in graph.ending_states:
+            self.successors[state][n] = 0.0
+            self.predecessors[n][state] = 0.0
+        self.heuristic = array('d', heuristic) if heuristic is not None else array('d', [0.0]) * n
+        self.heuristic.append(0.0)
+        self.g = array('d', [inf]) * (n + 1)
+        self.rhs = array('d', [inf]) * (n + 1)
+        #open states are those inconsistent, entries of states made consistent or queued again are skipped when popped
+        self.heap = []
+        self.rhs[self.starting_state] = 0.0
+        self.updateState(self.starting_state)
+
+    def key(self, state: int) -> tuple[float, float]:
+        """Gets priority of an inconsistent state"""
+        cost = min(self.g[state], self.rhs[state])
+        return (cost + self.heuristic[state], cost)
+
+    def updateState(self, state: int) -> None:
+        """Recomputes rhs of state from its predecessors and queues it if it became inconsistent"""
+        g = self.g
+        rhs = self.rhs
+        if(state != self.starting_state):
+            rhs[state] = min((g[x] + cost for x, cost in self.predecessors[state].items()), default=float("inf"))
+        if(g[state] != rhs[state]):
+            heapq.heappush(self.heap, self.key(state) + (state,))
+
+    def updateTransition(self, state_from: int, state_to: int, cost: float) -> None:
+        """Sets cost of the transition between two states, adding it if there is none
+
+        Changes are repaired lazily by the next search, so any number of them may be applied between searches.
+        Cost has to be more than 0, ValueError otherwise.
+        """
+        if(not cost > 0):
+            raise ValueError(f"Invalid transition cost {cost}, expected more than 0")
+        self.successors[state_from][state_to] = cost
+        self.predecessors[state_to][state_from] = cost
+        self.updateState(state_to)
+
+    def removeTransition(self, state_from: int, state_to: int) -> None:
+        """Removes transition between two states, KeyError if there is none"""
+        del self.successors[state_from][state_to]
+        del self.predecessors[state_to][state_from]
+        self.updateState(state_to)
+
+    def moveStart(self, starting_state: int) -> None:
+        """Searches from another starting state
+
+        Costs of all states are measured from the starting state, so every state whose shortest path
+        changes with it is repaired by the next search. It is cheap only when the new starting state is
+        on the previous shortest paths, e.g. when an agent moves along its path.
+        """
+        previous = self.starting_state
+        if(previous == starting_state):
+            return
+        self.starting_state = starting_state
+        self.rhs[starting_state] = 0.0
+        self.updateState(starting_state)
+        self.updateState(previous)
+
+    def getTransitionCost(self, state_from: int, state_to: int) -> float:
+        """Gets current cost of the transition between two states, inf if there is none"""
+        return self.successors[state_from].get(state_to, float("inf"))
+
+    def toCompiledGraph(self) -> CompiledGraph:
+        """Compiles current transitions, e.g. to search them again from scratch"""
+        n = self.goal
+        offsets = array('q', [0])
+        targets = array('i')
+        costs = array('d')
+        for state in range(n):
+            for next_state, cost in self.successors[state].items():
+                if(next_state != n):
+                    targets.append(next_state)
+                    costs.append(cost)
+            offsets.append(len(targets))
+        graph = CompiledGraph(self.graph.names, offsets, targets, costs, self.starting_state, self.graph.ending_states)
+        graph._ids = self.graph._ids
+        return graph
+
+    def search(self, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds shortest path from starting state to any ending state under current transitions
+
+        Args:
+            stats (SearchStats): Filled with counters of the search if given
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded.
+                Repair stopped by the budget is continued by the next search
+
+        Returns:
+            SearchResult: Information about search, states_visited counts states expanded by this search only
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        inf = float("inf")
+        goal = self.goal
+        g = self.g
+        rhs = self.rhs
+        heuristic = self.heuristic
+        heap = self.heap
+        successors = self.successors
+        update_state = self.updateState
+        expanded = 0
+        generated = 0
+        queued = len(heap)
+        pops = 0
+        stale_pops = 0
+        reopenings = 0
+        peak_frontier = 0
+
+        search_result = None
+        while(heap):
+            if(len(heap) > peak_frontier):
+                peak_frontier = len(heap)
+            entry = heap[0]
+            state = entry[2]
+            goal_cost = min(g[goal], rhs[goal])
+            if(g[state] == rhs[state] or entry[1] != min(g[state], rhs[state])):
+                #entry of a state made consistent or queued again with another key
+                heapq.heappop(heap)
+                stale_pops += 1
+                continue
+            #states with the key of the goal are expanded too, with transitions of cost 0 the goal may rely on them
+            if(g[goal] == rhs[goal] and (entry[0], entry[1]) > (goal_cost, goal_cost)):
+                break
+            if(expanded >= next_check):
+                exceeded = budget.check(start_ns, expanded, len(heap))
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(expanded)
+            heapq.heappop(heap)
+            pops += 1
+            expanded += 1
+            state_successors = successors[state]
+            generated += len(state_successors)
+            if(g[state] > rhs[state]):
+                #cheaper path was found, it can only lower rhs of successors
+                cost = rhs[state]
+                g[state] = cost
+                for next_state, transition_cost in state_successors.items():
+                    next_cost = cost + transition_cost
+                    if(next_cost < rhs[next_state]):
+                        rhs[next_state] = next_cost
+                        if(g[next_state] != next_cost):
+                            heapq.heappush(heap, (next_cost + heuristic[next_state], next_cost, next_state))
+            else:
+                #path got more expensive, state is reopened and successors which relied on it recomputed
+                reopenings += 1
+                g[state] = inf
+                update_state(state)
+                for next_state in state_successors:
+                    update_state(next_state)
+
+        if(stats is not None):
+            #every entry pushed during search was either popped or is still queued
+            pushes = len(heap) + pops + stale_pops - queued
+            stats.record(time.perf_counter_ns() - start_ns, expanded=expanded, generated=generated, pushes=pushes, pops=pops + stale_pops,
+                stale_pops=stale_pops, reopenings=reopenings, peak_frontier=peak_frontier, peak_closed=expanded)
+        if(search_result is not None):
+            return search_result
+        if(g[goal] == inf):
+            return SearchResult(False, expanded)
+        return self.buildSearchResult(expanded)
+
+    def getPathIds(self) -> list[int]:
+        """Gets ids of states on the shortest path by following the cheapest predecessor back from the goal"""
+        g = self.g
+        path_ids = []
+        state = self.goal
+        while(state != self.starting_state):
+            #costs are positive, so the cheapest predecessor has lower g and the walk cannot cycle
+            state = min(self.predecessors[state].items(), key=lambda x: g[x[0]] + x[1])[0]
+            path_ids.append(state)
+        path_ids.reverse()
+        return path_ids
+
+    def buildSearchResult(self, states_visited: int) -> SearchResult:
+        """Maps shortest path to state names"""
+        path_ids = self.getPathIds()
+        names = self.graph.names
+        path = " => ".join([names[x] for x in path_ids]) + " "
+
+        return SearchResult(True, states_visited, len(path_ids), self.g[self.goal], path)
@@ -0,0 +1,143 @@
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.descriptors import HeuristicDescriptor
+from algorithms.cost_to_go import ShortestPathTree
+from array import array
+
+
+class Landmarks:
+    """Landmarks of a compiled graph with exact distances from and to every landmark (ALT)
+
+    Attributes:
+        landmarks (list[int]): Ids of landmark states
+        from_distances (list[array]): from_distances[i][v] is cost of the cheapest path from landmark i to v, inf if unreachable
+        to_distances (list[array]): to_distances[i][v] is cost of the cheapest path from v to landmark i, inf if unreachable
+    """
+    def __init__(self, landmarks: list[int], from_distances: list, to_distances: list):
+        self.landmarks = landmarks
+        self.from_distances = from_distances
+        self.to_distances = to_distances
+
+    @staticmethod
+    def fromCompiledGraph(graph: CompiledGraph, k: int, reversed_graph: CompiledGraph = None) -> "Landmarks":
+        """Selects k landmarks by farthest point selection and computes their distances
+
+        First landmark is the state farthest from starting state, every next one is the state farthest from
+        all landmarks chosen so far. Distance between two states is the cheaper of both directions,
+        states not connected to a landmark in either direction are never chosen.
+
+        Args:
+            graph (CompiledGraph): Graph to preprocess
+            k (int): Number of landmarks, at most number of states
+            reversed_graph (CompiledGraph): graph.reversed(), built if None
+
+        Returns:
+            Landmarks: Landmarks and their distance arrays
+        """
+        if(reversed_graph is None):
+            reversed_graph = graph.reversed()
+        n = graph.num_states
+        inf = float("inf")
+        k = min(k, n)
+        landmarks = []
+        from_distances = []
+        to_distances = []
+        #distance of every state to the closest landmark chosen so far
+        closest = [inf] * n
+        candidate = graph.starting_state if graph.starting_state >= 0 else 0
+        if(k > 0):
+            #start from the state farthest from starting state
+            from_start = ShortestPathTree(reversed_graph, [candidate], graph).distances()
+            to_start = ShortestPathTree(graph, [candidate], reversed_graph).distances()
+            closest = [min(a, b) for a, b in zip(from_start, to_start)]
+
+        while(len(landmarks) < k):
+            best = -1.0
+            for state in range(n):
+                distance = closest[state]
+                if(distance != inf and distance > best):
+                    best = distance
+                    candidate = state
+            if(best <= 0.0 and landmarks):
+                #every connected state is already a landmark
+                break
+            landmarks.append(candidate)
+            #tree over reversed graph of reversed graph gives distances from landmark
+            from_distances.append(ShortestPathTree(reversed_graph, [candidate], graph).distances())
+            to_distances.append(ShortestPathTree(graph, [candidate], reversed_graph).distances())
+            for state, (a, b) in enumerate(zip(from_distances[-1], to_distances[-1])):
+                distance = min(a, b)
+                if(distance < closest[state]):
+                    closest[state] = distance
+
+        return Landmarks(landmarks, from_distances, to_distances)
+
+    @property
+    def k(self) -> int:
+        return len(self.landmarks)
+
+    def heuristic(self, graph: CompiledGraph, ending_states: list[int] = None) -> "LandmarkHeuristic":
+        """Creates ALT heuristic for a set of ending states
+
+        Args:
+            graph (CompiledGraph): Graph landmarks were computed for
+            ending_states (list[int]): Ids of the ending states, graph.ending_states if None
+
+        Returns:
+            LandmarkHeuristic: Heuristic indexed by state id
+        """
+        if(ending_states is None):
+            ending_states = graph.ending_states
+        return LandmarkHeuristic(self, graph, ending_states)
+
+
+class LandmarkHeuristic:
+    """ALT heuristic computed on demand from triangle inequality
+
+    For landmark L and ending states T, cost from v to T is at least d(v, L) - max(d(t, L)) and
+    at least min(d(L, t)) - d(L, v). The heuristic is the largest of these bounds and 0, so it is admissible
+    and consistent. Terms whose constant is infinite are dropped, infinite value means no ending state is reachable.
+
+    Indexed like a heuristic array, h = heuristic[state_id].
+    """
+    def __init__(self, landmarks: Landmarks, graph: CompiledGraph, ending_states: list[int]):
+        self.graph = graph
+        inf = float("inf")
+        self.to_terms = []
+        self.from_terms = []
+        for from_distance, to_distance in zip(landmarks.from_distances, landmarks.to_distances):
+            to_goal = max([to_distance[x] for x in ending_states], default=inf)
+            if(to_goal != inf):
+                self.to_terms.append((to_distance, to_goal))
+            from_goal = min([from_distance[x] for x in ending_states], default=inf)
+            if(from_goal != inf):
+                self.from_terms.append((from_distance, from_goal))
+
+    def __getitem__(self, state: int) -> float:
+        h = 0.0
+        for to_distance, to_goal in self.to_terms:
+            bound = to_distance[state] - to_goal
+            if(bound > h):
+                h = bound
+        for from_distance, from_goal in self.from_terms:
+            bound = from_goal - from_distance[state]
+            if(bound > h):
+                h = bound
+        return h
+
+    def __len__(self) -> int:
+        return self.graph.num_states
+
+    def __iter__(self):
+        for state in range(len(self)):
+            yield self[state]
+
+    def toArray(self) -> array:
+        """Computes heuristic of every state, indexed by state id"""
+        return array('d', self)
+
+    def toHeuristicDescriptor(self) -> HeuristicDescriptor:
+        """Computes heuristic of every state, keyed by state name"""
+        heuristic_descriptor = HeuristicDescriptor()
+        for name, value in zip(self.graph.names, self):
+            heuristic_descriptor.addPair(name, value)
+        return heuristic_descriptor
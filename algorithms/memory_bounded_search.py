@@ -0,0 +1,342 @@
+from data_strucutres.descriptors import SearchResult, SearchStats
+from data_strucutres.search_budget import SearchBudget
+from algorithms.search_algorithms import getSuccessorFunction
+import heapq
+import itertools
+import time
+
+
+def buildPathResult(path: list, state_name, total_cost: float, states_visited: int) -> SearchResult:
+    """Creates SearchResult from list of states on the path"""
+    return SearchResult(True, states_visited, len(path), total_cost, " => ".join([state_name(x) for x in path]) + " ")
+
+
+class IDA_STAR:
+    """Iterative deepening A*, keeps only the current path in memory"""
+    @staticmethod
+    def search(starting_state, ending_states, transitions, heuristic, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds shortest path with depth first searches bounded by f = g + h
+
+        Every iteration raises the bound to the lowest f that exceeded it in the previous iteration.
+
+        Args:
+            starting_state: State from which to start search
+            ending_states: States which end the search if found
+            transitions: dict of transitions or StateSpace generating them on demand
+            heuristic: Heuristic value of every state, indexed by state
+            stats (SearchStats): Filled with counters of the search if given, the frontier is the current path
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search, states_visited counts expansions of all iterations
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        successors, state_name = getSuccessorFunction(transitions)
+        inf = float("inf")
+        states_visited = 1
+        iterations = 0
+        generated = 0
+        pops = 0
+        peak_frontier = 1
+        search_result = SearchResult(False)
+        exceeded = None
+        bound = heuristic[starting_state]
+        if(starting_state in ending_states):
+            search_result = buildPathResult([starting_state], state_name, 0.0, states_visited)
+            iterations = 1
+            bound = inf
+
+        while(bound != inf):
+            iterations += 1
+            next_bound = inf
+            path = [starting_state]
+            on_path = {starting_state}
+            path_costs = [0.0]
+            iterators = [iter(successors(starting_state))]
+
+            while(iterators):
+                next_transition = next(iterators[-1], None)
+                if(next_transition is None):
+                    #all transitions of state explored -> backtrack
+                    iterators.pop()
+                    on_path.discard(path.pop())
+                    path_costs.pop()
+                    pops += 1
+                    continue
+                generated += 1
+                next_state, cost = next_transition
+                #don't make cycles
+                if(next_state in on_path):
+                    continue
+                next_cost = path_costs[-1] + cost
+                f = next_cost + heuristic[next_state]
+                if(f > bound):
+                    if(f < next_bound):
+                        next_bound = f
+                    continue
+                if(states_visited >= next_check):
+                    exceeded = budget.check(start_ns, states_visited, len(path))
+                    if(exceeded is not None):
+                        search_result = exceeded
+                        break
+                    next_check = budget.nextCheck(states_visited)
+                states_visited += 1
+                if(next_state in ending_states):
+                    path.append(next_state)
+                    search_result = buildPathResult(path, state_name, next_cost, states_visited)
+                    break
+                path.append(next_state)
+                on_path.add(next_state)
+                path_costs.append(next_cost)
+                iterators.append(iter(successors(next_state)))
+                if(len(path) > peak_frontier):
+                    peak_frontier = len(path)
+
+            if(search_result.found_solution or exceeded is not None):
+                break
+            bound = next_bound
+
+        if(stats is not None):
+            #every iteration pushes starting state again, every other state on the path is counted in states_visited
+            pushes = iterations + states_visited - 1
+            stats.record(time.perf_counter_ns() - start_ns, expanded=pushes - search_result.found_solution, generated=generated,
+                pushes=pushes, pops=pops, peak_frontier=peak_frontier)
+        return search_result
+
+
+class SMANode:
+    """Node of SMA* search tree
+
+    Attributes:
+        state: State of the node
+        cost (float): Cost of the path from starting state
+        f (float): Backed-up f value, lowest f of all paths through node known so far
+        depth (int): Number of transitions from starting state
+        prev_node (SMANode): Parent node, None for root
+        transitions (list): Transitions of state, None until node is selected for the first time
+        next_transition (int): Index of the next transition whose child has never been generated
+        children (dict): Child nodes currently kept in memory, keyed by state
+        forgotten (dict): f values of children dropped from memory, keyed by state
+        priority (float): Priority of node in open list
+        in_open (bool): True if node is in open list
+        version (int): Tie breaker of the current open list entry of node, older entries are ignored
+    """
+    __slots__ = ("state", "cost", "f", "depth", "prev_node", "transitions", "next_transition", "children", "forgotten", "priority", "in_open", "version")
+
+    def __init__(self, state, cost: float, f: float, depth: int, prev_node: "SMANode"):
+        self.state = state
+        self.cost = cost
+        self.f = f
+        self.depth = depth
+        self.prev_node = prev_node
+        self.transitions = None
+        self.next_transition = 0
+        self.children = {}
+        self.forgotten = {}
+        self.priority = f
+        self.in_open = False
+        self.version = 0
+
+    def fullyGenerated(self) -> bool:
+        """Checks if every child has been generated at least once"""
+        return self.transitions is not None and self.next_transition >= len(self.transitions)
+
+
+class SMA_STAR:
+    """Simplified memory-bounded A*, keeps at most a fixed number of nodes in memory"""
+    @staticmethod
+    def search(starting_state, ending_states, transitions, heuristic, max_nodes: int = 100000, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
+        """Finds shortest path using at most max_nodes nodes
+
+        Generates one child of the deepest lowest-f node at a time. When memory is full the shallowest
+        highest-f leaf is dropped and its f is remembered in its parent, so it is regenerated once it
+        becomes the most promising node again. Nodes at depth max_nodes - 1 which are not ending states
+        get infinite f, so a path is found if the shallowest optimal one fits in memory.
+
+        Args:
+            starting_state: State from which to start search
+            ending_states: States which end the search if found
+            transitions: dict of transitions or StateSpace generating them on demand
+            heuristic: Heuristic value of every state, indexed by state
+            max_nodes (int): Maximum number of nodes kept in memory, at least 2
+            stats (SearchStats): Filled with counters of the search if given, peak_closed is the most nodes kept in memory
+            budget (SearchBudget): Limits of the search counting generated children as expansions, BudgetExceededResult is returned once any is exceeded
+
+        Returns:
+            SearchResult: Information about search, states_visited counts generated children including regenerated ones
+        """
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        successors, state_name = getSuccessorFunction(transitions)
+        inf = float("inf")
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        counter = itertools.count()
+        max_nodes = max(max_nodes, 2)
+        #best node has lowest priority and is deepest, worst leaf has highest priority and is shallowest.
+        #entries hold only the tie breaker of a node in open_nodes, so outdated entries keep no node alive
+        best = []
+        worst = []
+        open_nodes = {}
+        pushes = 0
+        dropped = 0
+
+        def rebuild() -> None:
+            #outdated entries are dropped once they outnumber nodes in open
+            nonlocal pushes, dropped
+            dropped += len(best) - len(open_nodes)
+            best[:] = [(x.priority, -x.depth, tie) for tie, x in open_nodes.items()]
+            worst[:] = [(-x.priority, x.depth, tie) for tie, x in open_nodes.items()]
+            heapq.heapify(best)
+            heapq.heapify(worst)
+            pushes += len(best)
+
+        def update(node: SMANode) -> None:
+            #node is in open while it has children to (re)generate or while it is a leaf
+            nonlocal pushes
+            if(node.in_open):
+                del open_nodes[node.version]
+            pending = not node.fullyGenerated()
+            if(pending or node.forgotten or not node.children):
+                node.priority = node.f if pending or not node.forgotten else min(node.forgotten.values())
+                node.in_open = True
+                tie = next(counter)
+                node.version = tie
+                open_nodes[tie] = node
+                pushes += 1
+                heappush(best, (node.priority, -node.depth, tie))
+                heappush(worst, (-node.priority, node.depth, tie))
+                if(len(best) > 2 * len(open_nodes) + 64 or len(worst) > 2 * len(open_nodes) + 64):
+                    rebuild()
+            else:
+                node.in_open = False
+
+        def backup(node: SMANode) -> None:
+            #f of fully generated node is the lowest f of its children, known or forgotten
+            while(node is not None and node.fullyGenerated()):
+                new_f = min(min([child.f for child in node.children.values()], default=inf), min(node.forgotten.values(), default=inf))
+                if(new_f == node.f):
+                    return
+                node.f = new_f
+                update(node)
+                node = node.prev_node
+
+        def forgetWorstLeaf(current: SMANode) -> bool:
+            while(worst):
+                tie = heappop(worst)[2]
+                leaf = open_nodes.get(tie)
+                #nodes with children get a new entry once they become leaves again, current node once it is updated
+                if(leaf is None or leaf.children or leaf is current or leaf.prev_node is None):
+                    continue
+                del open_nodes[tie]
+                leaf.in_open = False
+                parent = leaf.prev_node
+                del parent.children[leaf.state]
+                parent.forgotten[leaf.state] = leaf.f
+                update(parent)
+                return True
+            return False
+
+        root = SMANode(starting_state, 0.0, heuristic[starting_state], 0, None)
+        update(root)
+        nodes = 1
+        states_visited = 0
+        expanded = 0
+        stale_pops = 0
+        peak_frontier = 0
+        peak_nodes = 1
+        search_result = SearchResult(False)
+
+        while(best):
+            if(len(open_nodes) > peak_frontier):
+                peak_frontier = len(open_nodes)
+            priority, depth, tie = best[0]
+            node = open_nodes.get(tie)
+            if(node is None):
+                heappop(best)
+                stale_pops += 1
+                continue
+            if(priority == inf):
+                break
+            if(node.state in ending_states):
+                path = []
+                cost = node.cost
+                while(node is not None):
+                    path.append(node.state)
+                    node = node.prev_node
+                path.reverse()
+                search_result = buildPathResult(path, state_name, cost, states_visited)
+                break
+            if(states_visited >= next_check):
+                exceeded = budget.check(start_ns, states_visited, len(best))
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(states_visited)
+
+            if(node.transitions is None):
+                expanded += 1
+                #keep only the cheapest of parallel transitions, children are keyed by state
+                cheapest = {}
+                for state, cost in successors(node.state):
+                    if(cost < cheapest.get(state, inf)):
+                        cheapest[state] = cost
+                node.transitions = list(cheapest.items())
+            ancestors = set()
+            ancestor = node
+            while(ancestor is not None):
+                ancestors.add(ancestor.state)
+                ancestor = ancestor.prev_node
+
+            #pick child which has never been generated, otherwise the best forgotten one
+            next_state = None
+            forgotten_f = None
+            while(node.next_transition < len(node.transitions)):
+                state, cost = node.transitions[node.next_transition]
+                node.next_transition += 1
+                #don't make cycles
+                if(state not in ancestors):
+                    next_state = state
+                    break
+            if(next_state is None and node.forgotten):
+                next_state = min(node.forgotten, key=node.forgotten.get)
+                forgotten_f = node.forgotten.pop(next_state)
+                cost = next(x[1] for x in node.transitions if x[0] == next_state)
+            if(next_state is None):
+                #every child is in memory or node is a dead end
+                backup(node)
+                update(node)
+                continue
+
+            if(nodes >= max_nodes):
+                if(not forgetWorstLeaf(node)):
+                    #every other node is on the path to node, child cannot be kept in memory
+                    node.forgotten[next_state] = inf
+                    backup(node)
+                    update(node)
+                    continue
+                nodes -= 1
+            states_visited += 1
+            next_cost = node.cost + cost
+            if(node.depth + 1 >= max_nodes - 1 and next_state not in ending_states):
+                #path through child cannot fit in memory
+                next_f = inf
+            else:
+                next_f = max(node.f, next_cost + heuristic[next_state])
+                if(forgotten_f is not None):
+                    next_f = max(next_f, forgotten_f)
+            #child is referenced only by its parent, so it is freed as soon as it is forgotten
+            node.children[next_state] = SMANode(next_state, next_cost, next_f, node.depth + 1, node)
+            nodes += 1
+            if(nodes > peak_nodes):
+                peak_nodes = nodes
+            update(node.children[next_state])
+            backup(node)
+            update(node)
+
+        if(stats is not None):
+            #entries are only popped from best once outdated or dropped by a rebuild, the rest are still there
+            stats.record(time.perf_counter_ns() - start_ns, expanded=expanded, generated=states_visited, pushes=pushes,
+                pops=stale_pops + dropped, stale_pops=stale_pops + dropped, peak_frontier=peak_frontier, peak_closed=peak_nodes)
+        return search_result
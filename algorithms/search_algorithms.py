@@ -1,152 +1,262 @@
-from data_strucutres.descriptors import SearchResult, Node
+from data_strucutres.descriptors import SearchResult, SearchStats
+from data_strucutres.node_store import NodeStore
+from data_strucutres.search_budget import SearchBudget
 from data_strucutres.priority_queue import PriorityQueue
-import queue
+from data_strucutres.state_space import StateSpace
+from collections import deque
+import heapq
+import time
+
+
+def getSuccessorFunction(transitions) -> tuple:
+    """Gets functions for generating transitions and naming states
+
+    Args:
+        transitions: dict of transitions or StateSpace
+
+    Returns:
+        tuple: Function returning transitions of a state and function returning name of a state
+    """
+    if(isinstance(transitions, StateSpace)):
+        return transitions.getStateTransitions, transitions.getStateName
+    return transitions.__getitem__, str
 
 
 class UCS:
     @staticmethod
-    def search(starting_state: str, ending_states: list[str], transitions: dict) -> SearchResult:
+    def search(starting_state: str, ending_states: list[str], transitions: dict, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
         """Finds shortest path
+
+        Parent and cost of every reached state are kept in a NodeStore, queue holds (cost, state, id) entries.
+        A state is pushed again only if a cheaper path to it is found.
+
+        Args:
+            transitions: dict of transitions or StateSpace generating them on demand
+            stats (SearchStats): Filled with counters of the search if given
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
         
         Returns:
             SearchResult: Information about search
         """
-        states_visited = set()
-        p_q = queue.PriorityQueue()
-        starting_node = Node(starting_state, 0.0, None)
-        p_q.put((starting_node.cost, starting_node))
-
-        while(not p_q.empty()):
-            current_node = p_q.get()[1]
-            states_visited.add(current_node.name)
-            #found solution
-            if(current_node.name in ending_states):
-                return SearchResult(True, len(states_visited), current_node.getChainLength(), current_node.cost, current_node.getPath(), current_node)
-            neighbour_states = transitions[current_node.name]
-            next_nodes = UCS.expand(neighbour_states, current_node, states_visited)
-            for node in next_nodes:
-                p_q.put((node.cost, node))
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        successors, state_name = getSuccessorFunction(transitions)
+        store = NodeStore()
+        ids = store.ids
+        costs = store.costs
+        parents = store.parents
+        closed = store.closed
+        add = store.add
+        p_q = [(0.0, starting_state, add(starting_state, -1, 0.0))]
+        search_result = SearchResult(False)
+        states_visited = 0
+        generated = 0
+        pushes = 1
+        peak_frontier = 0
+        #counters are only updated if stats are collected
+        counting = stats is not None
 
-            
+        while(p_q):
+            if(counting and len(p_q) > peak_frontier):
+                peak_frontier = len(p_q)
+            if(states_visited >= next_check):
+                exceeded = budget.check(start_ns, states_visited, len(p_q))
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(states_visited)
+            current_cost, current_state, current_id = heapq.heappop(p_q)
+            #state was reached by a cheaper path already
+            if(closed[current_id]):
+                continue
+            closed[current_id] = 1
+            states_visited += 1
+            #found solution
+            if(current_state in ending_states):
+                search_result = store.buildSearchResult(current_id, states_visited, state_name)
+                break
+            neighbour_states = successors(current_state)
+            if(counting):
+                generated += len(neighbour_states)
+            for next_state, cost in neighbour_states:
+                next_cost = current_cost + cost
+                next_id = ids.get(next_state)
+                if(next_id is None):
+                    next_id = add(next_state, current_id, next_cost)
+                elif(closed[next_id] or next_cost >= costs[next_id]):
+                    continue
+                else:
+                    parents[next_id] = current_id
+                    costs[next_id] = next_cost
+                if(counting):
+                    pushes += 1
+                heapq.heappush(p_q, (next_cost, next_state, next_id))
 
-        return SearchResult(False)
+        if(stats is not None):
+            pops = pushes - len(p_q)
+            expanded = states_visited - search_result.found_solution
+            stats.record(time.perf_counter_ns() - start_ns, expanded=expanded, generated=generated, pushes=pushes, pops=pops,
+                stale_pops=pops - states_visited, peak_frontier=peak_frontier, peak_closed=states_visited)
+        return search_result
 
-    @staticmethod
-    def expand(transitions: list[tuple[str, float]], current_node: Node, states_visited) -> list[Node]:
-        """Creates Node objects from all the states that are neighbours to current_node
-        
-        Returns:
-            list[Node]: list of neigbouring nodes
-        """
-        new_nodes = []
-        for next_state, cost in transitions:
-            #don't make cycles
-            if(next_state not in states_visited):
-                x = Node(next_state, current_node.cost + cost, current_node)
-                new_nodes.append(x)
-        
-        return new_nodes
             
 class BFS:
     """Breadth first search used to find shortest path in graph with constant weight edges"""
     @staticmethod
-    def search(starting_state: str, ending_states: list[str], transitions: dict) -> SearchResult:
+    def search(starting_state: str, ending_states: list[str], transitions: dict, stats: SearchStats = None, budget: SearchBudget = None) -> SearchResult:
         """Finds shortest path
+
+        A state is queued once, when it is reached for the first time, its parent and cost are kept in a NodeStore.
+
+        Args:
+            transitions: dict of transitions or StateSpace generating them on demand
+            stats (SearchStats): Filled with counters of the search if given
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
         
         Returns:
             SearchResult: Information about search
         """
-        starting_node = Node(starting_state, 0.0, None)
-        states_visited = set()
-        q = queue.Queue()
-        q.put(starting_node)
-
-        while(not q.empty()):
-            current_node = q.get()
-            states_visited.add(current_node.name)
-            neighbour_states = transitions[current_node.name]
-            if(current_node.name in ending_states):
-                return SearchResult(True, len(states_visited), len(current_node.getChain()), current_node.cost, current_node.getPath(), current_node)
-            next_nodes = BFS.expand(neighbour_states, current_node, states_visited)
-            for node in next_nodes:
-                q.put(node)
-            
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        successors, state_name = getSuccessorFunction(transitions)
+        store = NodeStore()
+        ids = store.ids
+        costs = store.costs
+        add = store.add
+        q = deque()
+        q.append(add(starting_state, -1, 0.0))
+        states = store.states
+        search_result = SearchResult(False)
+        states_visited = 0
+        generated = 0
+        peak_frontier = 0
+        #counters are only updated if stats are collected
+        counting = stats is not None
 
-        return SearchResult(False)
+        while(q):
+            if(counting and len(q) > peak_frontier):
+                peak_frontier = len(q)
+            if(states_visited >= next_check):
+                exceeded = budget.check(start_ns, states_visited, len(q))
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(states_visited)
+            current_id = q.popleft()
+            current_state = states[current_id]
+            states_visited += 1
+            if(current_state in ending_states):
+                search_result = store.buildSearchResult(current_id, states_visited, state_name)
+                break
+            neighbour_states = successors(current_state)
+            if(counting):
+                generated += len(neighbour_states)
+            current_cost = costs[current_id]
+            for next_state, cost in neighbour_states:
+                #don't make cycles
+                if(next_state not in ids):
+                    q.append(add(next_state, current_id, current_cost + cost))
 
-    @staticmethod
-    def expand(transitions: list[tuple[str, float]], current_node: Node, states_visited: list[str]) -> list[Node]:
-        """Creates Node objects from all the states that are neighbours to current_node
-        
-        Returns:
-            list[Node]: list of neigbouring nodes
-        """
-        new_nodes = []
-        for next_state, cost in transitions:
-            #don't make cycles
-            if(next_state not in states_visited):
-                x = Node(next_state, current_node.cost + cost, current_node)
-                new_nodes.append(x)
-        
-        return new_nodes
+        if(stats is not None):
+            expanded = states_visited - search_result.found_solution
+            stats.record(time.perf_counter_ns() - start_ns, expanded=expanded, generated=generated, pushes=len(store), pops=states_visited,
+                stale_pops=0, peak_frontier=peak_frontier, peak_closed=states_visited)
+        return search_result
     
 
 
 class A_STAR:
     """"A* shortest path algorithm"""
     @staticmethod
-    def search(starting_state: str, ending_states: list[str], transitions: dict, heuristic: dict):
+    def search(starting_state: str, ending_states: list[str], transitions: dict, heuristic: dict, stats: SearchStats = None, budget: SearchBudget = None):
         """Finds shortest path
+
+        Parent and cost of every reached state are kept in a NodeStore, open holds state ids.
+
+        Args:
+            transitions: dict of transitions or StateSpace generating them on demand
+            heuristic: Heuristic value of every state, indexed by state
+            stats (SearchStats): Filled with counters of the search if given
+            budget (SearchBudget): Limits of the search, BudgetExceededResult is returned once any is exceeded
         
         Returns:
             SearchResult: Information about search
         """
-        open = PriorityQueue(optimization_key_extractor=lambda x: x.name)
-        closed = {}
-        starting_node = Node(starting_state, 0.0, None)
-        open.insert(starting_node, heuristic[starting_state])
+        start_ns = time.perf_counter_ns() if stats is not None or budget is not None else 0
+        next_check = budget.nextCheck(0) if budget is not None else float("inf")
+        successors, state_name = getSuccessorFunction(transitions)
+        store = NodeStore()
+        ids = store.ids
+        states = store.states
+        costs = store.costs
+        parents = store.parents
+        closed = store.closed
+        add = store.add
+        #ids are passed as keys explicitly, so the queue never calls a key extractor
+        open = PriorityQueue()
+        starting_id = add(starting_state, -1, 0.0)
+        open.insert(starting_id, heuristic[starting_state], starting_id)
+        search_result = SearchResult(False)
+        closed_count = 0
+        expanded = 0
+        generated = 0
+        pops = 0
+        reopenings = 0
+        decreases = 0
+        peak_frontier = 0
+        peak_closed = 0
+        #counters are only updated if stats are collected
+        counting = stats is not None
 
         while(not open.empty()):    
-            current_node = open.get()
-            if current_node.name in ending_states:
-                return SearchResult(True, len(closed), current_node.getChainLength(), current_node.cost, current_node.getPath(), current_node)
-            closed[current_node.name] = current_node
-
-            for node in A_STAR.expand(transitions[current_node.name], current_node):
-                #search "open" for nodes with same state name
-                #if we find existing node in "open" we don't need to search "closed"
-                existing_node = open.getElement(node)
-                if(existing_node != None):
-                    if(existing_node.cost > node.cost):
-                        #we found shorter path -> modify node in "open"
-                        open.modifyElement(element = node, new_element=node, new_priority=node.cost + heuristic[node.name])
-                else:
-                    #search "closed" for nodes with same state name
-                    try:
-                        existing_node = closed[node.name]
-                    except KeyError as e:
-                        #no existing node found in "closed" -> add node to "open"
-                        open.insert(node, node.cost + heuristic[node.name])
-                        
-                    if(existing_node != None and existing_node.cost > node.cost):
-                        #we found better path -> delete node from "closed" and insert one with shorter path in "open"
-                        del closed[existing_node.name]
-                        open.insert(node, node.cost + heuristic[node.name])
-        
-        return SearchResult(False)
-
-    def expand(transitions: list[tuple[str, float]], current_node: Node) -> list[Node]:
-        """Creates Node objects from all the states that are neigbours to current_node
-        
-        Attributes:
-            transitions (list[tuple[str, float]]): Transitions with cost
-            current_node (Node): Node from which to transition
-        Returns:
-            list[Node]: list of neigbouring nodes
-        """
-        new_nodes = []
-        for next_state, cost in transitions:
-            new_nodes.append(Node(next_state, current_node.cost + cost, current_node))
+            if(counting and open.size > peak_frontier):
+                peak_frontier = open.size
+            if(expanded >= next_check):
+                exceeded = budget.check(start_ns, expanded, open.size)
+                if(exceeded is not None):
+                    search_result = exceeded
+                    break
+                next_check = budget.nextCheck(expanded)
+            current_id = open.get()
+            current_state = states[current_id]
+            pops += 1
+            if current_state in ending_states:
+                search_result = store.buildSearchResult(current_id, closed_count, state_name)
+                break
+            closed[current_id] = 1
+            closed_count += 1
+            expanded += 1
 
-        return new_nodes
+            current_cost = costs[current_id]
+            neighbour_states = successors(current_state)
+            if(counting):
+                generated += len(neighbour_states)
+            for next_state, cost in neighbour_states:
+                next_cost = current_cost + cost
+                next_id = ids.get(next_state)
+                if(next_id is None):
+                    #state reached for the first time -> add it to "open"
+                    next_id = add(next_state, current_id, next_cost)
+                    open.insert(next_id, next_cost + heuristic[next_state], next_id)
+                elif(next_cost < costs[next_id]):
+                    parents[next_id] = current_id
+                    costs[next_id] = next_cost
+                    if(closed[next_id]):
+                        #we found better path -> move state from "closed" back to "open"
+                        if(closed_count > peak_closed):
+                            peak_closed = closed_count
+                        reopenings += 1
+                        closed[next_id] = 0
+                        closed_count -= 1
+                        open.insert(next_id, next_cost + heuristic[next_state], next_id)
+                    else:
+                        #we found shorter path -> decrease its priority in "open"
+                        decreases += 1
+                        open.modifyElement(element=next_id, new_element=next_id, new_priority=next_cost + heuristic[next_state], key=next_id)
         
+        if(stats is not None):
+            #every pop removes one insertion, the rest are still in open, priority decreases replace an entry
+            pushes = pops + open.size + decreases
+            stats.record(time.perf_counter_ns() - start_ns, expanded=expanded, generated=generated, pushes=pushes, pops=pops,
+                reopenings=reopenings, peak_frontier=peak_frontier, peak_closed=max(peak_closed, closed_count))
+        return search_result
@@ -0,0 +1,263 @@
+from array import array
+from collections import deque
+from data_strucutres.descriptors import StateSpaceDescriptor, HeuristicDescriptor
+
+
+class CompiledGraph:
+    """Integer indexed (CSR) form of a state space
+
+    States are interned to dense ids in sorted name order, so comparing ids
+    gives the same tie-breaking as comparing names. Transitions of state i are
+    stored in targets[offsets[i]:offsets[i+1]] and costs[offsets[i]:offsets[i+1]]
+    in the same order as in the state space description.
+
+    Attributes:
+        names (list[str]): State name of every id
+        offsets (array): Start of each state's transitions, has len(names) + 1 elements
+        targets (array): Id of the state each transition leads to
+        costs (array): Cost of each transition
+        starting_state (int): Id of the state from which to start search
+        ending_states (list[int]): Ids of the states which end the search if found
+        goal_mask (bytearray): goal_mask[i] is 1 if state i is an ending state, 0 otherwise
+        goal_reachable: goal_reachable[i] is 1 if an ending state can be reached from state i, None unless graph was pruned
+    """
+    def __init__(self, names, offsets, targets, costs, starting_state: int, ending_states: list[int], goal_reachable = None):
+        self.names = names
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.starting_state = starting_state
+        self.ending_states = ending_states
+        self.goal_mask = bytearray(len(names))
+        for state in ending_states:
+            self.goal_mask[state] = 1
+        self.goal_reachable = goal_reachable
+        self._ids = None
+        #-1 until costs are scanned by maxIntegerCost
+        self._max_integer_cost = -1.0
+
+    @staticmethod
+    def fromStateSpaceDescriptor(state_space_descriptor: StateSpaceDescriptor) -> "CompiledGraph":
+        """Compiles state space descriptor
+
+        States which only appear as transition targets, starting state or ending states get an id with no transitions.
+
+        Args:
+            state_space_descriptor (StateSpaceDescriptor): State space to compile
+
+        Returns:
+            CompiledGraph: Compiled state space
+        """
+        transitions = state_space_descriptor.transitions
+        names = set(transitions)
+        for state_transitions in transitions.values():
+            for state_to, cost in state_transitions:
+                names.add(state_to)
+        if(state_space_descriptor.starting_state is not None):
+            names.add(state_space_descriptor.starting_state)
+        names.update(state_space_descriptor.ending_states)
+        names = sorted(names)
+        ids = {name: i for i, name in enumerate(names)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        costs = array('d')
+        for name in names:
+            for state_to, cost in transitions.get(name, ()):
+                targets.append(ids[state_to])
+                costs.append(cost)
+            offsets.append(len(targets))
+
+        starting_state = ids.get(state_space_descriptor.starting_state, -1)
+        ending_states = [ids[state] for state in state_space_descriptor.ending_states]
+        graph = CompiledGraph(names, offsets, targets, costs, starting_state, ending_states)
+        graph._ids = ids
+        return graph
+
+    def maxIntegerCost(self) -> float:
+        """Gets the largest transition cost if every cost is a non-negative integer, None otherwise
+
+        Costs never change, so they are scanned only on the first call.
+        """
+        if(self._max_integer_cost == -1.0):
+            costs = self.costs
+            if(all(map(float.is_integer, costs)) and min(costs, default=0.0) >= 0):
+                self._max_integer_cost = max(costs, default=0.0)
+            else:
+                self._max_integer_cost = None
+        return self._max_integer_cost
+
+    def compileHeuristic(self, heuristic_descriptor: HeuristicDescriptor) -> array:
+        """Creates heuristic array indexed by state id
+
+        States which are neither starting state nor target of a transition are never generated by a search,
+        they get 0 if heuristic descriptor has no value for them (e.g. unreachable ending states).
+
+        Args:
+            heuristic_descriptor (HeuristicDescriptor): Heuristic to compile
+
+        Returns:
+            array: Heuristic value of every state id, raises ValueError naming a missing state which may be generated
+        """
+        pairs = heuristic_descriptor.pairs
+        heuristic = array('d', [pairs.get(name, 0.0) for name in self.names])
+        if(any(name not in pairs for name in self.names)):
+            generated = set(self.targets)
+            generated.add(self.starting_state)
+            for state in generated:
+                if(self.names[state] not in pairs):
+                    raise ValueError(f"Heuristic has no value for state \"{self.names[state]}\"")
+        return heuristic
+
+    def reversed(self) -> "CompiledGraph":
+        """Creates graph with every transition reversed
+
+        Transitions of each state in reversed graph are ordered by id of the state they came from.
+
+        Returns:
+            CompiledGraph: Reversed graph with same names, starting and ending states
+        """
+        n = len(self.names)
+        offsets = self.offsets
+        targets = self.targets
+        costs = self.costs
+        counts = [0] * (n + 1)
+        for target in targets:
+            counts[target + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        reversed_offsets = array('q', counts)
+        reversed_targets = array('i', bytes(4 * len(targets)))
+        reversed_costs = array('d', bytes(8 * len(targets)))
+        position = counts[:n]
+        for state_from in range(n):
+            for edge in range(offsets[state_from], offsets[state_from + 1]):
+                state_to = targets[edge]
+                pos = position[state_to]
+                reversed_targets[pos] = state_from
+                reversed_costs[pos] = costs[edge]
+                position[state_to] = pos + 1
+
+        graph = CompiledGraph(self.names, reversed_offsets, reversed_targets, reversed_costs, self.starting_state, self.ending_states)
+        graph._ids = self._ids
+        return graph
+
+    def withEndingStates(self, ending_states: list[int]) -> "CompiledGraph":
+        """Creates graph sharing transitions of this graph but with different ending states
+
+        Args:
+            ending_states (list[int]): Ids of the states which end the search if found
+
+        Returns:
+            CompiledGraph: Graph with same names, transitions and starting state
+        """
+        if(self.goal_reachable is not None):
+            raise ValueError("Pruned graph can only be searched for its own ending states")
+        graph = CompiledGraph(self.names, self.offsets, self.targets, self.costs, self.starting_state, ending_states)
+        graph._ids = self._ids
+        return graph
+
+    def goalReachability(self) -> bytearray:
+        """Finds states from which an ending state can be reached, by a single BFS over reversed transitions
+
+        Returns:
+            bytearray: 1 for every state with a path to an ending state, 0 for dead ends
+        """
+        reversed_graph = self.reversed()
+        offsets = reversed_graph.offsets
+        targets = reversed_graph.targets
+        goal_reachable = bytearray(self.num_states)
+        queue = deque()
+        for state in self.ending_states:
+            if(not goal_reachable[state]):
+                goal_reachable[state] = 1
+                queue.append(state)
+        while(queue):
+            state = queue.popleft()
+            for edge in range(offsets[state], offsets[state + 1]):
+                previous_state = targets[edge]
+                if(not goal_reachable[previous_state]):
+                    goal_reachable[previous_state] = 1
+                    queue.append(previous_state)
+
+        return goal_reachable
+
+    def pruned(self) -> "CompiledGraph":
+        """Creates graph without dead ends, states from which no ending state can be reached
+
+        Transitions into and out of dead ends are left out, so searches expand only states on a path to an
+        ending state and a search starting in a dead end fails at once. State ids are kept, so heuristics
+        compiled for this graph stay valid. Pruned graph is only valid for its own ending states.
+
+        Returns:
+            CompiledGraph: Pruned graph, goal_reachable marks states which are not dead ends
+        """
+        goal_reachable = self.goalReachability()
+        offsets = self.offsets
+        targets = self.targets
+        costs = self.costs
+        pruned_offsets = array('q', [0])
+        pruned_targets = array('i')
+        pruned_costs = array('d')
+        for state in range(self.num_states):
+            if(goal_reachable[state]):
+                for edge in range(offsets[state], offsets[state + 1]):
+                    if(goal_reachable[targets[edge]]):
+                        pruned_targets.append(targets[edge])
+                        pruned_costs.append(costs[edge])
+            pruned_offsets.append(len(pruned_targets))
+
+        graph = CompiledGraph(self.names, pruned_offsets, pruned_targets, pruned_costs, self.starting_state, self.ending_states, goal_reachable)
+        graph._ids = self._ids
+        return graph
+
+    def canReachGoal(self, state: int) -> bool:
+        """Checks in O(1) if state is not a known dead end, always True unless graph was pruned"""
+        return self.goal_reachable is None or self.goal_reachable[state] == 1
+
+    def getStateId(self, name: str) -> int:
+        """Gets id of the state
+
+        Args:
+            name (str): Name of the state
+
+        Returns:
+            int: Id of the state, raises KeyError if state does not exist
+        """
+        if(self._ids is None):
+            self._ids = {state: i for i, state in enumerate(self.names)}
+        return self._ids[name]
+
+    def getStateName(self, state: int) -> str:
+        """Gets name of the state with specified id"""
+        return self.names[state]
+
+    def getStateTransitions(self, state: int) -> list[tuple[int, float]]:
+        """Gets all the transitions of the specified state
+
+        Args:
+            state (int): Id of the state from which to transition
+
+        Returns:
+            list[tuple[int, float]]: list of transitions with costs
+        """
+        start = self.offsets[state]
+        end = self.offsets[state + 1]
+        return list(zip(self.targets[start:end], self.costs[start:end]))
+
+    @property
+    def num_states(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_transitions(self) -> int:
+        return len(self.targets)
+
+    def __str__(self) -> str:
+        s="--Compiled graph--\n"
+        s+=f"States: {self.num_states}\n"
+        s+=f"Transitions: {self.num_transitions}\n"
+        s+=f"Starting state: {self.names[self.starting_state] if self.starting_state >= 0 else None}\n"
+        s+=f"Ending states: {[self.names[x] for x in self.ending_states].__str__()}"
+
+        return s
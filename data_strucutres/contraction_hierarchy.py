@@ -0,0 +1,222 @@
+from data_strucutres.compiled_graph import CompiledGraph
+from array import array
+import heapq
+
+
+class ContractionHierarchy:
+    """Contraction hierarchy of a compiled graph
+
+    States are contracted one by one in order of rank. Contracting state v adds shortcut u -> w
+    for every path u -> v -> w which is the only shortest path between u and w among states not contracted yet.
+    Every transition and shortcut is then stored once, at its lower ranked end:
+    upward edges u -> w with rank[w] > rank[u] under u, downward edges u -> w with rank[u] > rank[w] under w.
+    So a forward search only goes up from starting state and a backward search only goes up from ending states.
+
+    Attributes:
+        rank (array): Contraction order of every state indexed by state id
+        up_offsets, up_targets, up_costs, up_middles (array): CSR of upward edges, up_targets[e] is the end with higher rank
+        down_offsets, down_targets, down_costs, down_middles (array): CSR of downward edges, down_targets[e] is the start with higher rank
+        middles are ids of the contracted states shortcuts skip, -1 for transitions of the original graph
+    """
+    #maximum number of states settled by a single witness search
+    WITNESS_SETTLE_LIMIT = 500
+
+    def __init__(self, rank, up_offsets, up_targets, up_costs, up_middles, down_offsets, down_targets, down_costs, down_middles):
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_costs = up_costs
+        self.up_middles = up_middles
+        self.down_offsets = down_offsets
+        self.down_targets = down_targets
+        self.down_costs = down_costs
+        self.down_middles = down_middles
+
+    @staticmethod
+    def witnessSearch(outgoing: list[dict], source: int, skipped: int, max_cost: float, targets: set) -> dict:
+        """Dijkstra from source among states not contracted yet, avoiding skipped state
+
+        Stops when every target is settled, max_cost is exceeded or WITNESS_SETTLE_LIMIT states are settled.
+
+        Returns:
+            dict: Cost of the cheapest path found to every reached state
+        """
+        inf = float("inf")
+        dist = {source: 0.0}
+        p_q = [(0.0, source)]
+        closed = set()
+        remaining = len(targets)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        while(p_q and len(closed) < ContractionHierarchy.WITNESS_SETTLE_LIMIT):
+            cost, state = heappop(p_q)
+            if(state in closed):
+                continue
+            if(cost > max_cost):
+                break
+            closed.add(state)
+            if(state in targets):
+                remaining -= 1
+                if(remaining == 0):
+                    break
+            for next_state, (edge_cost, middle) in outgoing[state].items():
+                if(next_state == skipped):
+                    continue
+                next_cost = cost + edge_cost
+                if(next_cost <= max_cost and next_cost < dist.get(next_state, inf)):
+                    dist[next_state] = next_cost
+                    heappush(p_q, (next_cost, next_state))
+
+        return dist
+
+    @staticmethod
+    def shortcutsOf(outgoing: list[dict], incoming: list[dict], state: int) -> list[tuple[int, int, float]]:
+        """Finds shortcuts needed to contract state
+
+        Returns:
+            list[tuple[int, int, float]]: Start, end and cost of every shortcut
+        """
+        shortcuts = []
+        state_outgoing = outgoing[state]
+        if(not state_outgoing):
+            return shortcuts
+        max_out = max(edge[0] for edge in state_outgoing.values())
+        for state_from, (cost_in, middle_in) in incoming[state].items():
+            targets = {x for x in state_outgoing if x != state_from}
+            if(not targets):
+                continue
+            dist = ContractionHierarchy.witnessSearch(outgoing, state_from, state, cost_in + max_out, targets)
+            for state_to in targets:
+                cost = cost_in + state_outgoing[state_to][0]
+                #keep shortcut unless some other path is at most as cheap
+                if(dist.get(state_to, float("inf")) > cost):
+                    shortcuts.append((state_from, state_to, cost))
+
+        return shortcuts
+
+    @staticmethod
+    def fromCompiledGraph(graph: CompiledGraph) -> "ContractionHierarchy":
+        """Contracts every state of graph
+
+        States are ordered greedily by edge difference (shortcuts added minus edges removed) plus number of
+        contracted neighbours, priorities are updated lazily when states are popped.
+
+        Args:
+            graph (CompiledGraph): Graph to preprocess
+
+        Returns:
+            ContractionHierarchy: Hierarchy of graph
+        """
+        n = graph.num_states
+        offsets = graph.offsets
+        targets = graph.targets
+        costs = graph.costs
+        #edges between states not contracted yet, state -> (cost, middle) keeping only cheapest parallel edge
+        outgoing = [{} for i in range(n)]
+        incoming = [{} for i in range(n)]
+        for state_from in range(n):
+            state_outgoing = outgoing[state_from]
+            for edge in range(offsets[state_from], offsets[state_from + 1]):
+                state_to = targets[edge]
+                cost = costs[edge]
+                if(state_to != state_from and cost < state_outgoing.get(state_to, (float("inf"),))[0]):
+                    state_outgoing[state_to] = (cost, -1)
+                    incoming[state_to][state_from] = (cost, -1)
+
+        contracted_neighbours = [0] * n
+
+        def priority(state: int, shortcuts: list) -> int:
+            return len(shortcuts) - len(outgoing[state]) - len(incoming[state]) + contracted_neighbours[state]
+
+        p_q = [(priority(state, ContractionHierarchy.shortcutsOf(outgoing, incoming, state)), state) for state in range(n)]
+        heapq.heapify(p_q)
+        rank = array('i', [0]) * n
+        up = [None] * n
+        down = [None] * n
+        next_rank = 0
+        while(p_q):
+            state_priority, state = heapq.heappop(p_q)
+            #lazy update, contract state only if it is still the best after recomputing its priority
+            shortcuts = ContractionHierarchy.shortcutsOf(outgoing, incoming, state)
+            new_priority = priority(state, shortcuts)
+            if(p_q and new_priority > p_q[0][0]):
+                heapq.heappush(p_q, (new_priority, state))
+                continue
+
+            rank[state] = next_rank
+            next_rank += 1
+            up[state] = list(outgoing[state].items())
+            down[state] = list(incoming[state].items())
+            for state_to in outgoing[state]:
+                del incoming[state_to][state]
+                contracted_neighbours[state_to] += 1
+            for state_from in incoming[state]:
+                del outgoing[state_from][state]
+                contracted_neighbours[state_from] += 1
+            outgoing[state] = {}
+            incoming[state] = {}
+            for state_from, state_to, cost in shortcuts:
+                if(cost < outgoing[state_from].get(state_to, (float("inf"),))[0]):
+                    outgoing[state_from][state_to] = (cost, state)
+                    incoming[state_to][state_from] = (cost, state)
+
+        return ContractionHierarchy(rank, *ContractionHierarchy.toCSR(up), *ContractionHierarchy.toCSR(down))
+
+    @staticmethod
+    def toCSR(edges: list[list]) -> tuple[array, array, array, array]:
+        """Packs lists of (state, (cost, middle)) of every state into offsets, targets, costs and middles arrays"""
+        offsets = array('q', [0])
+        targets = array('i')
+        costs = array('d')
+        middles = array('i')
+        for state_edges in edges:
+            for state, (cost, middle) in state_edges:
+                targets.append(state)
+                costs.append(cost)
+                middles.append(middle)
+            offsets.append(len(targets))
+
+        return offsets, targets, costs, middles
+
+    @property
+    def num_states(self) -> int:
+        return len(self.rank)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.up_targets) + len(self.down_targets)
+
+    @property
+    def num_shortcuts(self) -> int:
+        return sum(1 for x in self.up_middles if x != -1) + sum(1 for x in self.down_middles if x != -1)
+
+    def findEdge(self, state_from: int, state_to: int) -> int:
+        """Gets middle state of the edge between two states, -1 if it is a transition of the original graph"""
+        if(self.rank[state_to] > self.rank[state_from]):
+            for edge in range(self.up_offsets[state_from], self.up_offsets[state_from + 1]):
+                if(self.up_targets[edge] == state_to):
+                    return self.up_middles[edge]
+        else:
+            for edge in range(self.down_offsets[state_to], self.down_offsets[state_to + 1]):
+                if(self.down_targets[edge] == state_from):
+                    return self.down_middles[edge]
+        raise KeyError((state_from, state_to))
+
+    def unpack(self, state_from: int, state_to: int, middle: int) -> list[int]:
+        """Replaces edge with the transitions of the original graph it stands for
+
+        Returns:
+            list[int]: States on the path from state_from to state_to, without state_from
+        """
+        path = []
+        #edges still to unpack, last one is unpacked first
+        stack = [(state_from, state_to, middle)]
+        while(stack):
+            state_from, state_to, middle = stack.pop()
+            if(middle == -1):
+                path.append(state_to)
+            else:
+                stack.append((middle, state_to, self.findEdge(middle, state_to)))
+                stack.append((state_from, middle, self.findEdge(state_from, middle)))
+
+        return path
@@ -1,18 +1,32 @@
+from data_strucutres.state_space import StateSpace
+import json
+
+
 class Node:
         """Node represents a node in a weighted graph.
         
+        Search engines keep nodes in a NodeStore, chains are only built for the path of a found goal.
+
         Attributes:
-            _name (str): Name of the node
-            _cost (float): Cost of the total path in node chain which can be reconstructed by itteratively retrieving _prev_node
-            _prev_node: Child node in the node chain
+            name (str): Name of the node
+            cost (float): Cost of the total path in node chain which can be reconstructed by itteratively retrieving prev_node
+            prev_node: Child node in the node chain
         """
+        __slots__ = ("name", "cost", "prev_node")
+
         def __init__(self, name: str, cost: float, prev_node: "Node"):
             self.name = name
             self.cost = cost
             self.prev_node = prev_node
         
         def getChainLength(self) -> int:
-            return len(self.getChain())
+            length = 0
+            node_temp = self
+            while(node_temp is not None):
+                length += 1
+                node_temp = node_temp.prev_node
+
+            return length
 
         def getChain(self) -> list["Node"]:
             """Get list of all node names in the chain"""
@@ -25,27 +39,19 @@ class Node:
 
             return chain
 
-        def getPath(self) -> str:
+        def getPath(self, state_name = str) -> str:
             """Gets string representation of chain
+
+            Args:
+                state_name: Function returning name of a state
             
             Returns:
                 str: String of format "str => str => ..."
             """
-            s=""
-            node_temp = self
-            path_list = []
-            while(node_temp.prev_node != None):
-                path_list.append(node_temp.name)
-                node_temp = node_temp.prev_node
-
-            path_list.append(node_temp.name)
-
+            path_list = self.getChain()
             path_list.reverse()
 
-            for name in path_list:
-                s += f"{name} => "
-            
-            return s[:len(s)-3]
+            return " => ".join([state_name(name) for name in path_list]) + " "
 
         def __ge__(self, __o: 'Node') -> bool:
             if(self.cost == __o.cost):
@@ -80,9 +86,9 @@ class Node:
                 return False
 
         def __str__(self) -> str:
-            return f"{self._name} {self._cost}"
+            return f"{self.name} {self.cost}"
 
-class StateSpaceDescriptor:
+class StateSpaceDescriptor(StateSpace):
     """Descriptor used to store information about state space
     
     Attributes:
@@ -232,56 +238,298 @@ class SearchResult:
         
         return s
 
+    def getSingleLineOutput(self) -> str:
+        """Returns output of getFormattedOutput on a single line, fields are separated by spaces"""
+        return self.getFormattedOutput().replace("\n", " ").rstrip()
+
+
+class BudgetExceededResult(SearchResult):
+    """Result of a search stopped by its SearchBudget before it found a path or proved there is none
+
+    Attributes:
+        reason (str): Limit that stopped the search, one of "time", "expansions", "frontier" or "cancelled"
+        states_visited (int): Number of states expanded before the search stopped
+        frontier_size (int): Size of the frontier when the search stopped
+        elapsed_ms (float): Time spent in the search
+    """
+    def __init__(self, reason: str, states_visited: int, frontier_size: int, elapsed_ms: float):
+        super().__init__(False, states_visited)
+        self.reason = reason
+        self.frontier_size = frontier_size
+        self.elapsed_ms = elapsed_ms
+
+    def getFormattedOutput(self) -> str:
+        """Returns formatted output of BudgetExceededResult
+
+        Returns:
+            str:
+                "[FOUND_SOLUTION]: no"
+                "[BUDGET_EXCEEDED]: {self.reason}"
+                "[STATES_VISITED]: {self.states_visited}"
+                "[FRONTIER_SIZE]: {self.frontier_size}"
+                "[ELAPSED_MS]: {self.elapsed_ms}"
+        """
+        s = "[FOUND_SOLUTION]: no\n"
+        s += f"[BUDGET_EXCEEDED]: {self.reason}\n"
+        s += f"[STATES_VISITED]: {self.states_visited}\n"
+        s += f"[FRONTIER_SIZE]: {self.frontier_size}\n"
+        s += f"[ELAPSED_MS]: {self.elapsed_ms:.1f}"
+
+        return s
+
+
+class AnytimeSearchResult(SearchResult):
+    """Best solution an anytime search found before it finished or ran out of budget
+
+    Attributes:
+        suboptimality_bound (float): total_cost is at most suboptimality_bound times the optimal cost, inf if unknown
+        weight (float): Heuristic weight of the last search iteration
+        solutions (list[tuple[float, float, float]]): Elapsed milliseconds, cost and bound of every improved solution
+        interrupted (str): Limit of the SearchBudget that stopped the search, None if it finished
+    """
+    def __init__(self, found_solution: bool, states_visited: int = None, path_length: int = None, total_cost: float = None, path: str = None, node: Node = None,
+            suboptimality_bound: float = float("inf"), weight: float = None, solutions: list = None, interrupted: str = None):
+        super().__init__(found_solution, states_visited, path_length, total_cost, path, node)
+        self.suboptimality_bound = suboptimality_bound
+        self.weight = weight
+        self.solutions = solutions if solutions is not None else []
+        self.interrupted = interrupted
+
+    def getFormattedOutput(self) -> str:
+        """Returns output of SearchResult.getFormattedOutput followed by "[SUBOPTIMALITY_BOUND]: {self.suboptimality_bound}" if solution is found"""
+        s = super().getFormattedOutput()
+        if(self.found_solution):
+            s += f"\n[SUBOPTIMALITY_BOUND]: {self.suboptimality_bound:.4f}"
+
+        return s
+
+
+class SearchStats:
+    """Opt-in counters and phase timings of a search
+
+    Engines count in local variables and add them here once, when the search ends,
+    so passing no stats object costs next to nothing.
+
+    Attributes:
+        expanded (int): States whose transitions were generated
+        generated (int): Transitions generated while expanding states
+        pushes (int): Insertions into the frontier, including priority decreases
+        pops (int): Removals from the frontier
+        stale_pops (int): Popped entries of states already expanded or outdated by a cheaper path
+        reopenings (int): A* states moved from closed back to open
+        peak_frontier (int): Largest frontier size seen when popping
+        peak_closed (int): Largest number of expanded states kept at once
+        parse_ns (int): Time spent parsing, compiling or loading input
+        search_ns (int): Time spent in search engines
+        output_ns (int): Time spent formatting and writing the result
+    """
+    COUNTERS = ("expanded", "generated", "pushes", "pops", "stale_pops", "reopenings")
+    PEAKS = ("peak_frontier", "peak_closed")
+    TIMINGS = ("parse_ns", "search_ns", "output_ns")
 
-class ConsistentDescriptor:
     def __init__(self):
-        self.entries = {}
+        for name in SearchStats.COUNTERS + SearchStats.PEAKS + SearchStats.TIMINGS:
+            setattr(self, name, 0)
 
-    def addEntry(self, state_from, state_to, state_from_h, state_to_h, cost):
-        self.entries[(state_from, state_to)] = (state_from_h, state_to_h, cost)
+    def record(self, search_ns: int, **counters) -> None:
+        """Adds counters of a finished search, peaks are combined by maximum
 
-    def getFormattedOutput(self):
-        s = ""
-        consistent = True
-        for states, values in self.entries.items():
-            state_from = states[0]
-            state_to = states[1]
-            state_from_h = values[0]
-            state_to_h = values[1]
-            cost = values[2]
-            entry_result = None
-            if(state_from_h <= state_to_h + cost):
-                entry_result = "[OK]"
+        Args:
+            search_ns (int): Duration of the search
+            counters: Values of SearchStats.COUNTERS and SearchStats.PEAKS, missing ones are left unchanged
+        """
+        self.search_ns += search_ns
+        for name, value in counters.items():
+            if(name in SearchStats.PEAKS):
+                setattr(self, name, max(getattr(self, name), value))
+            elif(name in SearchStats.COUNTERS):
+                setattr(self, name, getattr(self, name) + value)
             else:
-                entry_result = "[ERR]"
+                raise KeyError(name)
+
+    def toDict(self) -> dict:
+        return {name: getattr(self, name) for name in SearchStats.COUNTERS + SearchStats.PEAKS + SearchStats.TIMINGS}
+
+    def toJSON(self) -> str:
+        return json.dumps(self.toDict())
+
+
+class ConditionReport:
+    """Report of a heuristic check produced line by line
+
+    Conditions are evaluated while the report is written, so memory does not grow with the number of lines.
+    Subclasses implement lines, a generator of report lines ending with the conclusion.
+    """
+    def lines(self, ndjson: bool = False):
+        raise NotImplementedError()
+
+    def writeOutput(self, stream, ndjson: bool = False) -> None:
+        """Writes report to a stream as lines are produced
+
+        Args:
+            stream: Text stream, writes are buffered by the stream
+            ndjson (bool): If True every line is a JSON object
+        """
+        write = stream.write
+        for line in self.lines(ndjson):
+            write(line)
+            write("\n")
+
+    def getFormattedOutput(self, ndjson: bool = False) -> str:
+        return "\n".join(self.lines(ndjson))
+
+
+class ConsistentDescriptor(ConditionReport):
+    """Consistency check of every transition of a state space
+
+    Attributes:
+        states: States in report order
+        state_space (StateSpace): State space providing transitions of every state
+        heuristic (dict of str: float): Heuristic value of every state
+    """
+    def __init__(self, states, state_space: StateSpace, heuristic):
+        self.states = states
+        self.state_space = state_space
+        self.heuristic = heuristic
+
+    def conditions(self):
+        """Yields (state_from, state_to, state_from_h, state_to_h, cost, holds) for every transition"""
+        heuristic = self.heuristic
+        for state_from in self.states:
+            state_from_h = heuristic[state_from]
+            for state_to, cost in self.state_space.getStateTransitions(state_from):
+                state_to_h = heuristic[state_to]
+                yield state_from, state_to, state_from_h, state_to_h, cost, state_from_h <= state_to_h + cost
+
+    @property
+    def consistent(self) -> bool:
+        return all(condition[5] for condition in self.conditions())
+
+    def lines(self, ndjson: bool = False):
+        consistent = True
+        for state_from, state_to, state_from_h, state_to_h, cost, holds in self.conditions():
+            if(not holds):
                 consistent = False
-            s += f"[CONDITION]: {entry_result} h({state_from}) <= h({state_to}) + c: {state_from_h} <= {state_to_h} + {cost}\n"
+            if(ndjson):
+                yield json.dumps({"type": "condition", "result": "OK" if holds else "ERR", "from": state_from, "to": state_to, "h_from": state_from_h, "h_to": state_to_h, "cost": cost})
+            else:
+                yield f"[CONDITION]: {'[OK]' if holds else '[ERR]'} h({state_from}) <= h({state_to}) + c: {state_from_h} <= {state_to_h} + {cost}"
+
+        if(ndjson):
+            yield json.dumps({"type": "conclusion", "consistent": consistent})
+        else:
+            yield f"[CONCLUSION]: Heuristic {'is' if consistent is True else 'is not'} consistent."
+
+
+class EdgeConsistentDescriptor(ConditionReport):
+    """Result of consistency check evaluated over edge arrays of a compiled graph
+
+    Report lines are only formatted when text output is requested.
+
+    Attributes:
+        names: State name of every state id
+        sources: Id of the state every transition starts from
+        targets: Id of the state every transition leads to
+        costs: Cost of every transition
+        heuristic: Heuristic value of every state indexed by state id
+        violations (list[int]): Indices of transitions for which h(from) <= h(to) + c does not hold
+        violations_only (bool): If True only violated conditions are reported
+    """
+    def __init__(self, names, sources, targets, costs, heuristic, violations: list[int], violations_only: bool = False):
+        self.names = names
+        self.sources = sources
+        self.targets = targets
+        self.costs = costs
+        self.heuristic = heuristic
+        self.violations = violations
+        self.violations_only = violations_only
+
+    @property
+    def consistent(self) -> bool:
+        return len(self.violations) == 0
+
+    def formatCondition(self, edge: int, holds: bool, ndjson: bool = False) -> str:
+        state_from = self.sources[edge]
+        state_to = self.targets[edge]
+        if(ndjson):
+            return json.dumps({"type": "condition", "result": "OK" if holds else "ERR", "from": self.names[state_from], "to": self.names[state_to],
+                "h_from": self.heuristic[state_from], "h_to": self.heuristic[state_to], "cost": self.costs[edge]})
+        return f"[CONDITION]: {'[OK]' if holds else '[ERR]'} h({self.names[state_from]}) <= h({self.names[state_to]}) + c: {self.heuristic[state_from]} <= {self.heuristic[state_to]} + {self.costs[edge]}"
+
+    def formatConclusion(self, ndjson: bool = False) -> str:
+        if(ndjson):
+            return json.dumps({"type": "conclusion", "consistent": self.consistent})
+        return f"[CONCLUSION]: Heuristic {'is' if self.consistent is True else 'is not'} consistent."
+
+    def lines(self, ndjson: bool = False):
+        if(self.violations_only):
+            for edge in self.violations:
+                yield self.formatCondition(edge, False, ndjson)
+        else:
+            #violations are sorted edge indices
+            violations = iter(self.violations)
+            next_violation = next(violations, None)
+            for edge in range(len(self.targets)):
+                holds = edge != next_violation
+                if(not holds):
+                    next_violation = next(violations, None)
+                yield self.formatCondition(edge, holds, ndjson)
+        yield self.formatConclusion(ndjson)
+
+    def getSummary(self, ndjson: bool = False):
+        """Returns number of violated conditions and conclusion without formatting every condition"""
+        if(ndjson):
+            s = json.dumps({"type": "summary", "violations": len(self.violations), "transitions": len(self.targets)}) + "\n"
+        else:
+            s = f"[VIOLATIONS]: {len(self.violations)} of {len(self.targets)}\n"
+        s += self.formatConclusion(ndjson)
 
-        s += f"[CONCLUSION]: Heuristic {'is' if consistent is True else 'is not'} consistent."
-        
         return s
 
 
-class OptimisticDescriptor:
-    def __init__(self):
-        self.entries = {}
+class OptimisticDescriptor(ConditionReport):
+    """Optimism check of every state against its true cost-to-go
 
-    def addEntry(self, state, cost, heuristic):
-        self.entries[state] = (cost, heuristic)
+    Attributes:
+        states: States in report order
+        graph (CompiledGraph): Compiled state space mapping state names to ids
+        costs_to_go: Cost of the cheapest path to an ending state indexed by state id, inf if none is reachable
+        heuristic (dict of str: float): Heuristic value of every state
+    """
+    def __init__(self, states, graph, costs_to_go, heuristic):
+        self.states = states
+        self.graph = graph
+        self.costs_to_go = costs_to_go
+        self.heuristic = heuristic
+
+    def conditions(self):
+        """Yields (state, cost, heuristic, holds) for every state, cost is None if no ending state is reachable"""
+        inf = float("inf")
+        get_state_id = self.graph.getStateId
+        costs_to_go = self.costs_to_go
+        heuristic = self.heuristic
+        for state in self.states:
+            cost = costs_to_go[get_state_id(state)]
+            if(cost == inf):
+                cost = None
+            state_h = heuristic[state]
+            yield state, cost, state_h, cost is None or state_h <= cost
 
-    def getFormattedOutput(self):
-        s = ""
+    @property
+    def optimistic(self) -> bool:
+        return all(condition[3] for condition in self.conditions())
+
+    def lines(self, ndjson: bool = False):
         optimistic = True
-        for state, entry in self.entries.items():
-            cost, heuristic = entry
-            entry_result = None
-            if(entry[1] <= entry[0]):
-                entry_result = "[OK]"
-            else:
-                entry_result = "[ERR]"
+        for state, cost, state_h, holds in self.conditions():
+            if(not holds):
                 optimistic = False
-            s += f"[CONDITION]: {entry_result} h({state}) <= h*: {heuristic} <= {cost}\n"
-
-        s += f"[CONCLUSION]: Heuristic {'is' if optimistic is True else 'is not'} optimistic."
+            if(ndjson):
+                yield json.dumps({"type": "condition", "result": "OK" if holds else "ERR", "state": state, "h": state_h, "h_star": cost})
+            else:
+                yield f"[CONDITION]: {'[OK]' if holds else '[ERR]'} h({state}) <= h*: {state_h} <= {cost}"
 
-        return s
\ No newline at end of file
+        if(ndjson):
+            yield json.dumps({"type": "conclusion", "optimistic": optimistic})
+        else:
+            yield f"[CONCLUSION]: Heuristic {'is' if optimistic is True else 'is not'} optimistic."
\ No newline at end of file
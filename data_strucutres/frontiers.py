@@ -0,0 +1,270 @@
+from array import array
+import heapq
+
+
+class Frontier:
+    """Priority queue of state ids used as open list by UCS and A*
+
+    Pushing a state which is already in the frontier only lowers its priority (decrease-key),
+    pushing it with the same or higher priority is ignored. Popped states may be pushed again.
+
+    Time complexities differ by backend, see subclasses.
+    """
+    def push(self, state: int, priority: float) -> None:
+        """Inserts state or lowers its priority
+
+        Args:
+            state (int): Id of the state
+            priority (float): Priority of the state, lower is popped first
+        """
+        raise NotImplementedError
+
+    def pop(self) -> tuple[float, int]:
+        """Removes state with the lowest priority
+
+        Returns:
+            tuple[float, int]: Priority and id of the state
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return self.size
+
+    def empty(self) -> bool:
+        """Checks if frontier is empty
+
+        Returns:
+            bool: True if empty, False otherwise
+        """
+        return self.size == 0
+
+
+class HeapFrontier(Frontier):
+    """Binary heap (heapq) with lazy deletion
+
+    Decrease-key pushes a new entry, outdated entries are skipped when popped.
+    Ties are broken by state id.
+    Time complexities:
+        push: O(log(n))
+        pop: O(log(n)) amortized
+    """
+    def __init__(self, capacity: int):
+        self.heap = []
+        self.priorities = [float("inf")] * capacity
+        self.size = 0
+
+    def push(self, state: int, priority: float) -> None:
+        current = self.priorities[state]
+        if(priority < current):
+            if(current == float("inf")):
+                self.size += 1
+            self.priorities[state] = priority
+            heapq.heappush(self.heap, (priority, state))
+
+    def pop(self) -> tuple[float, int]:
+        heap = self.heap
+        priorities = self.priorities
+        heappop = heapq.heappop
+        while(True):
+            priority, state = heappop(heap)
+            #skip entries whose priority has been decreased since
+            if(priorities[state] == priority):
+                priorities[state] = float("inf")
+                self.size -= 1
+                return priority, state
+
+
+class DaryHeapFrontier(Frontier):
+    """Indexed d-ary heap with real decrease-key
+
+    Position of every state in the heap is kept in an array indexed by state id, so the heap
+    never holds outdated entries. Ties are broken by state id.
+    Time complexities:
+        push: O(log_d(n))
+        pop: O(d * log_d(n))
+    """
+    def __init__(self, capacity: int, d: int = 4):
+        self.d = d
+        self.states = []
+        self.priorities = []
+        self.positions = [-1] * capacity
+        self.size = 0
+
+    def push(self, state: int, priority: float) -> None:
+        pos = self.positions[state]
+        if(pos == -1):
+            pos = self.size
+            self.states.append(state)
+            self.priorities.append(priority)
+            self.size += 1
+        elif(priority < self.priorities[pos]):
+            self.priorities[pos] = priority
+        else:
+            return
+        self.siftUp(pos, state, priority)
+
+    def siftUp(self, pos: int, state: int, priority: float) -> None:
+        """Moves state at pos towards the root until heap property holds"""
+        states = self.states
+        priorities = self.priorities
+        positions = self.positions
+        d = self.d
+        while(pos > 0):
+            parent = (pos - 1) // d
+            parent_priority = priorities[parent]
+            if(parent_priority < priority or (parent_priority == priority and states[parent] < state)):
+                break
+            parent_state = states[parent]
+            states[pos] = parent_state
+            priorities[pos] = parent_priority
+            positions[parent_state] = pos
+            pos = parent
+        states[pos] = state
+        priorities[pos] = priority
+        positions[state] = pos
+
+    def siftDown(self, pos: int, state: int, priority: float) -> None:
+        """Moves state at pos towards the leaves until heap property holds"""
+        states = self.states
+        priorities = self.priorities
+        positions = self.positions
+        d = self.d
+        size = self.size
+        while(True):
+            first_child = pos * d + 1
+            if(first_child >= size):
+                break
+            best = first_child
+            best_priority = priorities[first_child]
+            best_state = states[first_child]
+            for child in range(first_child + 1, min(first_child + d, size)):
+                child_priority = priorities[child]
+                if(child_priority < best_priority or (child_priority == best_priority and states[child] < best_state)):
+                    best = child
+                    best_priority = child_priority
+                    best_state = states[child]
+            if(priority < best_priority or (priority == best_priority and state < best_state)):
+                break
+            states[pos] = best_state
+            priorities[pos] = best_priority
+            positions[best_state] = pos
+            pos = best
+        states[pos] = state
+        priorities[pos] = priority
+        positions[state] = pos
+
+    def pop(self) -> tuple[float, int]:
+        states = self.states
+        priorities = self.priorities
+        state = states[0]
+        priority = priorities[0]
+        self.positions[state] = -1
+        self.size -= 1
+        last_state = states.pop()
+        last_priority = priorities.pop()
+        if(self.size > 0):
+            self.siftDown(0, last_state, last_priority)
+
+        return priority, state
+
+
+class BucketFrontier(Frontier):
+    """Bucket queue (Dial's algorithm) for integer priorities
+
+    States are kept in one bucket per distinct priority. A small heap holds the priorities of
+    non-empty buckets, so priorities may have any range and may go below the last popped one.
+    With small integer edge costs there are few distinct priorities, so most operations are a list append or pop.
+    Priorities have to be integers, states of one bucket are popped in arbitrary order.
+    Time complexities:
+        push: O(1), O(log(b)) when a new bucket is created, b is number of non-empty buckets
+        pop: O(1) amortized, O(log(b)) when a bucket is emptied
+    """
+    def __init__(self, capacity: int):
+        self.buckets = {}
+        self.keys = []
+        self.priorities = [float("inf")] * capacity
+        self.size = 0
+
+    def push(self, state: int, priority: float) -> None:
+        current = self.priorities[state]
+        if(priority < current):
+            if(current == float("inf")):
+                self.size += 1
+            self.priorities[state] = priority
+            key = int(priority)
+            bucket = self.buckets.get(key)
+            if(bucket is None):
+                self.buckets[key] = [state]
+                heapq.heappush(self.keys, key)
+            else:
+                bucket.append(state)
+
+    def pop(self) -> tuple[float, int]:
+        buckets = self.buckets
+        keys = self.keys
+        priorities = self.priorities
+        while(True):
+            key = keys[0]
+            bucket = buckets[key]
+            while(bucket):
+                state = bucket.pop()
+                priority = priorities[state]
+                #skip entries whose priority has been decreased since
+                if(priority != float("inf") and int(priority) == key):
+                    priorities[state] = float("inf")
+                    self.size -= 1
+                    return priority, state
+            del buckets[key]
+            heapq.heappop(keys)
+
+
+FRONTIERS = {
+    "heap": HeapFrontier,
+    "dary": DaryHeapFrontier,
+    "bucket": BucketFrontier,
+}
+
+BUCKET_MAX_COST = 1024
+
+
+def hasIntegerPriorities(graph, heuristic = None, max_cost: float = float("inf")) -> bool:
+    """Checks if all transition costs are non-negative integers not larger than max_cost and heuristic (if given) is integral
+
+    Heuristics computed on demand (anything but a list, array or memoryview) are not evaluated and count as fractional.
+    """
+    max_integer_cost = graph.maxIntegerCost()
+    if(max_integer_cost is None or max_integer_cost > max_cost):
+        return False
+    if(heuristic is None):
+        return True
+    if(not isinstance(heuristic, (list, array, memoryview))):
+        return False
+    return all(map(float.is_integer, map(float, heuristic)))
+
+
+def selectFrontier(name: str, graph, heuristic = None) -> Frontier:
+    """Creates frontier for searching graph
+
+    Args:
+        name (str): One of FRONTIERS or "auto". "auto" picks BucketFrontier if all transition costs
+            are non-negative integers not larger than BUCKET_MAX_COST and heuristic (if given) is integral,
+            HeapFrontier otherwise. "bucket" raises ValueError unless costs and heuristic are integral.
+            Compiled searches default to "heap", which breaks ties by state id like the searches over
+            descriptors, while states of a bucket are popped in arbitrary order
+        graph (CompiledGraph): Graph which will be searched
+        heuristic: Heuristic value of every state indexed by state id, None for UCS
+
+    Returns:
+        Frontier: Empty frontier with capacity for every state of graph
+    """
+    if(name == "auto"):
+        name = "bucket" if hasIntegerPriorities(graph, heuristic, BUCKET_MAX_COST) else "heap"
+    elif(name == "bucket" and not hasIntegerPriorities(graph, heuristic)):
+        #bucket order of fractional priorities would be wrong, not just slow
+        raise ValueError("Bucket frontier needs non-negative integer transition costs and integer heuristic, use heap or auto")
+    try:
+        frontier_class = FRONTIERS[name]
+    except KeyError as e:
+        raise ValueError(f"Unknown frontier \"{name}\", expected one of: auto, {', '.join(FRONTIERS)}")
+
+    return frontier_class(graph.num_states)
@@ -0,0 +1,204 @@
+from data_strucutres.state_space import StateSpace
+from data_strucutres.descriptors import HeuristicDescriptor
+from data_strucutres.pattern_database import PatternDatabase, AdditivePatternDatabase
+
+
+class NPuzzle(StateSpace):
+    """Sliding tile puzzle (8-puzzle, 15-puzzle) with boards packed into a single int
+
+    Every cell takes 4 bits holding its tile number (0 for the blank), cell i is stored at bits
+    4 * (i + 1) and the lowest 4 bits hold the position of the blank. Moving a tile into the blank
+    is a constant number of shifts and additions, so successors are generated in O(1) each.
+
+    State names use the format of heuristic files: rows separated by "_", tiles "1"-"9" then "a"-"f"
+    and "x" for the blank, e.g. "123_456_78x".
+
+    Attributes:
+        size (int): Number of rows and columns
+        starting_state (int): Packed starting board
+        ending_states (list[int]): Packed solved board
+        moves (list[tuple[int, ...]]): Cells from which a tile can move into the blank at each cell
+    """
+    TILE_CHARACTERS = "x123456789abcdef"
+    HEURISTICS = ("manhattan", "misplaced", "pdb")
+
+    def __init__(self, size: int, starting_state: int, ending_state: int = None):
+        if(not 2 <= size <= 4):
+            raise ValueError(f"Puzzle size must be between 2 and 4, got {size}")
+        self.size = size
+        cells = size * size
+        if(ending_state is None):
+            ending_state = NPuzzle.pack(list(range(1, cells)) + [0])
+        self.starting_state = starting_state
+        self.ending_states = [ending_state]
+        self.moves = []
+        for blank in range(cells):
+            row, column = divmod(blank, size)
+            moves = []
+            if(row > 0):
+                moves.append(blank - size)
+            if(row < size - 1):
+                moves.append(blank + size)
+            if(column > 0):
+                moves.append(blank - 1)
+            if(column < size - 1):
+                moves.append(blank + 1)
+            self.moves.append(tuple(moves))
+
+    @staticmethod
+    def fromName(starting_state: str, ending_state: str = None) -> "NPuzzle":
+        """Creates puzzle from state names
+
+        Args:
+            starting_state (str): Name of the starting board, e.g. "867_254_3x1"
+            ending_state (str): Name of the solved board, tiles in order followed by blank if None
+
+        Returns:
+            NPuzzle: Puzzle with size inferred from starting state
+        """
+        size = len(starting_state.split("_"))
+        return NPuzzle(size, NPuzzle.parseState(starting_state), None if ending_state is None else NPuzzle.parseState(ending_state))
+
+    @staticmethod
+    def pack(tiles: list[int]) -> int:
+        """Packs tiles listed row by row (0 for blank) into a state"""
+        state = tiles.index(0)
+        for cell, tile in enumerate(tiles):
+            state |= tile << (4 * cell + 4)
+        return state
+
+    def unpack(self, state: int) -> list[int]:
+        """Gets tiles of the state listed row by row (0 for blank)"""
+        return [(state >> (4 * cell + 4)) & 15 for cell in range(self.size * self.size)]
+
+    @staticmethod
+    def parseState(name: str) -> int:
+        """Packs board given by its name"""
+        tiles = [NPuzzle.TILE_CHARACTERS.index(x) for x in name.replace("_", "")]
+        if(sorted(tiles) != list(range(len(tiles)))):
+            raise ValueError(f"\"{name}\" is not a valid puzzle board")
+        return NPuzzle.pack(tiles)
+
+    def getStateName(self, state: int) -> str:
+        tiles = "".join([NPuzzle.TILE_CHARACTERS[x] for x in self.unpack(state)])
+        return "_".join([tiles[i:i + self.size] for i in range(0, len(tiles), self.size)])
+
+    def getStateTransitions(self, state: int) -> list[tuple[int, float]]:
+        blank = state & 15
+        transitions = []
+        for cell in self.moves[blank]:
+            shift = 4 * cell + 4
+            tile = (state >> shift) & 15
+            #move tile from cell to blank, blank takes its place
+            transitions.append((state - (tile << shift) + (tile << (4 * blank + 4)) - blank + cell, 1.0))
+        return transitions
+
+    def isSolvable(self, state: int = None) -> bool:
+        """Checks whether ending state can be reached from state using permutation parity
+
+        Args:
+            state (int): State to check, starting state if None
+
+        Returns:
+            bool: True if ending state is reachable, False otherwise
+        """
+        if(state is None):
+            state = self.starting_state
+        return self.parity(state) == self.parity(self.ending_states[0])
+
+    def parity(self, state: int) -> int:
+        tiles = self.unpack(state)
+        blank_row = tiles.index(0) // self.size
+        tiles = [x for x in tiles if x != 0]
+        inversions = sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+        if(self.size % 2 == 1):
+            return inversions % 2
+        return (inversions + blank_row) % 2
+
+    @staticmethod
+    def isBuiltInHeuristic(name: str) -> bool:
+        """Checks if name is one of NPuzzle.HEURISTICS, pattern database may be followed by its patterns"""
+        return name is not None and name.split(":")[0] in NPuzzle.HEURISTICS
+
+    def parsePatterns(self, name: str) -> list[tuple[int, ...]]:
+        """Gets patterns of pattern database heuristic
+
+        Args:
+            name (str): "pdb" for PatternDatabase.defaultPatterns or "pdb:" followed by patterns
+                separated by "/", each given by its tiles, e.g. "pdb:1234/5678"
+
+        Returns:
+            list[tuple[int, ...]]: Tiles of every pattern
+        """
+        if(name == "pdb"):
+            return PatternDatabase.defaultPatterns(self.size)
+        if(not name.startswith("pdb:")):
+            raise ValueError(f"Invalid pattern database heuristic \"{name}\"")
+        try:
+            return [tuple(NPuzzle.TILE_CHARACTERS.index(x) for x in pattern) for pattern in name[4:].split("/")]
+        except ValueError as e:
+            raise ValueError(f"Invalid pattern database heuristic \"{name}\", expected pdb:TILES[/TILES ...]")
+
+    def getHeuristic(self, name: str) -> "NPuzzleHeuristic":
+        """Creates built-in heuristic
+
+        Args:
+            name (str): One of NPuzzle.HEURISTICS, see NPuzzle.parsePatterns for pattern databases
+
+        Returns:
+            NPuzzleHeuristic: Heuristic which can be indexed by packed states,
+                AdditivePatternDatabase built in memory for pattern databases
+        """
+        if(not NPuzzle.isBuiltInHeuristic(name)):
+            raise ValueError(f"Unknown puzzle heuristic \"{name}\", expected one of: {', '.join(NPuzzle.HEURISTICS)}")
+        if(name.startswith("pdb")):
+            return AdditivePatternDatabase([PatternDatabase.build(self, pattern) for pattern in self.parsePatterns(name)])
+        return NPuzzleHeuristic(self, name == "manhattan")
+
+    def heuristicFromDescriptor(self, heuristic_descriptor: HeuristicDescriptor) -> "NPuzzleHeuristicTable":
+        """Converts heuristic keyed by state names to heuristic keyed by packed states"""
+        return NPuzzleHeuristicTable(self, {NPuzzle.parseState(state): value for state, value in heuristic_descriptor.pairs.items()})
+
+
+class NPuzzleHeuristicTable(dict):
+    """Heuristic of a heuristic file keyed by packed states
+
+    Heuristic files may list only some boards, looking up a missing board raises ValueError
+    naming the board instead of KeyError.
+    """
+    def __init__(self, puzzle: NPuzzle, pairs: dict[int, float]):
+        super().__init__(pairs)
+        self.puzzle = puzzle
+
+    def __missing__(self, state: int) -> float:
+        raise ValueError(f"Heuristic has no value for board \"{self.puzzle.getStateName(state)}\"")
+
+
+class NPuzzleHeuristic:
+    """Manhattan distance or misplaced tiles heuristic computed on demand
+
+    Indexed like a heuristic dict, h = heuristic[state].
+    """
+    def __init__(self, puzzle: NPuzzle, manhattan: bool):
+        self.cells = puzzle.size * puzzle.size
+        goal = puzzle.unpack(puzzle.ending_states[0])
+        #cost[cell][tile] of tile placed at cell
+        self.cost = []
+        for cell in range(self.cells):
+            row, column = divmod(cell, puzzle.size)
+            cell_costs = [0] * self.cells
+            for goal_cell, tile in enumerate(goal):
+                if(tile == 0 or goal_cell == cell):
+                    continue
+                goal_row, goal_column = divmod(goal_cell, puzzle.size)
+                cell_costs[tile] = abs(row - goal_row) + abs(column - goal_column) if manhattan else 1
+            self.cost.append(cell_costs)
+
+    def __getitem__(self, state: int) -> float:
+        cost = self.cost
+        state >>= 4
+        h = 0
+        for cell in range(self.cells):
+            h += cost[cell][state & 15]
+            state >>= 4
+        return float(h)
@@ -0,0 +1,80 @@
+from array import array
+from data_strucutres.descriptors import SearchResult, Node
+
+
+class NodeStore:
+    """Search nodes of states identified by arbitrary hashable values, kept in parallel arrays
+
+    Every reached state is interned to a dense id in order of discovery. Parent id and path cost
+    are stored in arrays indexed by that id, so expanding a state allocates no node objects and
+    the path is reconstructed only for the goal that is found.
+
+    Attributes:
+        ids (dict): Id of every reached state
+        states (list): State of every id
+        parents (array): Id of the previous state on the cheapest known path, -1 for starting state
+        costs (array): Cost of the cheapest known path to every state
+        closed (bytearray): closed[i] is 1 if state i was expanded, 0 otherwise
+    """
+    def __init__(self):
+        self.ids = {}
+        self.states = []
+        self.parents = array('i')
+        self.costs = array('d')
+        self.closed = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def add(self, state, parent: int, cost: float) -> int:
+        """Interns a newly reached state
+
+        Args:
+            state: State which has no id yet
+            parent (int): Id of the previous state on the path, -1 for starting state
+            cost (float): Cost of the path
+
+        Returns:
+            int: Id of the state
+        """
+        state_id = len(self.states)
+        self.ids[state] = state_id
+        self.states.append(state)
+        self.parents.append(parent)
+        self.costs.append(cost)
+        self.closed.append(0)
+        return state_id
+
+    def getPathIds(self, state_id: int) -> list[int]:
+        """Gets ids of states on the path from starting state to state_id"""
+        parents = self.parents
+        path_ids = []
+        while(state_id != -1):
+            path_ids.append(state_id)
+            state_id = parents[state_id]
+        path_ids.reverse()
+        return path_ids
+
+    def getNode(self, state_id: int) -> Node:
+        """Builds linked Node chain of the path to state_id"""
+        node = None
+        for x in self.getPathIds(state_id):
+            node = Node(self.states[x], self.costs[x], node)
+        return node
+
+    def buildSearchResult(self, goal: int, states_visited: int, state_name = str) -> SearchResult:
+        """Reconstructs path to goal and maps it to state names
+
+        Args:
+            goal (int): Id of the goal state that was found
+            states_visited (int): Number of states algorithm visited during search
+            state_name: Function returning name of a state
+
+        Returns:
+            SearchResult: Information about search
+        """
+        path_ids = self.getPathIds(goal)
+        states = self.states
+        path = " => ".join([state_name(states[x]) for x in path_ids]) + " "
+
+        return SearchResult(True, states_visited, len(path_ids), self.costs[goal], path, self.getNode(goal))
@@ -0,0 +1,144 @@
+from collections import deque
+import math
+
+
+class PatternDatabase:
+    """Exact solution costs of a sliding tile puzzle abstracted to a subset of tiles
+
+    Tiles outside the pattern are indistinguishable, so an abstract state is the cells of pattern tiles.
+    Only moves of pattern tiles are counted, which makes databases of disjoint patterns additive.
+
+    Cells of the tiles are ranked as a partial permutation: the i-th tile contributes the number of free
+    cells before its cell, digits are combined with radices cells, cells - 1, ... which maps the
+    cells!/(cells - k)! placements of k tiles onto consecutive indices of a bytearray.
+
+    Attributes:
+        size (int): Number of rows and columns of the puzzle
+        goal (int): Packed solved board
+        pattern (tuple[int, ...]): Tiles of the pattern
+        table (bytearray): Cost of every placement of pattern tiles indexed by its rank
+    """
+    #cost of placements never reached by the search
+    UNREACHED = 255
+
+    def __init__(self, size: int, goal: int, pattern: tuple, table):
+        self.size = size
+        self.goal = goal
+        self.pattern = tuple(pattern)
+        self.table = table
+
+    @staticmethod
+    def rank(positions, cells: int) -> int:
+        """Ranks cells of distinct tiles among all placements of len(positions) tiles"""
+        index = 0
+        used = 0
+        for i, position in enumerate(positions):
+            index = index * (cells - i) + position - (used & ((1 << position) - 1)).bit_count()
+            used |= 1 << position
+        return index
+
+    @staticmethod
+    def unrank(index: int, cells: int, k: int) -> list[int]:
+        """Inverse of PatternDatabase.rank for k tiles"""
+        digits = [0] * k
+        for i in range(k - 1, -1, -1):
+            index, digits[i] = divmod(index, cells - i)
+        positions = []
+        free = list(range(cells))
+        for digit in digits:
+            positions.append(free.pop(digit))
+        return positions
+
+    @staticmethod
+    def defaultPatterns(size: int) -> list[tuple[int, ...]]:
+        """Splits tiles into disjoint patterns of at most 5 tiles with sizes as even as possible"""
+        tiles = list(range(1, size * size))
+        count = math.ceil(len(tiles) / 5)
+        bounds = [round(i * len(tiles) / count) for i in range(count + 1)]
+        return [tuple(tiles[bounds[i]:bounds[i + 1]]) for i in range(count)]
+
+    @staticmethod
+    def build(puzzle, pattern: tuple) -> "PatternDatabase":
+        """Computes pattern database by a backward breadth first search from the solved board
+
+        Search runs over cells of pattern tiles and the blank. Moving the blank onto a cell of another tile
+        costs 0 and moving a pattern tile costs 1, so 0 cost successors are put at the front of the queue.
+        Cost of a placement of pattern tiles is the lowest cost over all positions of the blank.
+
+        Args:
+            puzzle (NPuzzle): Puzzle whose ending state is the goal of the database
+            pattern (tuple): Distinct tiles of the pattern
+
+        Returns:
+            PatternDatabase: Database with table of cells!/(cells - len(pattern))! bytes
+        """
+        cells = puzzle.size * puzzle.size
+        goal = puzzle.unpack(puzzle.ending_states[0])
+        pattern = tuple(pattern)
+        if(len(set(pattern)) != len(pattern) or not all(0 < tile < cells for tile in pattern)):
+            raise ValueError(f"Invalid pattern {pattern} of {cells - 1}-puzzle")
+        k = len(pattern)
+        rank = PatternDatabase.rank
+        unrank = PatternDatabase.unrank
+        moves = puzzle.moves
+        unreached = PatternDatabase.UNREACHED
+
+        #costs of placements of pattern tiles followed by the blank
+        costs = bytearray([unreached]) * (math.perm(cells, k + 1))
+        start = rank([goal.index(tile) for tile in pattern] + [goal.index(0)], cells)
+        costs[start] = 0
+        queue = deque([start])
+        while(queue):
+            index = queue.popleft()
+            cost = costs[index]
+            positions = unrank(index, cells, k + 1)
+            blank = positions[k]
+            for cell in moves[blank]:
+                next_positions = positions[:]
+                next_positions[k] = cell
+                if(cell in positions):
+                    next_positions[positions.index(cell)] = blank
+                    next_cost = cost + 1
+                else:
+                    next_cost = cost
+                next_index = rank(next_positions, cells)
+                if(next_cost < costs[next_index]):
+                    costs[next_index] = next_cost
+                    if(next_cost == cost):
+                        queue.appendleft(next_index)
+                    else:
+                        queue.append(next_index)
+
+        #rank of the blank is the last digit, so placements of pattern tiles are consecutive runs of cells - k
+        blanks = cells - k
+        table = bytearray(min(costs[i:i + blanks]) for i in range(0, len(costs), blanks))
+
+        return PatternDatabase(puzzle.size, puzzle.ending_states[0], pattern, table)
+
+    def lookup(self, tile_cells) -> int:
+        """Gets cost of the board given by cell of every tile"""
+        return self.table[PatternDatabase.rank([tile_cells[tile] for tile in self.pattern], self.size * self.size)]
+
+
+class AdditivePatternDatabase:
+    """Sum of disjoint pattern databases
+
+    Indexed like a heuristic dict, h = heuristic[state].
+
+    Attributes:
+        databases (list[PatternDatabase]): Databases of disjoint patterns of the same puzzle and goal
+    """
+    def __init__(self, databases: list[PatternDatabase]):
+        tiles = [tile for database in databases for tile in database.pattern]
+        if(len(set(tiles)) != len(tiles)):
+            raise ValueError("Patterns of additive pattern database must be disjoint")
+        self.databases = databases
+        self.cells = databases[0].size * databases[0].size
+
+    def __getitem__(self, state: int) -> float:
+        tile_cells = [0] * 16
+        state >>= 4
+        for cell in range(self.cells):
+            tile_cells[state & 15] = cell
+            state >>= 4
+        return float(sum(database.lookup(tile_cells) for database in self.databases))
@@ -2,15 +2,57 @@ class PriorityQueue:
     """
     Models priority queue.\n
     Implemented using min heap data structure.\n
+    Elements, their priorities and their keys are kept in parallel arrays, so
+    optimization_key_extractor is called only once per inserted element.\n
     Time complexities:
         element addition: O(log(n))
         element search: O(1)
+        element modification: O(log(n))
     """
-    def __init__(self, optimization_key_extractor = lambda x: x):
-        self.lookup_dict = {}
+    def __init__(self, optimization_key_extractor = lambda x: x, capacity: int = None):
+        """
+        Args:
+            optimization_key_extractor: Extracts key by which elements are searched, used if key is not passed explicitly
+            capacity (int): If specified, keys are ints in range [0, capacity) (e.g. interned state ids)
+                and positions are stored in a list indexed by key instead of a dict
+        """
         self.optimization_key_extractor = optimization_key_extractor
+        self.capacity = capacity
+        if(capacity is None):
+            self.lookup_dict = {}
+        else:
+            #position 0 is never used by heap, so it marks missing keys
+            self.lookup_dict = [0] * capacity
         self.size = 0
         self.data = [None]
+        self.priorities = [None]
+        self.keys = [None]
+
+
+    def siftUp(self, pos: int) -> None:
+        """Moves element at pos towards the root while it is smaller than its parent
+
+        Args:
+            pos (int): Position of the element
+        """
+        lookup_dict = self.lookup_dict
+        data = self.data
+        priorities = self.priorities
+        keys = self.keys
+        element = data[pos]
+        priority = priorities[pos]
+        key = keys[pos]
+        while(pos > 1 and priority < priorities[pos//2]):
+            parent = pos//2
+            data[pos] = data[parent]
+            priorities[pos] = priorities[parent]
+            keys[pos] = keys[parent]
+            lookup_dict[keys[pos]] = pos
+            pos = parent
+        data[pos] = element
+        priorities[pos] = priority
+        keys[pos] = key
+        lookup_dict[key] = pos
 
 
     def minHeapify(self, pos: int) -> None:
@@ -21,125 +63,138 @@ class PriorityQueue:
         """
         lookup_dict = self.lookup_dict
         data = self.data
+        priorities = self.priorities
+        keys = self.keys
+        size = self.size
+        element = data[pos]
+        priority = priorities[pos]
+        key = keys[pos]
         #if leaf not reached
-        while(pos*2 <= self.size):
-            if(pos*2 + 1 > self.size):
-                #if there is no right child
-                if(data[pos*2][1] < data[pos][1]):
-                    lookup_dict[self.optimization_key_extractor(data[pos][0])] = pos*2
-                    lookup_dict[self.optimization_key_extractor(data[pos*2][0])] = pos
-                    data[pos*2], data[pos] = data[pos], data[pos*2]
-                return
-            if(data[pos][1] <= data[pos*2][1] and data[pos][1] <= data[pos*2 + 1][1]):
-                return
-            if(data[pos*2][1] <= data[pos*2 + 1][1]):
-                #left child is smaller than current
-                lookup_dict[self.optimization_key_extractor(data[pos][0])] = pos*2
-                lookup_dict[self.optimization_key_extractor(data[pos*2][0])] = pos
-                data[pos*2], data[pos] = data[pos], data[pos*2]
-                pos = pos * 2
-            else:
-                #right child is smaller than current
-                lookup_dict[self.optimization_key_extractor(data[pos][0])] = pos*2 + 1
-                lookup_dict[self.optimization_key_extractor(data[pos*2 + 1][0])] = pos
-                data[pos*2 + 1], data[pos] = data[pos], data[pos*2 + 1]
-                pos = pos * 2 + 1
-        
-
-    def insert(self, element: object, priority: object) -> None:
+        while(pos*2 <= size):
+            child = pos*2
+            #pick right child if it is smaller than left child
+            if(child + 1 <= size and priorities[child + 1] < priorities[child]):
+                child += 1
+            if(not priorities[child] < priority):
+                break
+            data[pos] = data[child]
+            priorities[pos] = priorities[child]
+            keys[pos] = keys[child]
+            lookup_dict[keys[pos]] = pos
+            pos = child
+        data[pos] = element
+        priorities[pos] = priority
+        keys[pos] = key
+        lookup_dict[key] = pos
+
+
+    def insert(self, element: object, priority: object, key: object = None) -> None:
         """Insert element with specific priority
-        
+
         Args:
             element (object): element to be added
             priority (object): comparable value used to compare elements in priority queue
+            key (object): key by which element is searched, extracted with optimization_key_extractor if None
         """
-        lookup_dict = self.lookup_dict
-        data = self.data
+        if(key is None):
+            key = self.optimization_key_extractor(element)
         self.size += 1
-        data.append((element, priority))
-        current_index = self.size
-        lookup_dict[self.optimization_key_extractor(element)] = current_index
-
-        while(current_index > 1 and data[current_index][1] < data[current_index//2][1]):
-            lookup_dict[self.optimization_key_extractor(data[current_index][0])] = current_index//2
-            lookup_dict[self.optimization_key_extractor(data[current_index//2][0])] = current_index
-            data[current_index//2], data[current_index] = data[current_index], data[current_index//2]
-            current_index = current_index//2
+        self.data.append(element)
+        self.priorities.append(priority)
+        self.keys.append(key)
+        self.siftUp(self.size)
 
     def get(self) -> object:
         """Gets next element from priority queue
-        
+
         Returns:
             object: Next element if not empty, None otherwise
         """
-        lookup_dict = self.lookup_dict
+        if(self.size == 0):
+            return None
         data = self.data
-        if(len(data) > 1):
-            first_h_element = data[1]
-            last_h_element = data[-1]
-            lookup_dict[self.optimization_key_extractor(last_h_element[0])] = 1
-            data[1] = last_h_element
-            del data[-1]
-            del lookup_dict[self.optimization_key_extractor(first_h_element[0])]
-            self.size -= 1
+        first_element = data[1]
+        self.removeKey(self.keys[1])
+        last_element = data.pop()
+        last_priority = self.priorities.pop()
+        last_key = self.keys.pop()
+        self.size -= 1
+        if(self.size > 0):
+            data[1] = last_element
+            self.priorities[1] = last_priority
+            self.keys[1] = last_key
             self.minHeapify(1)
-            return first_h_element[0]
+        return first_element
+
+
+    def removeKey(self, key: object) -> None:
+        """Removes key from position index"""
+        if(self.capacity is None):
+            del self.lookup_dict[key]
         else:
-            return None
+            self.lookup_dict[key] = 0
 
 
-    def getIndex(self, element: object) -> int:
+    def getIndex(self, element: object, key: object = None) -> int:
         """Gets index of the element with the same extracted feature according to optimization_key_extractor
-        
+
         Args:
             element (object): Element containing a feature based on which to find the element in priority queue
+            key (object): Key of the element, extracted from element with optimization_key_extractor if None
 
         Returns:
             int: Index of element with same feature according to optimization_key_extractor if found, -1 otherwise
         """
-        try:
-            index = self.lookup_dict[self.optimization_key_extractor(element)]
-            return index
-        except KeyError as e:
-            return -1
-    
-
-    def getElement(self, element: object) -> object:
+        if(key is None):
+            key = self.optimization_key_extractor(element)
+        if(self.capacity is None):
+            return self.lookup_dict.get(key, -1)
+        index = self.lookup_dict[key]
+        return index if index != 0 else -1
+
+
+    def getElement(self, element: object, key: object = None) -> object:
         """Gets extracted_element with the same extracted feature as element according to optimization_key_extractor
-        
+
         Args:
             element (object): Element containing a feature based on which to find the element in priority queue
+            key (object): Key of the element, extracted from element with optimization_key_extractor if None
 
         Returns:
             object: Extracted element with same feature as element according to optimization_key_extractor if found, None otherwise
         """
-        
-        try:
-            index = self.lookup_dict[self.optimization_key_extractor(element)]
-            extracted_element = self.data[index][0]
-            return extracted_element
-        except KeyError as e:
+        index = self.getIndex(element, key)
+        if(index == -1):
+            return None
+        return self.data[index]
+
+    def getPriority(self, element: object, key: object = None) -> object:
+        """Gets priority of the element with the same extracted feature as element
+
+        Returns:
+            object: Priority if element found, None otherwise
+        """
+        index = self.getIndex(element, key)
+        if(index == -1):
             return None
+        return self.priorities[index]
 
-    def contains(self, element: object) -> bool:
+    def contains(self, element: object, key: object = None) -> bool:
         """Checks if priority queue contains element based on extracted feature extracted according to optimization_key_extractor
-        
+
         Args:
             element (object): Element containing feature based on which to find element in priority queue
+            key (object): Key of the element, extracted from element with optimization_key_extractor if None
 
         Returns:
             bool: True if element with feature found, False otherwise
         """
-        try:
-            extracted_element = self.lookup_dict[self.optimization_key_extractor(element)]
-            return True
-        except KeyError as e:
-            return False
-    
+        return self.getIndex(element, key) != -1
+
 
     def empty(self) -> bool:
         """Checks if priority queue is empty
-        
+
         Returns:
             bool: True if empty, False otherwise
         """
@@ -148,37 +203,42 @@ class PriorityQueue:
 
     def size(self) -> int:
         """Gets number of elements in priority queue
-        
+
         Returns:
             int: number of elements in priority queue
         """
         return self.size
-    
 
-    def modifyElement(self, element, new_element, new_priority) -> object:
+
+    def modifyElement(self, element, new_element, new_priority, key: object = None) -> object:
         """Replaces element found in priority queue based on feature extracted based on optimization_key_extractor with new_element
-        
+
+        Element is sifted up if its priority decreased (decrease-key) and down if it increased.
+        new_element must have the same key as element.
+
         Args:
             element (object): Element containing feature based on which to find element to replace in priority queue
             new_element (object): Element to replace the existing element in priority queue
+            new_priority (object): New priority of the element
+            key (object): Key of the element, extracted from element with optimization_key_extractor if None
 
         Returns:
             object: Element which has been replaced if found, None otherwise
         """
-        index = self.getIndex(element)
+        index = self.getIndex(element, key)
         if(index == -1):
             return None
-        old_h_element = self.data[index]
-        #del self.data[index]
-        self.data[index] = (new_element, new_priority)
-        #del self.lookup_dict[self.optimization_key_extractor(element)]
-        #self.lookup_dict[self.optimization_key_extractor(element)] = 1
-        while(index >= 1):
+        old_element = self.data[index]
+        old_priority = self.priorities[index]
+        self.data[index] = new_element
+        self.priorities[index] = new_priority
+        if(new_priority < old_priority):
+            self.siftUp(index)
+        else:
             self.minHeapify(index)
-            index //=2
 
-        return old_h_element
+        return old_element
 
 
     def __str__(self) -> str:
-        return [f'{element.__str__()} {priority.__str__()}' for element, priority in self.data[1:]].__str__()
+        return [f'{element.__str__()} {priority.__str__()}' for element, priority in zip(self.data[1:], self.priorities[1:])].__str__()
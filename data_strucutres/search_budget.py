@@ -0,0 +1,75 @@
+from data_strucutres.descriptors import BudgetExceededResult
+import time
+
+
+class CancellationToken:
+    """Flag through which another thread asks running searches to stop
+
+    Attributes:
+        cancelled (bool): True once cancel was called
+    """
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class SearchBudget:
+    """Limits of a single search
+
+    Engines compare their expansion count with nextCheck in the expansion loop and call check only when
+    it is reached, so the clock, frontier size and cancellation token are read once every check_interval
+    expansions. Expansion limit is exact, the rest may be exceeded by at most check_interval expansions.
+    A budget holds no state of a running search, so one budget may be shared by concurrent searches.
+
+    Attributes:
+        max_time_ms (float): Wall time limit of a search, unlimited if None
+        max_expansions (int): Limit of expanded states, unlimited if None
+        max_frontier (int): Limit of frontier size, unlimited if None
+        token (CancellationToken): Token checked for cancellation, never cancelled if None
+        check_interval (int): Number of expansions between checks of time, frontier and token
+    """
+    def __init__(self, max_time_ms: float = None, max_expansions: int = None, max_frontier: int = None, token: CancellationToken = None, check_interval: int = 256):
+        if(check_interval < 1):
+            raise ValueError(f"Invalid check interval {check_interval}, expected at least 1")
+        self.max_time_ms = max_time_ms
+        self.max_expansions = max_expansions
+        self.max_frontier = max_frontier
+        self.token = token
+        self.check_interval = check_interval
+        self.max_time_ns = int(max_time_ms * 1e6) if max_time_ms is not None else None
+
+    def nextCheck(self, expansions: int) -> int:
+        """Gets expansion count at which check has to be called next"""
+        next_check = expansions + self.check_interval
+        if(self.max_expansions is not None and self.max_expansions < next_check):
+            return self.max_expansions
+        return next_check
+
+    def check(self, start_ns: int, expansions: int, frontier_size: int) -> BudgetExceededResult:
+        """Checks every limit
+
+        Args:
+            start_ns (int): time.perf_counter_ns() when the search started
+            expansions (int): Number of states expanded so far
+            frontier_size (int): Current size of the frontier
+
+        Returns:
+            BudgetExceededResult: Result to return if any limit is exceeded, None otherwise
+        """
+        reason = None
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        if(self.token is not None and self.token.cancelled):
+            reason = "cancelled"
+        elif(self.max_expansions is not None and expansions >= self.max_expansions):
+            reason = "expansions"
+        elif(self.max_frontier is not None and frontier_size > self.max_frontier):
+            reason = "frontier"
+        elif(self.max_time_ns is not None and elapsed_ns >= self.max_time_ns):
+            reason = "time"
+        if(reason is None):
+            return None
+        return BudgetExceededResult(reason, expansions, frontier_size, elapsed_ns / 1e6)
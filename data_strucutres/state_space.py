@@ -0,0 +1,35 @@
+class StateSpace:
+    """State space whose transitions are generated on demand
+
+    Search algorithms only need the starting state, a way to recognize ending states and the
+    transitions of a single state at a time, so large state spaces never have to be materialized.
+    States can be any hashable objects.
+
+    Attributes:
+        starting_state: State from which to start search
+        ending_states: Container of states which end the search if found
+    """
+    starting_state = None
+    ending_states = ()
+
+    def getStateTransitions(self, state) -> list[tuple[object, float]]:
+        """Gets all the transitions of the specified state
+
+        Args:
+            state: State from which to transition
+
+        Returns:
+            list[tuple[object, float]]: list of transitions with costs
+        """
+        raise NotImplementedError
+
+    def getStateName(self, state) -> str:
+        """Gets name of the state used in search results
+
+        Args:
+            state: State
+
+        Returns:
+            str: Name of the state
+        """
+        return str(state)
@@ -1,49 +1,326 @@
 from utils.input_parser import Parser
 from algorithms.search_algorithms import BFS, UCS, A_STAR
 from algorithms.heuristic_check import HeuristicCheck
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS, CompiledA_STAR
+from algorithms.bidirectional_search import BidirectionalBFS, BidirectionalUCS
+from algorithms.memory_bounded_search import IDA_STAR, SMA_STAR
+from algorithms.anytime_search import ARA_STAR
+from algorithms.contraction_hierarchy_search import ContractionHierarchySearch
+from algorithms.cost_to_go import ShortestPathTreeCache
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.n_puzzle import NPuzzle
+from data_strucutres.descriptors import HeuristicDescriptor, SearchResult, SearchStats
+from data_strucutres.search_budget import SearchBudget
+from algorithms.landmarks import LandmarkHeuristic
+from utils.snapshot import Snapshot, HierarchySnapshot, LandmarkSnapshot, PatternDatabaseSnapshot
+from data_strucutres.pattern_database import AdditivePatternDatabase
+from utils.batch_query import BatchQuery
+from utils.query_server import QueryServer, ServedMap
 import argparse
+import asyncio
+import json
+import sys
+import time
 
-if(__name__=="__main__"):
-    flags_parser = argparse.ArgumentParser()
+
+#headers of algorithms which search puzzles
+PUZZLE_HEADERS = {"bfs": "BFS", "ucs": "UCS", "astar": "A-STAR", "idastar": "IDA-STAR", "smastar": "SMA-STAR", "arastar": "ARA-STAR"}
+
+
+def landmarkCount(heuristic_name: str) -> int:
+    """Gets number of landmarks K of heuristic "alt:K", None for other heuristics"""
+    if(heuristic_name is None or not heuristic_name.startswith("alt:")):
+        return None
+    if(not heuristic_name[4:].isdigit() or int(heuristic_name[4:]) == 0):
+        raise ValueError(f"Invalid landmark heuristic \"{heuristic_name}\", expected alt:K with K > 0")
+    return int(heuristic_name[4:])
+
+
+def loadHeuristicDescriptor(input_parser: Parser, heuristic_name: str, landmark_heuristic: LandmarkHeuristic = None) -> HeuristicDescriptor:
+    """Parses heuristic file, or evaluates landmark heuristic of every state if there is one"""
+    if(landmark_heuristic is not None):
+        return landmark_heuristic.toHeuristicDescriptor()
+    return input_parser.parseHeuristicDescriptor(heuristic_name)
+
+
+def loadHeuristic(input_parser: Parser, state_space_descriptor, heuristic_name: str, landmark_heuristic: LandmarkHeuristic = None, pdb_directory: str = None):
+    """Loads heuristic for search over uncompiled state space, built-in puzzle heuristics are looked up by name
+
+    Pattern databases are stored in pdb_directory and reused by later runs, or built in memory if it is None.
+    """
+    if(landmark_heuristic is not None):
+        return landmark_heuristic.toHeuristicDescriptor().pairs
+    if(isinstance(state_space_descriptor, NPuzzle)):
+        if(NPuzzle.isBuiltInHeuristic(heuristic_name)):
+            if(heuristic_name.startswith("pdb") and pdb_directory is not None):
+                patterns = state_space_descriptor.parsePatterns(heuristic_name)
+                return AdditivePatternDatabase([PatternDatabaseSnapshot.loadOrBuild(pdb_directory, state_space_descriptor, x) for x in patterns])
+            return state_space_descriptor.getHeuristic(heuristic_name)
+        return state_space_descriptor.heuristicFromDescriptor(input_parser.parseHeuristicDescriptor(heuristic_name))
+    return input_parser.parseHeuristicDescriptor(heuristic_name).pairs
+
+
+def printResult(search_result: SearchResult, stats: SearchStats = None, start_ns: int = 0) -> None:
+    """Prints search result, followed by stats as JSON if they are collected
+
+    Everything since start_ns which is not spent in search engines is counted as parsing.
+    """
+    if(stats is None):
+        print(search_result.getFormattedOutput())
+        return
+    output_start_ns = time.perf_counter_ns()
+    stats.parse_ns = output_start_ns - start_ns - stats.search_ns
+    print(search_result.getFormattedOutput())
+    stats.output_ns = time.perf_counter_ns() - output_start_ns
+    print(f"[STATS]: {stats.toJSON()}")
+
+
+def printCheckHeader(check: str, heuristic_file_name: str, ndjson: bool = False) -> None:
+    """Prints header of a heuristic check report, as a JSON object if report is NDJSON"""
+    if(ndjson):
+        print(json.dumps({"type": "header", "check": check, "heuristic": heuristic_file_name}))
+    else:
+        print(f"# HEURISTIC_{check.upper()} {heuristic_file_name}")
+
+
+def main(args) -> None:
+    start_ns = time.perf_counter_ns()
+    stats = SearchStats() if args.stats else None
+    budget = None
+    if(args.deadline_ms is not None or args.max_expansions is not None or args.max_frontier is not None):
+        budget = SearchBudget(args.deadline_ms, args.max_expansions, args.max_frontier)
     input_parser = Parser()
 
-    #parse flags
-    flags_parser.add_argument('--alg', action="store", dest='alg', default=None)
-    flags_parser.add_argument('--ss', action="store", dest='ss', default=None)
-    flags_parser.add_argument('--h', action="store", dest='h', default=None)
-    flags_parser.add_argument('--check-optimistic', action="store", dest='check_optimistic', nargs='?', const="0", default=None)
-    flags_parser.add_argument('--check-consistent', action="store", dest='check_consistent', nargs='?', const="0", default=None)
-    args = flags_parser.parse_args()
+    if(args.serve is not None):
+        #maps are loaded once and queried over a socket until the server is interrupted
+        served_maps = []
+        if(args.ss is not None):
+            served_maps.append(ServedMap(args.ss, [args.h] if args.h is not None else []))
+        for served_map in args.serve_maps:
+            paths = served_map.split(",")
+            served_maps.append(ServedMap(paths[0], paths[1:]))
+        limits = {"deadline_ms": args.deadline_ms, "max_expansions": args.max_expansions, "max_frontier": args.max_frontier}
+        server = QueryServer(served_maps, args.workers, limits, args.reload_interval)
+        try:
+            asyncio.run(server.serve(args.serve))
+        except KeyboardInterrupt:
+            pass
+        return
     
+    if(args.frontier is not None or args.alg in ("bidir-ucs", "bidir-bfs", "ch") or args.queries is not None or args.preprocess is not None):
+        args.compiled = True
+    if(args.check_consistent is not None and (args.violations_only or args.summary)):
+        #only the check over edge arrays reports violations alone or a summary
+        args.compiled = True
+    if(args.frontier is None):
+        args.frontier = "heap"
+    if(args.puzzle is not None and args.compiled):
+        raise ValueError("Puzzle transitions are generated on demand, compiled, bidirectional and contraction hierarchy searches need a state space file")
+    landmark_count = landmarkCount(args.h)
+    if(landmark_count is not None and args.alg == "astar"):
+        #landmark heuristic is evaluated on demand by compiled A*
+        args.compiled = True
+    if(args.prune):
+        if(args.puzzle is not None or args.alg not in ("bfs", "ucs", "astar", "bidir-bfs", "bidir-ucs") or args.queries is not None or landmark_count is not None):
+            raise ValueError("Dead end pruning only applies to bfs, ucs, astar and bidirectional searches of a state space file")
+        #graph is pruned once and kept in a snapshot next to the map
+        args.snapshot = True
+
     #parse data
-    state_space_descriptor=input_parser.parseStateSpaceDescription(args.ss)
-    
+    if(args.puzzle is not None):
+        #puzzle transitions are generated on demand
+        state_space_descriptor = NPuzzle.fromName(args.puzzle)
+        transitions = state_space_descriptor
+    elif(args.snapshot and args.check_optimistic is None and args.alg not in ("idastar", "smastar", "arastar")):
+        #memory map snapshot, rebuilding it if source files changed
+        heuristic_path = args.h if (args.alg == "astar" or args.check_consistent is not None) and landmark_count is None else None
+        graph, heuristic = Snapshot.loadOrCompile(args.ss, heuristic_path, prune=args.prune)
+        args.compiled = True
+    else:
+        state_space_descriptor=input_parser.parseStateSpaceDescription(args.ss)
+        transitions = state_space_descriptor.transitions
+        if(args.compiled):
+            graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    if(args.alg in ("bidir-ucs", "bidir-bfs")):
+        reversed_graph = graph.reversed()
+    landmark_heuristic = None
+    if(landmark_count is not None):
+        if(args.puzzle is not None):
+            raise ValueError("Landmark heuristic needs a state space file")
+        if(not args.compiled):
+            graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        #landmarks are selected once and stored next to the map
+        landmark_heuristic = LandmarkSnapshot.loadOrBuild(args.ss, landmark_count, graph).heuristic(graph)
+        heuristic = landmark_heuristic
+
+    if(args.preprocess is not None and landmarkCount(args.preprocess) is not None):
+        print("# ALT LANDMARKS")
+        landmarks_path, preprocessing_ns = LandmarkSnapshot.build(args.ss, landmarkCount(args.preprocess), graph)
+        landmarks = LandmarkSnapshot.load(landmarks_path)
+        print(f"[LANDMARKS]: {' '.join([graph.names[x] for x in landmarks.landmarks])}")
+        print(f"[PREPROCESSING_MS]: {preprocessing_ns / 1e6:.1f}")
+        print(f"[SNAPSHOT]: {landmarks_path}")
+        return
+    if(args.preprocess == "ch"):
+        print("# CONTRACTION HIERARCHY")
+        hierarchy_path, preprocessing_ns = HierarchySnapshot.build(args.ss, graph)
+        hierarchy = HierarchySnapshot.load(hierarchy_path)
+        print(f"[STATES]: {hierarchy.num_states}")
+        print(f"[EDGES]: {hierarchy.num_edges}")
+        print(f"[SHORTCUTS]: {hierarchy.num_shortcuts}")
+        print(f"[PREPROCESSING_MS]: {preprocessing_ns / 1e6:.1f}")
+        print(f"[SNAPSHOT]: {hierarchy_path}")
+        return
+    if(args.preprocess is not None):
+        raise ValueError(f"Unknown preprocessing \"{args.preprocess}\", expected ch or alt:K")
+    if(args.alg == "ch"):
+        #hierarchy is built next to the map if it is missing or outdated
+        hierarchy = HierarchySnapshot.loadOrBuild(args.ss, graph)
+
+    if(args.puzzle is not None and args.alg in PUZZLE_HEADERS and not state_space_descriptor.isSolvable()):
+        #boards of the other permutation parity are never reached, so none of their states has to be expanded
+        if(args.alg in ("bfs", "ucs")):
+            print(f"# {PUZZLE_HEADERS[args.alg]}")
+        else:
+            heuristic_file_name = args.h.split('\\')[-1]
+            print(f"# {PUZZLE_HEADERS[args.alg]} {heuristic_file_name}")
+        printResult(SearchResult(False, 0), stats, start_ns)
+        return
+
+    if(args.queries is not None):
+        #map is loaded once and shared by all queries
+        snapshot_path = Snapshot.defaultPath(args.ss) if args.snapshot else None
+        hierarchy_path = HierarchySnapshot.defaultPath(args.ss) if args.alg == "ch" else None
+        queries = BatchQuery.readQueries(sys.stdin if args.queries == "-" else args.queries)
+        BatchQuery.run(graph, queries, sys.stdout, args.alg, args.frontier, args.workers, snapshot_path, cache_bytes=args.tree_cache_mb * 1024 * 1024, hierarchy_path=hierarchy_path)
+        return
 
     if(args.alg == "bfs"):
         print("# BFS")
-        searchResult = BFS.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, state_space_descriptor.transitions)
-        print(searchResult.getFormattedOutput())
+        if(args.compiled):
+            searchResult = CompiledBFS.search(graph, stats=stats, budget=budget)
+        else:
+            searchResult = BFS.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, transitions, stats, budget)
+        printResult(searchResult, stats, start_ns)
     elif(args.alg == "ucs"):
         print("# UCS")
-        searchResult = UCS.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, state_space_descriptor.transitions)
-        print(searchResult.getFormattedOutput())
+        if(args.compiled):
+            searchResult = CompiledUCS.search(graph, frontier=args.frontier, stats=stats, budget=budget)
+        else:
+            searchResult = UCS.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, transitions, stats, budget)
+        printResult(searchResult, stats, start_ns)
     elif(args.alg == "astar"):
-        heuristic_descriptor = input_parser.parseHeuristicDescriptor(args.h)
         heuristic_file_name = args.h.split('\\')[-1]
         print(f"# A-STAR {heuristic_file_name}")
-        searchResult = A_STAR.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, state_space_descriptor.transitions, heuristic_descriptor.pairs)
-        print(searchResult.getFormattedOutput())
+        if(args.snapshot or landmark_heuristic is not None):
+            searchResult = CompiledA_STAR.search(graph, heuristic, frontier=args.frontier, stats=stats, budget=budget)
+        elif(args.compiled):
+            heuristic_descriptor = input_parser.parseHeuristicDescriptor(args.h)
+            searchResult = CompiledA_STAR.search(graph, graph.compileHeuristic(heuristic_descriptor), frontier=args.frontier, stats=stats, budget=budget)
+        else:
+            heuristic = loadHeuristic(input_parser, state_space_descriptor, args.h, landmark_heuristic, args.pdb_dir)
+            searchResult = A_STAR.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, transitions, heuristic, stats, budget)
+        printResult(searchResult, stats, start_ns)
+    elif(args.alg == "idastar"):
+        heuristic_file_name = args.h.split('\\')[-1]
+        print(f"# IDA-STAR {heuristic_file_name}")
+        heuristic = loadHeuristic(input_parser, state_space_descriptor, args.h, landmark_heuristic, args.pdb_dir)
+        searchResult = IDA_STAR.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, transitions, heuristic, stats, budget)
+        printResult(searchResult, stats, start_ns)
+    elif(args.alg == "smastar"):
+        heuristic_file_name = args.h.split('\\')[-1]
+        print(f"# SMA-STAR {heuristic_file_name}")
+        heuristic = loadHeuristic(input_parser, state_space_descriptor, args.h, landmark_heuristic, args.pdb_dir)
+        searchResult = SMA_STAR.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, transitions, heuristic, args.max_nodes, stats, budget)
+        printResult(searchResult, stats, start_ns)
+    elif(args.alg == "arastar"):
+        heuristic_file_name = args.h.split('\\')[-1]
+        print(f"# ARA-STAR {heuristic_file_name}")
+        heuristic = loadHeuristic(input_parser, state_space_descriptor, args.h, landmark_heuristic, args.pdb_dir)
+        searchResult = ARA_STAR.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, transitions, heuristic, args.weight,
+            budget=budget, stats=stats)
+        printResult(searchResult, stats, start_ns)
+    elif(args.alg == "bidir-bfs"):
+        print("# BIDIRECTIONAL BFS")
+        searchResult = BidirectionalBFS.search(graph, reversed_graph, stats=stats, budget=budget)
+        printResult(searchResult, stats, start_ns)
+    elif(args.alg == "ch"):
+        print("# CONTRACTION HIERARCHY")
+        searchResult = ContractionHierarchySearch.search(graph, hierarchy, stats=stats, budget=budget)
+        printResult(searchResult, stats, start_ns)
+    elif(args.alg == "bidir-ucs"):
+        print("# BIDIRECTIONAL UCS")
+        searchResult = BidirectionalUCS.search(graph, reversed_graph, stats=stats, budget=budget)
+        printResult(searchResult, stats, start_ns)
     elif(args.check_optimistic == "0"):
         heuristic_file_name = args.h.split('\\')[-1]
-        print(f"# HEURISTIC_OPTIMISTIC {heuristic_file_name}")
-        heuristic_descriptor = input_parser.parseHeuristicDescriptor(args.h)
-        result = HeuristicCheck.checkOptimisitc(state_space_descriptor, heuristic_descriptor)
-        print(result.getFormattedOutput())
+        printCheckHeader("optimistic", heuristic_file_name, args.ndjson)
+        heuristic_descriptor = loadHeuristicDescriptor(input_parser, args.h, landmark_heuristic)
+        cache = None
+        if(args.tree_cache_mb > 0):
+            #cost-to-go is read from the cached tree of ending states instead of a separate search
+            if(not args.compiled and landmark_heuristic is None):
+                graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+            cache = ShortestPathTreeCache(graph, args.tree_cache_mb * 1024 * 1024)
+        result = HeuristicCheck.checkOptimisitc(state_space_descriptor, heuristic_descriptor, cache)
+        result.writeOutput(sys.stdout, args.ndjson)
     elif(args.check_consistent != None):
         heuristic_file_name = args.h.split('\\')[-1]
-        print(f"# HEURISTIC_CONSISTENT {heuristic_file_name}")
-        heuristic_descriptor = input_parser.parseHeuristicDescriptor(args.h)
-        result = HeuristicCheck.checkConsistent(state_space_descriptor, heuristic_descriptor)
-        print(result.getFormattedOutput())
+        printCheckHeader("consistent", heuristic_file_name, args.ndjson)
+        if(args.compiled):
+            if(landmark_heuristic is not None):
+                heuristic = landmark_heuristic.toArray()
+            elif(not args.snapshot):
+                heuristic = graph.compileHeuristic(input_parser.parseHeuristicDescriptor(args.h))
+            result = HeuristicCheck.checkConsistentVectorized(graph, heuristic, args.violations_only)
+            if(args.summary):
+                print(result.getSummary(args.ndjson))
+            else:
+                result.writeOutput(sys.stdout, args.ndjson)
+        else:
+            heuristic_descriptor = loadHeuristicDescriptor(input_parser, args.h, landmark_heuristic)
+            result = HeuristicCheck.checkConsistent(state_space_descriptor, heuristic_descriptor)
+            result.writeOutput(sys.stdout, args.ndjson)
     else:
         print("Invalid input")
+
+
+if(__name__=="__main__"):
+    flags_parser = argparse.ArgumentParser()
+
+    #parse flags
+    flags_parser.add_argument('--alg', action="store", dest='alg', default=None)
+    flags_parser.add_argument('--ss', action="store", dest='ss', default=None)
+    flags_parser.add_argument('--h', action="store", dest='h', default=None)
+    flags_parser.add_argument('--check-optimistic', action="store", dest='check_optimistic', nargs='?', const="0", default=None)
+    flags_parser.add_argument('--check-consistent', action="store", dest='check_consistent', nargs='?', const="0", default=None)
+    flags_parser.add_argument('--compiled', action="store_true", dest='compiled', default=False)
+    flags_parser.add_argument('--snapshot', action="store_true", dest='snapshot', default=False)
+    flags_parser.add_argument('--prune', action="store_true", dest='prune', default=False)
+    flags_parser.add_argument('--puzzle', action="store", dest='puzzle', default=None)
+    flags_parser.add_argument('--frontier', action="store", dest='frontier', choices=["auto", "heap", "dary", "bucket"], default=None)
+    flags_parser.add_argument('--violations-only', action="store_true", dest='violations_only', default=False)
+    flags_parser.add_argument('--summary', action="store_true", dest='summary', default=False)
+    flags_parser.add_argument('--ndjson', action="store_true", dest='ndjson', default=False)
+    flags_parser.add_argument('--max-nodes', action="store", dest='max_nodes', type=int, default=100000)
+    flags_parser.add_argument('--queries', action="store", dest='queries', default=None)
+    flags_parser.add_argument('--workers', action="store", dest='workers', type=int, default=None)
+    flags_parser.add_argument('--preprocess', action="store", dest='preprocess', default=None)
+    flags_parser.add_argument('--tree-cache-mb', action="store", dest='tree_cache_mb', type=int, default=0)
+    flags_parser.add_argument('--pdb-dir', action="store", dest='pdb_dir', default=None)
+    flags_parser.add_argument('--stats', action="store_true", dest='stats', default=False)
+    flags_parser.add_argument('--weight', action="store", dest='weight', type=float, default=3.0)
+    flags_parser.add_argument('--deadline-ms', action="store", dest='deadline_ms', type=float, default=None)
+    flags_parser.add_argument('--max-expansions', action="store", dest='max_expansions', type=int, default=None)
+    flags_parser.add_argument('--max-frontier', action="store", dest='max_frontier', type=int, default=None)
+    flags_parser.add_argument('--serve', action="store", dest='serve', default=None)
+    flags_parser.add_argument('--serve-map', action="append", dest='serve_maps', default=[])
+    flags_parser.add_argument('--reload-interval', action="store", dest='reload_interval', type=float, default=1.0)
+    args = flags_parser.parse_args()
+
+    try:
+        main(args)
+    except ValueError as e:
+        #invalid input files, puzzle boards or options
+        print(e)
+        exit()
\ No newline at end of file
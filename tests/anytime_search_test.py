@@ -0,0 +1,50 @@
+from algorithms.anytime_search import ARA_STAR
+from algorithms.search_algorithms import A_STAR
+from data_strucutres.descriptors import BudgetExceededResult
+from data_strucutres.search_budget import SearchBudget
+from data_strucutres.n_puzzle import NPuzzle
+from utils.input_parser import Parser
+from utils.map_generator import MapGenerator
+import os
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+tests = [1,1]
+if(tests[0]):
+    #without a budget last iteration is optimal
+    test_passed = True
+    instances = []
+    for map_name, heuristic_name in [("istra.txt", "istra_heuristic.txt"), ("ai.txt", "ai_pass.txt"), ("my.txt", "my_heuristic.txt")]:
+        state_space_descriptor = Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name))
+        heuristic = Parser.parseHeuristicDescriptor(os.path.join(maps_dir, heuristic_name)).pairs
+        instances.append((map_name, state_space_descriptor.starting_state, state_space_descriptor.ending_states, state_space_descriptor.transitions, heuristic))
+    puzzle = NPuzzle.fromName("8x6_543_721")
+    instances.append(("8x6_543_721", puzzle.starting_state, puzzle.ending_states, puzzle, puzzle.getHeuristic("manhattan")))
+    for name, starting_state, ending_states, transitions, heuristic in instances:
+        expected = A_STAR.search(starting_state, ending_states, transitions, heuristic)
+        actual = ARA_STAR.search(starting_state, ending_states, transitions, heuristic, weight=2.5)
+        costs = [x[1] for x in actual.solutions]
+        if(actual.total_cost != expected.total_cost or actual.suboptimality_bound != 1.0 or actual.interrupted or costs != sorted(costs, reverse=True)):
+            print(f"{name} expected: {expected.total_cost} actual: {actual.total_cost} {actual.suboptimality_bound} {actual.solutions}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #solution returned when expansions run out is within its bound of the optimal cost
+    test_passed = True
+    state_space_descriptor, heuristic_descriptor = MapGenerator.grid(60, 60, 4)
+    ss = state_space_descriptor
+    expected = A_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, heuristic_descriptor.pairs)
+    for max_expansions in [1, 500, 2000, 4000]:
+        actual = ARA_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, heuristic_descriptor.pairs, budget=SearchBudget(max_expansions=max_expansions))
+        if(actual.states_visited > max_expansions):
+            test_passed = False
+        if(actual.found_solution and not expected.total_cost <= actual.total_cost <= actual.suboptimality_bound * expected.total_cost):
+            test_passed = False
+        interrupted = actual.reason if isinstance(actual, BudgetExceededResult) else actual.interrupted
+        if(not test_passed or (max_expansions == 1 and actual.found_solution) or interrupted != "expansions"):
+            print(f"{max_expansions} expected: {expected.total_cost} actual: {actual.total_cost} {interrupted}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,32 @@
+from utils.input_parser import Parser
+from utils.batch_query import BatchQuery
+from data_strucutres.compiled_graph import CompiledGraph
+import io
+import os
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(os.path.join(maps_dir, "istra.txt")))
+queries = ["Pula Buzet", "Buzet Pula", "Pula Opatija Umag", "Pula Nowhere", "Medulin Medulin"] * 4
+
+tests = [1,1]
+if(tests[0]):
+    output = io.StringIO()
+    BatchQuery.run(graph, BatchQuery.readQueries(io.StringIO("# comment\n" + "\n".join(queries[:5]) + "\n\n")), output, "ucs", workers=1)
+    lines = output.getvalue().splitlines()
+    test_passed = len(lines) == 5 and "[TOTAL_COST]: 100.0" in lines[0] and "[TOTAL_COST]: 113.0" in lines[2] and "[ERROR]" in lines[3]
+    if(not test_passed):
+        print(f"actual: {lines}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #answers of worker pool must come in input order
+    expected = io.StringIO()
+    BatchQuery.run(graph, queries, expected, "bfs", workers=1)
+    actual = io.StringIO()
+    BatchQuery.run(graph, queries, actual, "bfs", workers=2, chunk_size=3)
+    test_passed = expected.getvalue() == actual.getvalue()
+    if(not test_passed):
+        print(f"expected: {expected.getvalue()} actual: {actual.getvalue()}")
+
+    print(f"Test passed: {test_passed}")
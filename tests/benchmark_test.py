@@ -0,0 +1,43 @@
+from utils.benchmark import Benchmark
+from utils.map_generator import MapGenerator
+from algorithms.compiled_search_algorithms import CompiledUCS, CompiledA_STAR
+from algorithms.heuristic_check import HeuristicCheck
+from data_strucutres.compiled_graph import CompiledGraph
+
+tests = [1,1,1]
+if(tests[0]):
+    #only metrics worse than baseline by more than threshold are regressions
+    baseline = {"grid/a": {"wall_s": 1.0, "expansions_per_s": 1000.0, "peak_bytes": 100}, "grid/b": {"wall_s": 0.001}}
+    results = {"grid/a": {"wall_s": 1.1, "expansions_per_s": 500.0, "peak_bytes": 200}, "grid/b": {"wall_s": 0.003}, "grid/c": {"wall_s": 9.0}}
+    actual = [x.split(":")[0] for x in Benchmark.compare(results, baseline, 0.25)]
+    expected = ["grid/a expansions_per_s", "grid/a peak_bytes"]
+    test_passed = actual == expected
+    if(not test_passed):
+        print(f"expected: {expected} actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #every bundled map is measured with every heuristic named after it
+    results = Benchmark.run(["maps"], repeat=1, memory=False)
+    expected = ["maps/istra/astar[istra_heuristic]", "maps/istra/check-optimistic[istra_pessimistic_heuristic]", "maps/ai/compiled-astar[ai_pass]"]
+    test_passed = all(x in results for x in expected) and all(x["wall_s"] > 0 for x in results.values())
+    if(not test_passed):
+        print(f"expected: {expected} actual: {sorted(results)}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #generated heuristics are admissible and consistent, and goal is reachable
+    test_passed = True
+    for state_space_descriptor, heuristic_descriptor in [MapGenerator.grid(20, 15, 3), MapGenerator.geometric(2000, 3)]:
+        graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        heuristic = graph.compileHeuristic(heuristic_descriptor)
+        expected = CompiledUCS.search(graph)
+        actual = CompiledA_STAR.search(graph, heuristic)
+        consistent = HeuristicCheck.checkConsistentVectorized(graph, heuristic).consistent
+        if(not expected.found_solution or actual.total_cost != expected.total_cost or not consistent):
+            print(f"expected: {expected.total_cost} actual: {actual.total_cost} consistent: {consistent}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,79 @@
+from utils.input_parser import Parser
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS
+from algorithms.bidirectional_search import BidirectionalBFS, BidirectionalUCS
+from data_strucutres.compiled_graph import CompiledGraph
+from utils.map_generator import MapGenerator
+import os
+import random
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+
+def pathCost(graph: CompiledGraph, path: str) -> float:
+    """Sums costs of the cheapest transitions between consecutive states of the path"""
+    states = [graph.getStateId(x) for x in path.split(" => ")]
+    cost = 0.0
+    for state, next_state in zip(states, states[1:]):
+        cost += min(x[1] for x in graph.getStateTransitions(state) if x[0] == next_state)
+    return cost
+
+
+def compare(graph: CompiledGraph, reversed_graph: CompiledGraph, starting_state: int = None) -> bool:
+    """Checks bidir-ucs cost against UCS and bidir-bfs path length against BFS"""
+    test_passed = True
+    for search, bidirectional_search, field in [(CompiledUCS.search, BidirectionalUCS.search, "total_cost"), (CompiledBFS.search, BidirectionalBFS.search, "path_length")]:
+        expected = search(graph, starting_state)
+        actual = bidirectional_search(graph, reversed_graph, starting_state)
+        if(actual.found_solution != expected.found_solution or getattr(actual, field) != getattr(expected, field)):
+            print(f"expected: {expected.getSingleLineOutput()} actual: {actual.getSingleLineOutput()}")
+            test_passed = False
+        elif(actual.found_solution):
+            #path has to be a real path of the reported length and cost from start to an ending state
+            states = actual.path.strip().split(" => ")
+            if(len(states) != actual.path_length or abs(pathCost(graph, actual.path.strip()) - actual.total_cost) > 1e-9
+                    or graph.getStateId(states[-1]) not in graph.ending_states):
+                print(f"invalid path: {actual.getSingleLineOutput()}")
+                test_passed = False
+    return test_passed
+
+
+tests = [1,1,1]
+if(tests[0]):
+    #bundled maps from every starting state
+    test_passed = True
+    for map_name in ["ai.txt", "istra.txt", "my.txt"]:
+        graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name)))
+        reversed_graph = graph.reversed()
+        for state in range(graph.num_states):
+            test_passed = compare(graph, reversed_graph, state) and test_passed
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #generated graphs with random ending states, some of them unreachable
+    test_passed = True
+    for family in MapGenerator.FAMILIES:
+        for seed in range(5):
+            state_space_descriptor, heuristic_descriptor = MapGenerator.generate(family, 300, seed)
+            graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+            random.seed(seed)
+            graph = graph.withEndingStates(random.sample(range(graph.num_states), 3))
+            reversed_graph = graph.reversed()
+            for state in random.sample(range(graph.num_states), 10):
+                test_passed = compare(graph, reversed_graph, state) and test_passed
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #unreachable goal and starting state which is an ending state
+    state_space_descriptor = MapGenerator.grid(8, 8, 3, wall=True)[0]
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    reversed_graph = graph.reversed()
+    test_passed = not BidirectionalUCS.search(graph, reversed_graph).found_solution and not BidirectionalBFS.search(graph, reversed_graph).found_solution
+    test_passed = compare(graph, reversed_graph) and test_passed
+    for ending_state in graph.ending_states:
+        test_passed = compare(graph, reversed_graph, ending_state) and test_passed
+        result = BidirectionalUCS.search(graph, reversed_graph, ending_state)
+        test_passed = test_passed and result.total_cost == 0.0 and result.path_length == 1
+
+    print(f"Test passed: {test_passed}")
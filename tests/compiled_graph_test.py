@@ -0,0 +1,100 @@
+from utils.input_parser import Parser
+from algorithms.search_algorithms import BFS, UCS
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS, CompiledA_STAR
+from algorithms.bidirectional_search import BidirectionalUCS
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.descriptors import SearchStats, StateSpaceDescriptor, HeuristicDescriptor
+from utils.map_generator import MapGenerator
+import os
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+tests = [1,1,1,1]
+if(tests[0]):
+    test_passed = True
+    for map_name in ["ai.txt", "istra.txt", "my.txt"]:
+        state_space_descriptor = Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name))
+        graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        for algorithm, compiled_algorithm in [(BFS, CompiledBFS), (UCS, CompiledUCS)]:
+            expected = algorithm.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, state_space_descriptor.transitions).getFormattedOutput()
+            actual = compiled_algorithm.search(graph).getFormattedOutput()
+            if(expected != actual):
+                print(f"{map_name} expected: {expected} actual: {actual}")
+                test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    state_space_descriptor = Parser.parseStateSpaceDescription(os.path.join(maps_dir, "my.txt"))
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    reversed_graph = graph.reversed()
+    test_passed = True
+    for state in state_space_descriptor.states:
+        for state_to, cost in state_space_descriptor.getStateTransitions(state):
+            if((graph.getStateId(state), cost) not in reversed_graph.getStateTransitions(graph.getStateId(state_to))):
+                print(f"missing reversed transition: {state_to} -> {state}")
+                test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #pruning dead ends changes no result, starting state in a dead end fails without expanding anything
+    state_space_descriptor, heuristic_descriptor = MapGenerator.grid(10, 10, 4)
+    #one way transition into a loop of states from which the goal cannot be reached
+    state_space_descriptor.transitions["c1_0"].append(("dead0", 1.0))
+    for i in range(20):
+        state_space_descriptor.setTransitions(f"dead{i}", [(f"dead{(i + 1) % 20}", 1.0)])
+        heuristic_descriptor.addPair(f"dead{i}", 0.0)
+    walled_descriptor = MapGenerator.grid(10, 10, 4, wall=True)[0]
+    test_passed = True
+    for descriptor in (state_space_descriptor, walled_descriptor):
+        graph = CompiledGraph.fromStateSpaceDescriptor(descriptor)
+        pruned_graph = graph.pruned()
+        heuristic = graph.compileHeuristic(heuristic_descriptor)
+        for search in (lambda x: CompiledBFS.search(x), lambda x: CompiledUCS.search(x), lambda x: CompiledA_STAR.search(x, heuristic),
+                lambda x: BidirectionalUCS.search(x, x.reversed())):
+            expected = search(graph)
+            actual = search(pruned_graph)
+            if(actual.found_solution != expected.found_solution or actual.found_solution and (actual.total_cost != expected.total_cost or actual.states_visited > expected.states_visited)):
+                print(f"expected: {expected.getSingleLineOutput()} actual: {actual.getSingleLineOutput()}")
+                test_passed = False
+        stats = SearchStats()
+        CompiledUCS.search(pruned_graph, stats=stats)
+        if(descriptor is walled_descriptor and (pruned_graph.canReachGoal(pruned_graph.starting_state) or stats.expanded != 0)):
+            print("starting state behind wall is not a dead end")
+            test_passed = False
+        if(descriptor is state_space_descriptor and (pruned_graph.num_transitions != graph.num_transitions - 21 or any(pruned_graph.goal_reachable[graph.getStateId(f"dead{i}")] for i in range(20)))):
+            print(f"transitions: {graph.num_transitions} pruned: {pruned_graph.num_transitions}")
+            test_passed = False
+    try:
+        pruned_graph.withEndingStates([0])
+        test_passed = False
+    except ValueError:
+        pass
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[3]):
+    #state missing from heuristic is reported instead of compiled to a value A* would silently mishandle,
+    #unless no transition leads to it, like unreachable ending state d
+    state_space_descriptor = StateSpaceDescriptor()
+    state_space_descriptor.starting_state = "a"
+    state_space_descriptor.ending_states = ["c", "d"]
+    state_space_descriptor.setTransitions("a", [("b", 1.0), ("c", 5.0)])
+    state_space_descriptor.setTransitions("b", [("c", 1.0)])
+    state_space_descriptor.setTransitions("c", [])
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    heuristic_descriptor = HeuristicDescriptor()
+    heuristic_descriptor.addPair("a", 2.0)
+    heuristic_descriptor.addPair("c", 0.0)
+    test_passed = True
+    try:
+        graph.compileHeuristic(heuristic_descriptor)
+        test_passed = False
+    except ValueError as e:
+        test_passed = "\"b\"" in str(e)
+    heuristic_descriptor.addPair("b", 1.0)
+    search_result = CompiledA_STAR.search(graph, graph.compileHeuristic(heuristic_descriptor))
+    test_passed = test_passed and search_result.total_cost == 2.0 and search_result.path.strip() == "a => b => c"
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,55 @@
+from utils.input_parser import Parser
+from utils.snapshot import HierarchySnapshot
+from algorithms.compiled_search_algorithms import CompiledUCS
+from algorithms.contraction_hierarchy_search import ContractionHierarchySearch
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.contraction_hierarchy import ContractionHierarchy
+import os
+import shutil
+import tempfile
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+tests = [1,1]
+if(tests[0]):
+    #queries between every pair of states must cost the same as UCS and follow transitions of the map
+    test_passed = True
+    for map_name in ["ai.txt", "istra.txt", "my.txt"]:
+        graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name)))
+        hierarchy = ContractionHierarchy.fromCompiledGraph(graph)
+        for starting_state in range(graph.num_states):
+            for ending_state in range(graph.num_states):
+                expected = CompiledUCS.search(graph.withEndingStates([ending_state]), starting_state)
+                actual = ContractionHierarchySearch.search(graph, hierarchy, starting_state, [ending_state])
+                if(expected.total_cost != actual.total_cost):
+                    print(f"{map_name} {graph.names[starting_state]} {graph.names[ending_state]} expected: {expected.total_cost} actual: {actual.total_cost}")
+                    test_passed = False
+                    continue
+                if(not actual.found_solution):
+                    continue
+                path = [graph.getStateId(name) for name in actual.path.strip().split(" => ")]
+                cost = sum(min(c for state, c in graph.getStateTransitions(a) if state == b) for a, b in zip(path, path[1:]))
+                if(path[0] != starting_state or path[-1] != ending_state or cost != actual.total_cost):
+                    print(f"{map_name} invalid path: {actual.path}")
+                    test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #hierarchy snapshot is rebuilt when map changes
+    temp_dir = tempfile.mkdtemp()
+    state_space_path = shutil.copy(os.path.join(maps_dir, "istra.txt"), temp_dir)
+    graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(state_space_path))
+    hierarchy = HierarchySnapshot.loadOrBuild(state_space_path, graph)
+    actual = [ContractionHierarchySearch.search(graph, hierarchy).total_cost]
+    with open(state_space_path, "a", encoding="utf-8") as file:
+        file.write("\nPula: Buzet,1")
+    graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(state_space_path))
+    hierarchy = HierarchySnapshot.loadOrBuild(state_space_path, graph)
+    actual.append(ContractionHierarchySearch.search(graph, hierarchy).total_cost)
+    test_passed = actual == [100.0, 1.0]
+    if(not test_passed):
+        print(f"expected: [100.0, 1.0] actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
+    shutil.rmtree(temp_dir)
@@ -0,0 +1,67 @@
+from data_strucutres.frontiers import HeapFrontier, DaryHeapFrontier, BucketFrontier, selectFrontier
+from data_strucutres.descriptors import StateSpaceDescriptor
+from data_strucutres.compiled_graph import CompiledGraph
+from algorithms.compiled_search_algorithms import CompiledUCS, CompiledA_STAR
+import random
+
+tests = [1,1]
+if(tests[0]):
+    #every backend must pop states in non-decreasing priority and honour decrease-key
+    test_passed = True
+    for frontier_class in [HeapFrontier, DaryHeapFrontier, BucketFrontier]:
+        random.seed(0)
+        frontier = frontier_class(100)
+        expected = {}
+        for i in range(1000):
+            state = random.randrange(100)
+            priority = float(random.randint(0, 50))
+            frontier.push(state, priority)
+            expected[state] = min(expected.get(state, priority), priority)
+
+        last_priority = -1.0
+        while(not frontier.empty()):
+            priority, state = frontier.pop()
+            if(priority < last_priority or expected.pop(state) != priority):
+                print(f"{frontier_class.__name__} popped: {state} {priority}")
+                test_passed = False
+            last_priority = priority
+        if(expected):
+            print(f"{frontier_class.__name__} not popped: {expected}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #bucket frontier is rejected for fractional costs or heuristic, auto falls back to heap
+    state_space_descriptor = StateSpaceDescriptor()
+    state_space_descriptor.starting_state = "s"
+    state_space_descriptor.ending_states = ["g"]
+    state_space_descriptor.setTransitions("s", [("a", 0.1), ("g", 0.9)])
+    state_space_descriptor.setTransitions("a", [("g", 0.1)])
+    state_space_descriptor.setTransitions("g", [])
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    test_passed = True
+    for frontier in ["heap", "auto"]:
+        result = CompiledUCS.search(graph, frontier=frontier)
+        if(abs(result.total_cost - 0.2) > 1e-9):
+            print(f"{frontier} cost: {result.total_cost}")
+            test_passed = False
+    for heuristic in [None, [0.5, 0.0, 0.0]]:
+        try:
+            selectFrontier("bucket", graph, heuristic)
+            print(f"bucket accepted fractional priorities, heuristic: {heuristic}")
+            test_passed = False
+        except ValueError as e:
+            pass
+    state_space_descriptor.setTransitions("s", [("a", 1.0), ("g", 9.0)])
+    state_space_descriptor.setTransitions("a", [("g", 1.0)])
+    integral_graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    if(not isinstance(selectFrontier("bucket", integral_graph, [1.0, 0.0, 0.0]), BucketFrontier)):
+        test_passed = False
+    try:
+        CompiledA_STAR.search(integral_graph, [0.5, 0.0, 0.0], frontier="bucket")
+        test_passed = False
+    except ValueError as e:
+        pass
+
+    print(f"Test passed: {test_passed}")
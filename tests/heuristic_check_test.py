@@ -0,0 +1,128 @@
+from utils.input_parser import Parser
+from algorithms.search_algorithms import UCS
+from algorithms.cost_to_go import ReverseDijkstra, ShortestPathTreeCache
+from algorithms.heuristic_check import HeuristicCheck
+from algorithms import heuristic_check
+from data_strucutres.compiled_graph import CompiledGraph
+from utils.map_generator import MapGenerator
+import io
+import json
+import os
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+tests = [1,1,1,1,1]
+if(tests[0]):
+    #cost-to-go from reversed search must match forward UCS from every state
+    test_passed = True
+    for map_name in ["ai.txt", "istra.txt", "my.txt"]:
+        state_space_descriptor = Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name))
+        graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        costs_to_go = ReverseDijkstra.search(graph)
+        for state in state_space_descriptor.states:
+            expected = UCS.search(state, state_space_descriptor.ending_states, state_space_descriptor.transitions).total_cost
+            actual = costs_to_go[graph.getStateId(state)]
+            if(expected != actual):
+                print(f"{map_name} {state} expected: {expected} actual: {actual}")
+                test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #lazily grown tree must answer every start like forward UCS
+    test_passed = True
+    for map_name in ["ai.txt", "istra.txt", "my.txt"]:
+        state_space_descriptor = Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name))
+        graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        cache = ShortestPathTreeCache(graph)
+        for state in state_space_descriptor.states:
+            expected = UCS.search(state, state_space_descriptor.ending_states, state_space_descriptor.transitions)
+            actual = cache.search(graph.getStateId(state))
+            if(expected.total_cost != actual.total_cost or not actual.path.startswith(state + " ")):
+                print(f"{map_name} {state} expected: {expected.total_cost} actual: {actual.total_cost}")
+                test_passed = False
+        if(cache.misses != 1):
+            print(f"{map_name} expected 1 miss, actual: {cache.misses}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #optimistic check must give the same result when it reuses a cache, least recently used tree is evicted
+    state_space_path = os.path.join(maps_dir, "istra.txt")
+    heuristic_path = os.path.join(maps_dir, "istra_heuristic.txt")
+    state_space_descriptor = Parser.parseStateSpaceDescription(state_space_path)
+    heuristic_descriptor = Parser.parseHeuristicDescriptor(heuristic_path)
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    cache = ShortestPathTreeCache(graph, max_bytes=1)
+    cache.search(graph.getStateId("Pula"))
+    expected = HeuristicCheck.checkOptimisitc(state_space_descriptor, heuristic_descriptor).getFormattedOutput()
+    actual = HeuristicCheck.checkOptimisitc(state_space_descriptor, heuristic_descriptor, cache).getFormattedOutput()
+    cache.search(graph.getStateId("Pula"), [graph.getStateId("Umag")])
+    test_passed = expected == actual and list(cache.trees) == [(graph.getStateId("Umag"),)]
+    if(not test_passed):
+        print(f"expected: {expected} actual: {actual} trees: {list(cache.trees)}")
+
+    print(f"Test passed: {test_passed}")
+
+
+if(tests[3]):
+    #streamed reports match formatted output, NDJSON reports hold the same conditions with conclusion last
+    state_space_descriptor = Parser.parseStateSpaceDescription(os.path.join(maps_dir, "istra.txt"))
+    heuristic_descriptor = Parser.parseHeuristicDescriptor(os.path.join(maps_dir, "istra_pessimistic_heuristic.txt"))
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    reports = [
+        HeuristicCheck.checkConsistent(state_space_descriptor, heuristic_descriptor),
+        HeuristicCheck.checkConsistentVectorized(graph, graph.compileHeuristic(heuristic_descriptor)),
+        HeuristicCheck.checkOptimisitc(state_space_descriptor, heuristic_descriptor),
+    ]
+    test_passed = True
+    for report in reports:
+        stream = io.StringIO()
+        report.writeOutput(stream)
+        ndjson_stream = io.StringIO()
+        report.writeOutput(ndjson_stream, ndjson=True)
+        lines = stream.getvalue().splitlines()
+        records = [json.loads(x) for x in ndjson_stream.getvalue().splitlines()]
+        errors = [x for x in lines if x.startswith("[CONDITION]: [ERR]")]
+        if(stream.getvalue() != report.getFormattedOutput() + "\n" or len(records) != len(lines) or records[-1]["type"] != "conclusion"
+            or "is not" not in lines[-1] or len(errors) != sum(x.get("result") == "ERR" for x in records) or len(errors) == 0):
+            print(f"expected: {lines[-1]} actual: {records[-1]}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[4]):
+    #vectorized check reports the same conditions as the baseline check, with and without NumPy
+    cases = [("istra.txt", "istra_heuristic.txt"), ("istra.txt", "istra_pessimistic_heuristic.txt"), ("ai.txt", "ai_fail.txt"),
+        ("ai.txt", "ai_pass.txt"), ("my.txt", "my_heuristic.txt")]
+    descriptors = []
+    for map_name, heuristic_name in cases:
+        descriptors.append((Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name)), Parser.parseHeuristicDescriptor(os.path.join(maps_dir, heuristic_name))))
+    #scaled heuristic of a generated map violates some conditions
+    state_space_descriptor, heuristic_descriptor = MapGenerator.generate("geometric", 500, 1)
+    for state in heuristic_descriptor.pairs:
+        heuristic_descriptor.pairs[state] *= 1.5
+    descriptors.append((state_space_descriptor, heuristic_descriptor))
+
+    test_passed = True
+    numpy_module = heuristic_check.numpy
+    for module in ([numpy_module, None] if numpy_module is not None else [None]):
+        heuristic_check.numpy = module
+        for state_space_descriptor, heuristic_descriptor in descriptors:
+            expected = HeuristicCheck.checkConsistent(state_space_descriptor, heuristic_descriptor).getFormattedOutput().splitlines()
+            expected_errors = sorted(x for x in expected if x.startswith("[CONDITION]: [ERR]"))
+            graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+            heuristic = graph.compileHeuristic(heuristic_descriptor)
+            #transitions are listed in state id order, so only sets of conditions are compared
+            actual = HeuristicCheck.checkConsistentVectorized(graph, heuristic).getFormattedOutput().splitlines()
+            violations = HeuristicCheck.checkConsistentVectorized(graph, heuristic, violations_only=True)
+            actual_errors = violations.getFormattedOutput().splitlines()
+            summary = violations.getSummary().splitlines()
+            if(sorted(actual[:-1]) != sorted(expected[:-1]) or actual[-1] != expected[-1] or sorted(actual_errors[:-1]) != expected_errors
+                    or actual_errors[-1] != expected[-1] or summary != [f"[VIOLATIONS]: {len(expected_errors)} of {len(expected) - 1}", expected[-1]]):
+                print(f"numpy: {module is not None} expected: {expected[-1]} {len(expected_errors)} actual: {actual[-1]} {summary}")
+                test_passed = False
+    heuristic_check.numpy = numpy_module
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,112 @@
+from algorithms.incremental_search import LPA_STAR
+from algorithms.compiled_search_algorithms import CompiledUCS
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.descriptors import StateSpaceDescriptor
+from data_strucutres.search_budget import SearchBudget
+from data_strucutres.descriptors import BudgetExceededResult
+from utils.map_generator import MapGenerator
+import random
+
+def pathCost(planner, search_result):
+    path = [planner.graph.getStateId(x) for x in search_result.path.strip().split(" => ")]
+    return sum(planner.getTransitionCost(x, y) for x, y in zip(path, path[1:])), path
+
+tests = [1,1,1,1]
+if(tests[0]):
+    #after every batch of changes the repaired path is as cheap as the one found by searching again from scratch
+    test_passed = True
+    state_space_descriptor, heuristic_descriptor = MapGenerator.grid(15, 15, 1)
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    transitions = [(x, y) for x in range(graph.num_states) for y, cost in graph.getStateTransitions(x)]
+    for heuristic in (None, graph.compileHeuristic(heuristic_descriptor)):
+        planner = LPA_STAR(graph, heuristic)
+        rng = random.Random(0)
+        for i in range(30):
+            for j in range(rng.choice([1, 5, 20])):
+                state_from, state_to = rng.choice(transitions)
+                if(rng.random() < 0.1 and planner.getTransitionCost(state_from, state_to) < float("inf")):
+                    planner.removeTransition(state_from, state_to)
+                elif(heuristic is None):
+                    planner.updateTransition(state_from, state_to, rng.randint(1, 20))
+                else:
+                    #heuristic stays consistent only while costs increase
+                    planner.updateTransition(state_from, state_to, planner.getTransitionCost(state_from, state_to) + rng.randint(0, 20))
+            actual = planner.search()
+            expected = CompiledUCS.search(planner.toCompiledGraph())
+            if(actual.found_solution != expected.found_solution or actual.found_solution and actual.total_cost != expected.total_cost):
+                print(f"expected: {expected.total_cost} actual: {actual.total_cost}")
+                test_passed = False
+            elif(actual.found_solution):
+                cost, path = pathCost(planner, actual)
+                if(cost != actual.total_cost or path[0] != planner.starting_state or not graph.goal_mask[path[-1]]):
+                    print(f"path: {actual.path} cost: {cost} expected cost: {actual.total_cost}")
+                    test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #moving the start along the path reuses costs, moving it elsewhere still finds the shortest path
+    state_space_descriptor, heuristic_descriptor = MapGenerator.grid(15, 15, 2)
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    planner = LPA_STAR(graph, graph.compileHeuristic(heuristic_descriptor))
+    first = planner.search()
+    path = pathCost(planner, first)[1]
+    planner.moveStart(path[len(path) // 2])
+    along = planner.search()
+    expected_along = CompiledUCS.search(graph, path[len(path) // 2])
+    planner.moveStart(graph.num_states - 1)
+    elsewhere = planner.search()
+    expected_elsewhere = CompiledUCS.search(graph, graph.num_states - 1)
+    test_passed = along.total_cost == expected_along.total_cost and elsewhere.total_cost == expected_elsewhere.total_cost and along.states_visited < first.states_visited
+    if(not test_passed):
+        print(f"expected: {expected_along.total_cost} {expected_elsewhere.total_cost} actual: {along.total_cost} {elsewhere.total_cost} visited: {along.states_visited}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #small change is repaired with few expansions, repair stopped by budget is finished by the next search
+    state_space_descriptor, heuristic_descriptor = MapGenerator.grid(20, 20, 3)
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    planner = LPA_STAR(graph)
+    first = planner.search()
+    path = pathCost(planner, first)[1]
+    planner.updateTransition(path[-2], path[-1], planner.getTransitionCost(path[-2], path[-1]) + 1)
+    small = planner.search()
+    for state, next_state in zip(path, path[1:]):
+        planner.updateTransition(state, next_state, planner.getTransitionCost(state, next_state) + 100)
+    stopped = planner.search(budget=SearchBudget(max_expansions=5))
+    finished = planner.search()
+    expected = CompiledUCS.search(planner.toCompiledGraph())
+    test_passed = small.states_visited < first.states_visited // 4 and isinstance(stopped, BudgetExceededResult) and finished.total_cost == expected.total_cost
+    if(not test_passed):
+        print(f"visited: {first.states_visited} {small.states_visited} stopped: {stopped} expected: {expected.total_cost} actual: {finished.total_cost}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[3]):
+    #transitions of cost 0 are rejected, a cycle of them would keep outdated costs after the path into it got more expensive
+    state_space_descriptor = StateSpaceDescriptor()
+    state_space_descriptor.starting_state = "a"
+    state_space_descriptor.ending_states = ["c"]
+    state_space_descriptor.setTransitions("a", [("b", 1.0)])
+    state_space_descriptor.setTransitions("b", [("c", 1.0)])
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    planner = LPA_STAR(graph)
+    rejected = 0
+    for state_from, state_to, cost in [(1, 1, 0.0), (0, 1, -1.0), (0, 1, float("nan"))]:
+        try:
+            planner.updateTransition(state_from, state_to, cost)
+        except ValueError:
+            rejected += 1
+    planner.updateTransition(0, 1, 2.0)
+    search_result = planner.search()
+    state_space_descriptor.setTransitions("a", [("b", 0.0)])
+    try:
+        LPA_STAR(CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor))
+    except ValueError:
+        rejected += 1
+    test_passed = rejected == 4 and search_result.total_cost == 3.0
+    if(not test_passed):
+        print(f"rejected: {rejected} expected: 3.0 actual: {search_result.total_cost}")
+
+    print(f"Test passed: {test_passed}")
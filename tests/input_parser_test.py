@@ -0,0 +1,65 @@
+from utils.input_parser import Parser, ParseError
+import io
+import os
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+tests = [1,1,1]
+if(tests[0]):
+    #first invalid token of a line is reported with its line and column
+    cases = [
+        ("s\ng\ns: a,1 b,x\n", Parser.parseStateSpaceDescription, 3, 10, "\"x\" cannot be parsed to number"),
+        ("s\ng\ns: a,1 b?,2\n", Parser.parseStateSpaceDescription, 3, 9, "\"b?\" contains illegal character"),
+        ("# comment\n\ns\ng h!\n", Parser.parseStateSpaceDescription, 4, 4, "\"h!\" contains illegal character"),
+        ("s\ng\ns a,1\n", Parser.parseStateSpaceDescription, 3, 1, "\"s a,1\" is not formatted correctly"),
+        ("a: 1\nb: 2.5.1\n", Parser.parseHeuristicDescriptor, 2, 4, "\"2.5.1\" cannot be parsed to number"),
+        ("a: 1\n\nč?: 2\n", Parser.parseHeuristicDescriptor, 3, 2, "\"č?\" contains illegal character"),
+    ]
+    test_passed = True
+    for text, parse, line_number, column, message in cases:
+        try:
+            parse(io.StringIO(text))
+            print(f"not rejected: {text!r}")
+            test_passed = False
+        except ParseError as e:
+            if((e.line_number, e.column, e.message) != (line_number, column, message)):
+                print(f"expected: {(line_number, column, message)} actual: {(e.line_number, e.column, e.message)}")
+                test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #comments and empty lines are skipped anywhere in state space, empty lines in heuristic
+    text = "# start\n\n  s  \n#ending states\ng h\n\ns: a,1 g,4.5\n# comment\na: h,2e1\n\ng:\n"
+    state_space_descriptor = Parser.parseStateSpaceDescription(io.StringIO(text))
+    test_passed = state_space_descriptor.starting_state == "s" and state_space_descriptor.ending_states == ["g", "h"]
+    test_passed = test_passed and state_space_descriptor.transitions == {"s": [("a", 1.0), ("g", 4.5)], "a": [("h", 20.0)], "g": []}
+    heuristic_descriptor = Parser.parseHeuristicDescriptor(io.StringIO("\ns: 3\n\na: -.5\ng: 0\n\n"))
+    test_passed = test_passed and heuristic_descriptor.pairs == {"s": 3.0, "a": -0.5, "g": 0.0}
+    if(not test_passed):
+        print(f"actual: {state_space_descriptor.transitions} {heuristic_descriptor.pairs}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #lines split across chunks are joined, errors are reported on the same line as without chunks
+    test_passed = True
+    for file_name, parse in [("istra.txt", Parser.parseStateSpaceDescription), ("ai.txt", Parser.parseStateSpaceDescription),
+            ("istra_heuristic.txt", Parser.parseHeuristicDescriptor)]:
+        path = os.path.join(maps_dir, file_name)
+        expected = parse(path)
+        for chunk_size in [1, 3, 7, 64]:
+            actual = parse(path, chunk_size)
+            if(vars(actual) != vars(expected)):
+                print(f"{file_name} differs with chunk size {chunk_size}")
+                test_passed = False
+    lines = list(Parser.readLines(io.StringIO("ab\ncd\n\nef"), 3))
+    test_passed = test_passed and lines == ["ab", "cd", "", "ef"]
+    for chunk_size in [None, 1, 2, 5]:
+        try:
+            Parser.parseStateSpaceDescription(io.StringIO("s\ng\ns: g,1\ng: s,1 s,?\n"), chunk_size)
+            test_passed = False
+        except ParseError as e:
+            test_passed = test_passed and (e.line_number, e.column) == (4, 10)
+
+    print(f"Test passed: {test_passed}")
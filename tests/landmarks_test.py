@@ -0,0 +1,40 @@
+from utils.input_parser import Parser
+from algorithms.landmarks import Landmarks
+from algorithms.cost_to_go import ReverseDijkstra
+from algorithms.compiled_search_algorithms import CompiledUCS, CompiledA_STAR
+from algorithms.heuristic_check import HeuristicCheck
+from data_strucutres.compiled_graph import CompiledGraph
+import os
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+tests = [1,1]
+if(tests[0]):
+    #landmark heuristic must never overestimate and must be consistent
+    test_passed = True
+    for map_name in ["ai.txt", "istra.txt", "my.txt"]:
+        graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(os.path.join(maps_dir, map_name)))
+        heuristic = Landmarks.fromCompiledGraph(graph, 3).heuristic(graph)
+        costs_to_go = ReverseDijkstra.search(graph)
+        for state in range(graph.num_states):
+            if(heuristic[state] > costs_to_go[state]):
+                print(f"{map_name} {graph.names[state]} h: {heuristic[state]} h*: {costs_to_go[state]}")
+                test_passed = False
+        if(not HeuristicCheck.checkConsistentVectorized(graph, heuristic.toArray()).consistent):
+            print(f"{map_name} heuristic is not consistent")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #A* with landmarks finds optimal path from every state
+    graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(os.path.join(maps_dir, "istra.txt")))
+    landmarks = Landmarks.fromCompiledGraph(graph, 4)
+    heuristic = landmarks.heuristic(graph)
+    expected = [CompiledUCS.search(graph, state).total_cost for state in range(graph.num_states)]
+    actual = [CompiledA_STAR.search(graph, heuristic, state).total_cost for state in range(graph.num_states)]
+    test_passed = expected == actual and len(set(landmarks.landmarks)) == 4
+    if(not test_passed):
+        print(f"expected: {expected} actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,53 @@
+from utils.map_generator import MapGenerator
+from utils.input_parser import Parser
+from algorithms.compiled_search_algorithms import CompiledUCS, CompiledA_STAR
+from algorithms.heuristic_check import HeuristicCheck
+from data_strucutres.compiled_graph import CompiledGraph
+import os
+import shutil
+import tempfile
+
+tests = [1,1,1]
+if(tests[0]):
+    #written maps are parsed back into the same state space and heuristic
+    temp_dir = tempfile.mkdtemp()
+    test_passed = True
+    for family in MapGenerator.FAMILIES:
+        expected = MapGenerator.generate(family, 500, 7)
+        path = os.path.join(temp_dir, f"{family}.txt")
+        MapGenerator.write(*expected, path, MapGenerator.heuristicPath(path), family)
+        actual = (Parser.parseStateSpaceDescription(path), Parser.parseHeuristicDescriptor(MapGenerator.heuristicPath(path)))
+        if(actual[0].transitions != expected[0].transitions or actual[0].starting_state != expected[0].starting_state
+            or actual[0].ending_states != expected[0].ending_states or actual[1].pairs != expected[1].pairs):
+            print(f"{family} differs after writing")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+    shutil.rmtree(temp_dir)
+
+if(tests[1]):
+    #every family has a consistent heuristic, goal is reachable except in unreachable family
+    test_passed = True
+    for family in MapGenerator.FAMILIES:
+        state_space_descriptor, heuristic_descriptor = MapGenerator.generate(family, 1000, 3)
+        graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        heuristic = graph.compileHeuristic(heuristic_descriptor)
+        expected = CompiledUCS.search(graph)
+        actual = CompiledA_STAR.search(graph, heuristic)
+        consistent = HeuristicCheck.checkConsistentVectorized(graph, heuristic).consistent
+        if(expected.found_solution != (family != "unreachable") or actual.total_cost != expected.total_cost or not consistent):
+            print(f"{family} expected: {expected.total_cost} actual: {actual.total_cost} consistent: {consistent}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #same seed gives the same map, different seed a different one
+    first = MapGenerator.generate("scalefree", 300, 1)[0].transitions
+    second = MapGenerator.generate("scalefree", 300, 1)[0].transitions
+    third = MapGenerator.generate("scalefree", 300, 2)[0].transitions
+    test_passed = first == second and first != third
+    if(not test_passed):
+        print(f"expected: equal maps for the same seed only")
+
+    print(f"Test passed: {test_passed}")
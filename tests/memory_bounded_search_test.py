@@ -0,0 +1,76 @@
+from data_strucutres.n_puzzle import NPuzzle
+from algorithms.search_algorithms import UCS
+from algorithms.memory_bounded_search import IDA_STAR, SMA_STAR, SMANode
+from algorithms import memory_bounded_search
+from data_strucutres.descriptors import SearchStats
+
+transitions = {
+    "a": [("b", 1.0), ("c", 4.0)],
+    "b": [("a", 1.0), ("c", 1.0), ("d", 6.0)],
+    "c": [("d", 2.0), ("c", 1.0)],
+    "d": [],
+    "e": [("a", 1.0)],
+}
+heuristic = {"a": 3.0, "b": 2.0, "c": 2.0, "d": 0.0, "e": 4.0}
+
+tests = [1,1,1,1]
+if(tests[0]):
+    #both searches must find path as cheap as UCS
+    expected = UCS.search("a", ["d"], transitions).total_cost
+    actual = [IDA_STAR.search("a", ["d"], transitions, heuristic).total_cost, SMA_STAR.search("a", ["d"], transitions, heuristic).total_cost]
+    test_passed = actual == [expected, expected]
+    if(not test_passed):
+        print(f"expected: {expected} actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #optimal path a => b => c => d has 4 states, so 5 nodes are enough and unreachable goal is reported
+    actual = [SMA_STAR.search("a", ["d"], transitions, heuristic, max_nodes=5).total_cost, IDA_STAR.search("a", ["e"], transitions, heuristic).found_solution, SMA_STAR.search("a", ["e"], transitions, heuristic, max_nodes=5).found_solution]
+    test_passed = actual == [4.0, False, False]
+    if(not test_passed):
+        print(f"expected: [4.0, False, False] actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    puzzle = NPuzzle.fromName("867_254_3x1")
+    manhattan = puzzle.getHeuristic("manhattan")
+    actual = [IDA_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, manhattan).total_cost, SMA_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, manhattan, max_nodes=2000).total_cost]
+    test_passed = actual == [31.0, 31.0]
+    if(not test_passed):
+        print(f"expected: [31.0, 31.0] actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[3]):
+    #nodes alive at any time, including those only referenced by open list entries, never exceed max_nodes
+    class CountedNode(SMANode):
+        __slots__ = ()
+        alive = 0
+        peak = 0
+
+        def __init__(self, *args):
+            super().__init__(*args)
+            CountedNode.alive += 1
+            CountedNode.peak = max(CountedNode.peak, CountedNode.alive)
+
+        def __del__(self):
+            CountedNode.alive -= 1
+
+    memory_bounded_search.SMANode = CountedNode
+    puzzle = NPuzzle.fromName("867_254_3x1")
+    manhattan = puzzle.getHeuristic("manhattan")
+    test_passed = True
+    for max_nodes in [40, 500, 2000]:
+        CountedNode.alive = 0
+        CountedNode.peak = 0
+        stats = SearchStats()
+        search_result = SMA_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, manhattan, max_nodes=max_nodes, stats=stats, budget=None)
+        if(CountedNode.peak > max_nodes or stats.peak_closed > max_nodes or stats.peak_frontier > max_nodes
+                or search_result.found_solution and search_result.total_cost != 31.0):
+            print(f"max_nodes: {max_nodes} alive: {CountedNode.peak} stats: {stats.toJSON()}")
+            test_passed = False
+    memory_bounded_search.SMANode = SMANode
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,41 @@
+from data_strucutres.n_puzzle import NPuzzle
+from data_strucutres.descriptors import HeuristicDescriptor
+from algorithms.search_algorithms import A_STAR
+
+tests = [1,1,1]
+if(tests[0]):
+    #successors of packed board must match moving tiles on unpacked board
+    puzzle = NPuzzle.fromName("123_4x5_678")
+    expected = sorted(["1x3_425_678", "123_475_6x8", "123_x45_678", "123_45x_678"])
+    actual = sorted([puzzle.getStateName(state) for state, cost in puzzle.getStateTransitions(puzzle.starting_state)])
+    test_passed = expected == actual
+    if(not test_passed):
+        print(f"expected: {expected} actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    puzzle = NPuzzle.fromName("867_254_3x1")
+    search_result = A_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, puzzle.getHeuristic("manhattan"))
+    test_passed = search_result.total_cost == 31.0 and search_result.path.endswith("123_456_78x ")
+    if(not test_passed):
+        print(f"expected: 31.0 actual: {search_result.total_cost}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #unsolvable boards are told apart by parity, boards missing from a heuristic file raise ValueError
+    test_passed = not NPuzzle.fromName("586_417_23x").isSolvable() and NPuzzle.fromName("867_254_3x1").isSolvable()
+    puzzle = NPuzzle.fromName("123_456_7x8")
+    heuristic_descriptor = HeuristicDescriptor()
+    heuristic_descriptor.addPair("123_456_78x", 0.0)
+    heuristic_descriptor.addPair("123_456_7x8", 1.0)
+    heuristic = puzzle.heuristicFromDescriptor(heuristic_descriptor)
+    test_passed = test_passed and heuristic[puzzle.starting_state] == 1.0 and puzzle.starting_state in heuristic
+    try:
+        A_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, heuristic)
+        test_passed = False
+    except ValueError as e:
+        test_passed = test_passed and str(e).startswith("Heuristic has no value for board")
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,43 @@
+from data_strucutres.node_store import NodeStore
+from data_strucutres.compiled_graph import CompiledGraph
+from algorithms.search_algorithms import BFS, UCS, A_STAR
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS, CompiledA_STAR
+from utils.map_generator import MapGenerator
+
+tests = [1,1]
+if(tests[0]):
+    #path is reconstructed from parent ids, node chain of the result follows the same path
+    store = NodeStore()
+    a = store.add("A", -1, 0.0)
+    b = store.add("B", a, 2.0)
+    c = store.add("C", a, 5.0)
+    store.parents[c] = b
+    store.costs[c] = 3.0
+    search_result = store.buildSearchResult(c, 3)
+    expected = "A => B => C "
+    test_passed = search_result.path == expected and search_result.total_cost == 3.0 and search_result.path_length == 3
+    test_passed = test_passed and search_result.node.getPath() == expected and search_result.node.getChainLength() == 3 and not hasattr(search_result.node, "__dict__")
+    if(not test_passed):
+        print(f"expected: {expected} actual: {search_result.path} {search_result.node.getPath()}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #searches over node store find paths as cheap as compiled searches over parent arrays
+    test_passed = True
+    for seed in range(3):
+        state_space_descriptor, heuristic_descriptor = MapGenerator.grid(25, 20, seed)
+        ss = state_space_descriptor
+        graph = CompiledGraph.fromStateSpaceDescriptor(ss)
+        heuristic = graph.compileHeuristic(heuristic_descriptor)
+        pairs = [
+            (BFS.search(ss.starting_state, ss.ending_states, ss.transitions), CompiledBFS.search(graph)),
+            (UCS.search(ss.starting_state, ss.ending_states, ss.transitions), CompiledUCS.search(graph)),
+            (A_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, heuristic_descriptor.pairs), CompiledA_STAR.search(graph, heuristic)),
+        ]
+        for actual, expected in pairs:
+            if(actual.path_length != expected.path_length or actual.total_cost != expected.total_cost or actual.node.getPath() != actual.path):
+                print(f"seed {seed} expected: {expected.total_cost} {expected.path_length} actual: {actual.total_cost} {actual.path_length}")
+                test_passed = False
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,47 @@
+from data_strucutres.n_puzzle import NPuzzle
+from data_strucutres.pattern_database import PatternDatabase, AdditivePatternDatabase
+from algorithms.search_algorithms import A_STAR
+from utils.snapshot import PatternDatabaseSnapshot
+import itertools
+import shutil
+import tempfile
+
+tests = [1,1,1]
+if(tests[0]):
+    #ranks of all placements of 3 tiles on 9 cells must be distinct and consecutive
+    ranks = [PatternDatabase.rank(x, 9) for x in itertools.permutations(range(9), 3)]
+    test_passed = sorted(ranks) == list(range(9 * 8 * 7))
+    test_passed = test_passed and all(PatternDatabase.unrank(PatternDatabase.rank(x, 9), 9, 3) == list(x) for x in itertools.permutations(range(9), 3))
+    if(not test_passed):
+        print(f"expected: {list(range(9 * 8 * 7))} actual: {sorted(ranks)}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #additive pattern database finds optimal path with fewer expansions than manhattan distance
+    test_passed = True
+    for board in ["867_254_3x1", "8x6_543_721", "x12_345_678"]:
+        puzzle = NPuzzle.fromName(board)
+        expected = A_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, puzzle.getHeuristic("manhattan"))
+        actual = A_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, puzzle.getHeuristic("pdb:1234/5678"))
+        if(actual.total_cost != expected.total_cost or actual.states_visited > expected.states_visited):
+            print(f"{board} expected: {expected.total_cost} {expected.states_visited} actual: {actual.total_cost} {actual.states_visited}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #pattern database snapshot stores the same table
+    temp_dir = tempfile.mkdtemp()
+    puzzle = NPuzzle.fromName("123_456_78x")
+    expected = [PatternDatabase.build(puzzle, pattern) for pattern in PatternDatabase.defaultPatterns(3)]
+    actual = [PatternDatabaseSnapshot.loadOrBuild(temp_dir, puzzle, pattern) for pattern in PatternDatabase.defaultPatterns(3)]
+    test_passed = [(x.pattern, bytes(x.table)) for x in expected] == [(x.pattern, bytes(x.table)) for x in actual]
+    heuristic = AdditivePatternDatabase(actual)
+    test_passed = test_passed and heuristic[NPuzzle.parseState("867_254_3x1")] == AdditivePatternDatabase(expected)[NPuzzle.parseState("867_254_3x1")]
+    if(not test_passed):
+        print(f"expected: {[x.pattern for x in expected]} actual: {[x.pattern for x in actual]}")
+
+    print(f"Test passed: {test_passed}")
+    del actual, heuristic
+    shutil.rmtree(temp_dir)
@@ -13,7 +13,7 @@ if(tests[0]):
 
     test_passed = True
     for element, priority in test_data:
-        extracted_element = p_q._data[p_q.getIndex(element)][0]
+        extracted_element = p_q.data[p_q.getIndex(element)]
         
         if(extracted_element != element):
             print(f"expected: {element} actual: {extracted_element}")
@@ -0,0 +1,108 @@
+from utils.query_server import QueryServer, ServedMap
+from utils.batch_query import BatchQuery
+from algorithms.compiled_search_algorithms import CompiledA_STAR
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+temp_dir = tempfile.mkdtemp()
+socket_path = os.path.join(temp_dir, "server.sock")
+
+async def exchange(server, requests, before = None):
+    """Serves requests of one connection, before is awaited with server running before requests are sent"""
+    ready = asyncio.Event()
+    serving = asyncio.create_task(server.serve(f"unix:{socket_path}", ready))
+    await ready.wait()
+    if(before is not None):
+        await before()
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    for request in requests:
+        writer.write((request + "\n").encode("utf-8"))
+    await writer.drain()
+    answers = [(await reader.readline()).decode("utf-8").strip() for x in requests]
+    writer.close()
+    serving.cancel()
+    try:
+        await serving
+    except asyncio.CancelledError:
+        pass
+    return answers
+
+tests = [1,1,1,1]
+if(tests[0]):
+    #JSON and plain requests are answered like the engines answer them, invalid ones get an error
+    istra = ServedMap(os.path.join(maps_dir, "istra.txt"), [os.path.join(maps_dir, "istra_heuristic.txt")])
+    ai = ServedMap(os.path.join(maps_dir, "ai.txt"), [os.path.join(maps_dir, "ai_fail.txt")])
+    requests = ['{"id": 7, "op": "search", "heuristic": "istra_heuristic"}', "Pula Buzet", '{"op": "check", "map": "ai", "heuristic": "ai_fail"}',
+        '{"op": "search", "start": "Nowhere"}', '{"op": "search", "max_expansions": 1}', "{not json"]
+    answers = asyncio.run(exchange(QueryServer([istra, ai], 0, log=None), requests))
+    expected_search = CompiledA_STAR.search(istra.graph, istra.heuristics["istra_heuristic"])
+    search, plain, check, unknown, stopped, invalid = answers
+    search = json.loads(search)
+    test_passed = (search["id"] == 7 and search["total_cost"] == expected_search.total_cost and search["states_visited"] == expected_search.states_visited
+        and plain == BatchQuery.answer(istra.graph, "Pula Buzet") and json.loads(check)["consistent"] is False
+        and "error" in json.loads(unknown) and json.loads(stopped)["budget_exceeded"] == "expansions" and "error" in json.loads(invalid))
+    if(not test_passed):
+        print(f"answers: {answers}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #answers of worker processes are written in request order
+    istra = ServedMap(os.path.join(maps_dir, "istra.txt"))
+    requests = [json.dumps({"id": i, "op": "search", "start": istra.graph.names[i % istra.graph.num_states]}) for i in range(40)]
+    answers = asyncio.run(exchange(QueryServer([istra], 2, log=None), requests))
+    test_passed = [json.loads(x)["id"] for x in answers] == list(range(40))
+    if(not test_passed):
+        print(f"answers: {answers}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #changed map is loaded again while the server runs
+    state_space_path = shutil.copy(os.path.join(maps_dir, "istra.txt"), temp_dir)
+
+    async def changeMap():
+        with open(state_space_path, "a", encoding="utf-8") as file:
+            file.write("\nPula: Buzet,1")
+        for i in range(100):
+            await asyncio.sleep(0.02)
+            if(server.maps["istra"].graph.num_transitions == 45):
+                break
+
+    server = QueryServer([ServedMap(state_space_path)], 1, reload_interval=0.01, log=None)
+    answers = asyncio.run(exchange(server, ['{"op": "search"}'], changeMap))
+    test_passed = json.loads(answers[0])["total_cost"] == 1.0
+    if(not test_passed):
+        print(f"answers: {answers}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[3]):
+    #fields of a wrong type and failed requests get an error, later requests of the connection are still answered
+    class FailingServer(QueryServer):
+        async def answerLine(self, line):
+            if(line == "fail"):
+                raise RuntimeError("failed")
+            return await super().answerLine(line)
+
+    istra = ServedMap(os.path.join(maps_dir, "istra.txt"))
+    requests = ['{"id": 1, "op": "search", "max_expansions": "x"}', '{"op": "batch", "queries": [1]}', '{"op": "search", "map": [1]}',
+        '{"op": "search", "max_expansions": true}', "fail", '{"op": "search"}']
+    answers = asyncio.run(exchange(FailingServer([istra], 0, log=None), requests))
+    test_passed = all("error" in json.loads(x) for x in answers[:-1]) and json.loads(answers[0])["id"] == 1 and json.loads(answers[-1])["total_cost"] == 100.0
+    #path of another file is not replaced by the socket
+    file_path = os.path.join(temp_dir, "not_a_socket")
+    open(file_path, "w").close()
+    try:
+        asyncio.run(QueryServer([istra], 0, log=None).serve(f"unix:{file_path}"))
+        test_passed = False
+    except ValueError:
+        test_passed = test_passed and os.path.isfile(file_path)
+    if(not test_passed):
+        print(f"answers: {answers}")
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,75 @@
+from data_strucutres.search_budget import SearchBudget, CancellationToken
+from data_strucutres.descriptors import BudgetExceededResult, SearchStats
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.contraction_hierarchy import ContractionHierarchy
+from algorithms.search_algorithms import BFS, UCS, A_STAR
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS, CompiledA_STAR
+from algorithms.bidirectional_search import BidirectionalBFS, BidirectionalUCS
+from algorithms.memory_bounded_search import IDA_STAR, SMA_STAR
+from algorithms.contraction_hierarchy_search import ContractionHierarchySearch
+from algorithms.anytime_search import ARA_STAR
+from utils.map_generator import MapGenerator
+
+def engines(state_space_descriptor, heuristic_descriptor):
+    ss = state_space_descriptor
+    h = heuristic_descriptor.pairs
+    graph = CompiledGraph.fromStateSpaceDescriptor(ss)
+    heuristic = graph.compileHeuristic(heuristic_descriptor)
+    reversed_graph = graph.reversed()
+    hierarchy = ContractionHierarchy.fromCompiledGraph(graph)
+    return {
+        "bfs": lambda budget: BFS.search(ss.starting_state, ss.ending_states, ss.transitions, budget=budget),
+        "ucs": lambda budget: UCS.search(ss.starting_state, ss.ending_states, ss.transitions, budget=budget),
+        "astar": lambda budget: A_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, h, budget=budget),
+        "compiled-bfs": lambda budget: CompiledBFS.search(graph, budget=budget),
+        "compiled-ucs": lambda budget: CompiledUCS.search(graph, budget=budget),
+        "compiled-astar": lambda budget: CompiledA_STAR.search(graph, heuristic, budget=budget),
+        "bidir-bfs": lambda budget: BidirectionalBFS.search(graph, reversed_graph, budget=budget),
+        "bidir-ucs": lambda budget: BidirectionalUCS.search(graph, reversed_graph, budget=budget),
+        "idastar": lambda budget: IDA_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, h, budget=budget),
+        "smastar": lambda budget: SMA_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, h, 1000, budget=budget),
+        "ch": lambda budget: ContractionHierarchySearch.search(graph, hierarchy, budget=budget),
+        "arastar": lambda budget: ARA_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, h, budget=budget),
+    }
+
+tests = [1,1,1]
+if(tests[0]):
+    #every engine stops after exactly the allowed expansions, a budget that is not reached changes nothing
+    test_passed = True
+    for name, search in engines(*MapGenerator.grid(6, 6, 2)).items():
+        expected = search(None)
+        unlimited = search(SearchBudget(max_time_ms=60000, max_expansions=10 ** 9, max_frontier=10 ** 9, token=CancellationToken()))
+        actual = search(SearchBudget(max_expansions=5, check_interval=2))
+        if(not isinstance(actual, BudgetExceededResult) or actual.reason != "expansions" or actual.states_visited != 5
+            or unlimited.total_cost != expected.total_cost or unlimited.path != expected.path):
+            print(f"{name} expected: {expected.total_cost} actual: {unlimited.total_cost} {actual.getSingleLineOutput()}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #cancelled token stops every engine at its first check
+    test_passed = True
+    token = CancellationToken()
+    token.cancel()
+    for name, search in engines(*MapGenerator.grid(6, 6, 2)).items():
+        actual = search(SearchBudget(token=token, check_interval=1))
+        if(not isinstance(actual, BudgetExceededResult) or actual.reason != "cancelled" or actual.states_visited > 1):
+            print(f"{name} expected: cancelled actual: {actual.getSingleLineOutput()}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #search for unreachable goal returns once time runs out, with partial stats
+    state_space_descriptor, heuristic_descriptor = MapGenerator.generate("unreachable", 40000, 1)
+    ss = state_space_descriptor
+    stats = SearchStats()
+    actual = UCS.search(ss.starting_state, ss.ending_states, ss.transitions, stats, SearchBudget(max_time_ms=5))
+    expected = UCS.search(ss.starting_state, ss.ending_states, ss.transitions)
+    test_passed = isinstance(actual, BudgetExceededResult) and actual.reason == "time" and actual.elapsed_ms < 1000 and not expected.found_solution
+    test_passed = test_passed and 0 < stats.expanded == actual.states_visited and stats.pushes > stats.pops
+    if(not test_passed):
+        print(f"expected: time actual: {actual.getSingleLineOutput()} {stats.toJSON()}")
+
+    print(f"Test passed: {test_passed}")
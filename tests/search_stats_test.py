@@ -0,0 +1,62 @@
+from data_strucutres.descriptors import SearchStats
+from data_strucutres.compiled_graph import CompiledGraph
+from algorithms.search_algorithms import BFS, UCS, A_STAR
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS, CompiledA_STAR
+from utils.input_parser import Parser
+from utils.map_generator import MapGenerator
+import io
+import json
+
+tests = [1,1,1]
+if(tests[0]):
+    #stats don't change results and every pop is either an expansion, a stale entry or the goal
+    state_space_descriptor, heuristic_descriptor = MapGenerator.grid(30, 30, 5)
+    ss = state_space_descriptor
+    graph = CompiledGraph.fromStateSpaceDescriptor(ss)
+    heuristic = graph.compileHeuristic(heuristic_descriptor)
+    searches = [
+        lambda stats: BFS.search(ss.starting_state, ss.ending_states, ss.transitions, stats),
+        lambda stats: UCS.search(ss.starting_state, ss.ending_states, ss.transitions, stats),
+        lambda stats: A_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, heuristic_descriptor.pairs, stats),
+        lambda stats: CompiledBFS.search(graph, stats=stats),
+        lambda stats: CompiledUCS.search(graph, stats=stats),
+        lambda stats: CompiledA_STAR.search(graph, heuristic, stats=stats),
+    ]
+    test_passed = True
+    for search in searches:
+        stats = SearchStats()
+        expected = search(None)
+        actual = search(stats)
+        if(actual.path != expected.path or stats.pops != stats.expanded + stats.stale_pops + 1 or stats.pushes < stats.pops
+            or stats.peak_closed < stats.expanded or stats.generated < stats.expanded or stats.search_ns <= 0):
+            print(f"expected: {expected.path} actual: {actual.path} stats: {stats.toJSON()}")
+            test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #A* reopens state reached by a cheaper path after it was expanded
+    state_space_descriptor = Parser.parseStateSpaceDescription(io.StringIO("S\nG\nS: A,1 B,4\nA: B,1\nB: G,10\nG:\n"))
+    heuristic = {"S": 0.0, "A": 10.0, "B": 0.0, "G": 0.0}
+    stats = SearchStats()
+    search_result = A_STAR.search(state_space_descriptor.starting_state, state_space_descriptor.ending_states, state_space_descriptor.transitions, heuristic, stats)
+    compiled_stats = SearchStats()
+    graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+    CompiledA_STAR.search(graph, [heuristic[x] for x in graph.names], stats=compiled_stats)
+    test_passed = search_result.total_cost == 12.0 and stats.reopenings == 1 and compiled_stats.reopenings == 1 and stats.peak_closed == 3
+    if(not test_passed):
+        print(f"expected: 12.0 1 1 3 actual: {search_result.total_cost} {stats.reopenings} {compiled_stats.reopenings} {stats.peak_closed}")
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #stats of several searches are summed, peaks are combined by maximum
+    stats = SearchStats()
+    stats.record(10, expanded=3, peak_frontier=7)
+    stats.record(5, expanded=2, peak_frontier=4)
+    actual = json.loads(stats.toJSON())
+    test_passed = actual["expanded"] == 5 and actual["peak_frontier"] == 7 and actual["search_ns"] == 15 and set(actual) == set(SearchStats.COUNTERS + SearchStats.PEAKS + SearchStats.TIMINGS)
+    if(not test_passed):
+        print(f"expected: 5 7 15 actual: {actual}")
+
+    print(f"Test passed: {test_passed}")
@@ -0,0 +1,52 @@
+from utils.snapshot import Snapshot
+from algorithms.compiled_search_algorithms import CompiledUCS
+import os
+import shutil
+import tempfile
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+tests = [1,1,1]
+if(tests[0]):
+    temp_dir = tempfile.mkdtemp()
+    state_space_path = shutil.copy(os.path.join(maps_dir, "istra.txt"), temp_dir)
+    heuristic_path = shutil.copy(os.path.join(maps_dir, "istra_heuristic.txt"), temp_dir)
+    graph, heuristic = Snapshot.loadOrCompile(state_space_path, heuristic_path)
+
+    test_passed = True
+    if(graph.names[graph.starting_state] != "Pula" or heuristic[graph.getStateId("Baderna")] != 25.0):
+        print(f"unexpected snapshot content: {graph}")
+        test_passed = False
+    search_result = CompiledUCS.search(graph)
+    if(search_result.total_cost != 100.0):
+        print(f"expected: 100.0 actual: {search_result.total_cost}")
+        test_passed = False
+
+    print(f"Test passed: {test_passed}")
+
+if(tests[1]):
+    #changing source file must rebuild snapshot
+    with open(state_space_path, "a", encoding="utf-8") as file:
+        file.write("\nNovigrad: Buje,1")
+    graph, heuristic = Snapshot.loadOrCompile(state_space_path, heuristic_path)
+    test_passed = "Novigrad" in list(graph.names)
+    print(f"Test passed: {test_passed}")
+
+if(tests[2]):
+    #pruned graph is stored apart from the full one and loaded with its goal reachability
+    with open(state_space_path, "a", encoding="utf-8") as file:
+        file.write("\nPula: Novigrad,1\nNovigrad: Novigrad,1")
+    with open(heuristic_path, "a", encoding="utf-8") as file:
+        file.write("\nNovigrad: 0")
+    pruned_graph, heuristic = Snapshot.loadOrCompile(state_space_path, heuristic_path, prune=True)
+    graph = Snapshot.loadOrCompile(state_space_path, heuristic_path)[0]
+    expected = graph.pruned()
+    novigrad = graph.getStateId("Novigrad")
+    test_passed = (os.path.exists(Snapshot.defaultPath(state_space_path, heuristic_path, True)) and graph.goal_reachable is None
+        and list(pruned_graph.goal_reachable) == list(expected.goal_reachable) and list(pruned_graph.targets) == list(expected.targets)
+        and not pruned_graph.canReachGoal(novigrad) and CompiledUCS.search(pruned_graph).total_cost == CompiledUCS.search(graph).total_cost)
+    if(not test_passed):
+        print(f"pruned: {list(pruned_graph.targets)} expected: {list(expected.targets)}")
+
+    print(f"Test passed: {test_passed}")
+    shutil.rmtree(temp_dir)
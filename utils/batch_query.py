@@ -0,0 +1,141 @@
+from data_strucutres.compiled_graph import CompiledGraph
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS
+from algorithms.cost_to_go import ShortestPathTreeCache
+from algorithms.contraction_hierarchy_search import ContractionHierarchySearch
+from data_strucutres.contraction_hierarchy import ContractionHierarchy
+from utils.input_parser import Parser
+from utils.snapshot import Snapshot, HierarchySnapshot
+import multiprocessing
+import os
+
+#graph and search settings of the worker process, set before the pool forks or by _initWorker
+_worker_graph = None
+_worker_algorithm = None
+_worker_frontier = None
+_worker_cache = None
+_worker_hierarchy = None
+
+
+def _initWorker(graph: CompiledGraph, snapshot_path: str, algorithm: str, frontier: str, cache_bytes: int, hierarchy_path: str) -> None:
+    """Sets up search settings of this process, graph is None if it should be loaded from snapshot_path"""
+    global _worker_graph, _worker_algorithm, _worker_frontier, _worker_cache, _worker_hierarchy
+    if(graph is None):
+        #every worker maps the same snapshot file, so pages are shared through the page cache
+        graph = Snapshot.load(snapshot_path)[0]
+    _worker_graph = graph
+    _worker_algorithm = algorithm
+    _worker_frontier = frontier
+    _worker_cache = ShortestPathTreeCache(graph, cache_bytes) if cache_bytes else None
+    _worker_hierarchy = HierarchySnapshot.load(hierarchy_path) if hierarchy_path is not None else None
+
+
+def _answerQuery(query: str) -> str:
+    return BatchQuery.answer(_worker_graph, query, _worker_algorithm, _worker_frontier, _worker_cache, _worker_hierarchy)
+
+
+class BatchQuery:
+    """Answers many start/goal queries against one compiled graph
+
+    Every query is a line "START GOAL [GOAL ...]" in the format of the ending states line of a
+    state space file. Empty lines and lines starting with "#" are skipped. Every answer is a single line,
+    the query followed by SearchResult.getSingleLineOutput, or by "[ERROR]: ..." if the query is invalid.
+    """
+    ALGORITHMS = ("bfs", "ucs", "ch")
+
+    @staticmethod
+    def readQueries(source):
+        """Iterates over queries of source
+
+        Args:
+            source: Path to file or text file-like object (e.g. sys.stdin)
+
+        Yields:
+            str: Query without line ending
+        """
+        for line in Parser.readLines(source):
+            line = line.strip()
+            if(line and not line.startswith("#")):
+                yield line
+
+    @staticmethod
+    def answer(graph: CompiledGraph, query: str, algorithm: str = "ucs", frontier: str = "heap", cache: ShortestPathTreeCache = None, hierarchy: ContractionHierarchy = None) -> str:
+        """Runs single query
+
+        Args:
+            graph (CompiledGraph): Graph to search, its starting and ending states are ignored
+            query (str): "START GOAL [GOAL ...]"
+            algorithm (str): One of BatchQuery.ALGORITHMS
+            frontier (str): Frontier backend used by UCS, see data_strucutres.frontiers.selectFrontier
+            cache (ShortestPathTreeCache): Cache of graph answering UCS queries, None to search every query from scratch
+            hierarchy (ContractionHierarchy): Hierarchy of graph, required by "ch" algorithm
+
+        Returns:
+            str: Query and its result on a single line
+        """
+        names = query.split()
+        if(len(names) < 2):
+            return f"{query} [ERROR]: expected starting state and at least one ending state"
+        try:
+            states = [graph.getStateId(name) for name in names]
+        except KeyError as e:
+            return f"{query} [ERROR]: unknown state {e}"
+
+        if(algorithm == "bfs"):
+            search_result = CompiledBFS.search(graph.withEndingStates(states[1:]), states[0])
+        elif(algorithm == "ch"):
+            search_result = ContractionHierarchySearch.search(graph, hierarchy, states[0], states[1:])
+        elif(cache is not None):
+            search_result = cache.search(states[0], states[1:])
+        else:
+            search_result = CompiledUCS.search(graph.withEndingStates(states[1:]), states[0], frontier)
+
+        return f"{query} {search_result.getSingleLineOutput()}"
+
+    @staticmethod
+    def run(graph: CompiledGraph, queries, output, algorithm: str = "ucs", frontier: str = "heap", workers: int = None, snapshot_path: str = None, chunk_size: int = 16, cache_bytes: int = 0, hierarchy_path: str = None) -> None:
+        """Answers queries on a pool of worker processes and writes answers in input order
+
+        Answers are written as soon as all previous ones are done, so queries can be streamed.
+        Where processes are forked, workers share the parent's graph arrays copy-on-write. Otherwise every
+        worker memory maps snapshot_path, or receives a pickled copy of graph if there is no snapshot.
+
+        Args:
+            graph (CompiledGraph): Graph to search
+            queries: Iterable of queries, see BatchQuery.readQueries
+            output: Text file-like object to which answers are written
+            algorithm (str): One of BatchQuery.ALGORITHMS
+            frontier (str): Frontier backend used by UCS
+            workers (int): Number of worker processes, os.cpu_count() if None, 1 answers queries in this process
+            snapshot_path (str): Snapshot from which graph was loaded, None if graph was compiled in memory
+            chunk_size (int): Number of queries sent to a worker at once
+            cache_bytes (int): Memory limit of the shortest path tree cache of every worker, 0 disables cache.
+                With cache, UCS queries with the same ending states reuse one reverse tree
+            hierarchy_path (str): Hierarchy snapshot of graph mapped by every worker, required by "ch" algorithm
+        """
+        if(algorithm not in BatchQuery.ALGORITHMS):
+            raise ValueError(f"Unknown batch algorithm \"{algorithm}\", expected one of: {', '.join(BatchQuery.ALGORITHMS)}")
+        if(workers is None):
+            workers = os.cpu_count() or 1
+
+        if(algorithm == "ch" and hierarchy_path is None):
+            raise ValueError("Contraction hierarchy queries need hierarchy snapshot")
+
+        if(workers == 1 or "fork" in multiprocessing.get_all_start_methods()):
+            #forked workers inherit graph and hierarchy, every worker still gets its own copy of cache
+            _initWorker(graph, None, algorithm, frontier, cache_bytes, hierarchy_path)
+        if(workers == 1):
+            for query in queries:
+                output.write(_answerQuery(query) + "\n")
+            output.flush()
+            return
+
+        if("fork" in multiprocessing.get_all_start_methods()):
+            pool = multiprocessing.get_context("fork").Pool(workers)
+        else:
+            initargs = (None if snapshot_path is not None else graph, snapshot_path, algorithm, frontier, cache_bytes, hierarchy_path)
+            pool = multiprocessing.get_context().Pool(workers, _initWorker, initargs)
+
+        with pool:
+            for answer in pool.imap(_answerQuery, queries, chunk_size):
+                output.write(answer + "\n")
+        output.flush()
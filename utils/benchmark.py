@@ -0,0 +1,343 @@
+from algorithms.search_algorithms import BFS, UCS, A_STAR
+from algorithms.compiled_search_algorithms import CompiledUCS, CompiledA_STAR
+from algorithms.heuristic_check import HeuristicCheck
+from algorithms.contraction_hierarchy_search import ContractionHierarchySearch
+from algorithms.incremental_search import LPA_STAR
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.contraction_hierarchy import ContractionHierarchy
+from data_strucutres.n_puzzle import NPuzzle
+from utils.input_parser import Parser
+from utils.map_generator import MapGenerator
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+maps_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1_files", "maps")
+
+
+class Benchmark:
+    """Performance benchmark of search engines and heuristic checks
+
+    Every workload is measured into a dict of metrics:
+        wall_s: Lowest wall time of repeated runs
+        expansions_per_s: States visited per second of wall time, only for searches
+        peak_bytes: Peak memory allocated during a run traced by tracemalloc
+        preprocessing_s, query_s, speedup: Contraction hierarchy preprocessing time, query time and
+            speedup of its queries over UCS on the compiled graph
+        replan_s, research_s, speedup: Average time in which LPA* repairs its path after a batch of changes,
+            time of compiled A* searching the changed graph from scratch and speedup of the former
+    Results are keyed by "<family>/<instance>/<workload>" and compared against a JSON baseline.
+    """
+    FAMILIES = ("maps", "grid", "geometric", "scalefree", "puzzle", "ch", "replan")
+    SCALES = (1000, 10000, 100000, 1000000)
+    #number of states whose transitions change between two replanning searches
+    REPLAN_BATCHES = (1, 10, 100, 1000)
+    #metrics where higher values are better, lower is better for all others
+    HIGHER_IS_BETTER = ("expansions_per_s", "speedup")
+    #timings below this are too noisy to be compared with baseline
+    MIN_WALL_S = 0.005
+
+    @staticmethod
+    def measure(function, repeat: int = 3, memory: bool = True, max_seconds: float = 1.0) -> dict:
+        """Runs function repeatedly and measures it
+
+        Args:
+            function: Function without arguments, may return SearchResult whose states_visited counts expansions
+            repeat (int): Maximum number of timed runs
+            memory (bool): If True, function is run once more with tracemalloc to measure peak memory
+            max_seconds (float): No more runs are started once timed runs take this long in total
+
+        Returns:
+            dict: Metrics of function
+        """
+        wall_s = float("inf")
+        total_s = 0.0
+        for i in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+            wall_s = min(wall_s, elapsed)
+            total_s += elapsed
+            if(total_s >= max_seconds):
+                break
+        metrics = {"wall_s": wall_s}
+        states_visited = getattr(result, "states_visited", None)
+        if(states_visited is not None):
+            metrics["expansions_per_s"] = states_visited / wall_s if wall_s > 0 else 0.0
+        if(memory):
+            tracemalloc.start()
+            function()
+            metrics["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        return metrics
+
+    @staticmethod
+    def stateSpaceWorkloads(state_space_descriptor, heuristics: dict) -> list[tuple[str, object]]:
+        """Creates searches and heuristic checks of state space
+
+        Args:
+            state_space_descriptor (StateSpaceDescriptor): State space to benchmark
+            heuristics (dict): HeuristicDescriptor of every heuristic keyed by its name
+
+        Returns:
+            list[tuple[str, object]]: Name and function of every workload
+        """
+        ss = state_space_descriptor
+        graph = CompiledGraph.fromStateSpaceDescriptor(ss)
+        workloads = [
+            ("compile", lambda: CompiledGraph.fromStateSpaceDescriptor(ss)),
+            ("bfs", lambda: BFS.search(ss.starting_state, ss.ending_states, ss.transitions)),
+            ("ucs", lambda: UCS.search(ss.starting_state, ss.ending_states, ss.transitions)),
+            ("compiled-ucs", lambda: CompiledUCS.search(graph)),
+        ]
+        for name, heuristic_descriptor in heuristics.items():
+            compiled_heuristic = graph.compileHeuristic(heuristic_descriptor)
+            workloads += [
+                (f"astar[{name}]", lambda x=heuristic_descriptor: A_STAR.search(ss.starting_state, ss.ending_states, ss.transitions, x.pairs)),
+                (f"compiled-astar[{name}]", lambda x=compiled_heuristic: CompiledA_STAR.search(graph, x)),
+                (f"check-optimistic[{name}]", lambda x=heuristic_descriptor: HeuristicCheck.checkOptimisitc(ss, x).optimistic),
+                (f"check-consistent[{name}]", lambda x=heuristic_descriptor: HeuristicCheck.checkConsistent(ss, x).consistent),
+                (f"check-consistent-vectorized[{name}]", lambda x=compiled_heuristic: HeuristicCheck.checkConsistentVectorized(graph, x)),
+            ]
+
+        return workloads
+
+    @staticmethod
+    def mapInstances() -> list[tuple[str, object, dict]]:
+        """Gets every bundled map with heuristic files named after it, e.g. istra.txt and istra_heuristic.txt"""
+        file_names = sorted(x for x in os.listdir(maps_dir) if x.endswith(".txt"))
+        instances = []
+        for file_name in file_names:
+            try:
+                state_space_descriptor = Parser.parseStateSpaceDescription(os.path.join(maps_dir, file_name))
+            except ValueError as e:
+                #heuristic files are not valid state spaces
+                continue
+            if(state_space_descriptor.starting_state is None):
+                continue
+            prefix = file_name[:-len(".txt")] + "_"
+            heuristics = {x[:-len(".txt")]: Parser.parseHeuristicDescriptor(os.path.join(maps_dir, x)) for x in file_names if x.startswith(prefix)}
+            instances.append((file_name[:-len(".txt")], state_space_descriptor, heuristics))
+
+        return instances
+
+    @staticmethod
+    def scrambledPuzzle(size: int, moves: int, seed: int = 0) -> NPuzzle:
+        """Creates puzzle by a seeded random walk of moves from the solved board, never undoing the previous move"""
+        rng = random.Random(seed)
+        puzzle = NPuzzle.fromName("_".join(["".join([NPuzzle.TILE_CHARACTERS[(row * size + column + 1) % (size * size)] for column in range(size)]) for row in range(size)]))
+        state = puzzle.ending_states[0]
+        previous = None
+        for i in range(moves):
+            next_state = rng.choice([x for x, cost in puzzle.getStateTransitions(state) if x != previous])
+            previous = state
+            state = next_state
+        puzzle.starting_state = state
+        return puzzle
+
+    @staticmethod
+    def puzzleWorkloads(puzzle: NPuzzle, uninformed: bool) -> list[tuple[str, object]]:
+        """Creates searches of puzzle, uninformed searches only if uninformed is True"""
+        workloads = []
+        if(uninformed):
+            workloads += [
+                ("bfs", lambda: BFS.search(puzzle.starting_state, puzzle.ending_states, puzzle)),
+                ("ucs", lambda: UCS.search(puzzle.starting_state, puzzle.ending_states, puzzle)),
+            ]
+        for name in ("misplaced", "manhattan") + (("pdb",) if puzzle.size == 3 else ()):
+            heuristic = puzzle.getHeuristic(name)
+            workloads.append((f"astar[{name}]", lambda x=heuristic: A_STAR.search(puzzle.starting_state, puzzle.ending_states, puzzle, x)))
+
+        return workloads
+
+    @staticmethod
+    def contractionHierarchyMetrics(state_space_descriptor, queries: int = 20, seed: int = 0) -> dict:
+        """Measures contraction hierarchy preprocessing and average query time against compiled UCS on random queries"""
+        graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        start = time.perf_counter()
+        hierarchy = ContractionHierarchy.fromCompiledGraph(graph)
+        preprocessing_s = time.perf_counter() - start
+        rng = random.Random(seed)
+        pairs = [(rng.randrange(graph.num_states), rng.randrange(graph.num_states)) for i in range(queries)]
+        start = time.perf_counter()
+        for state_from, state_to in pairs:
+            ContractionHierarchySearch.search(graph, hierarchy, state_from, [state_to])
+        query_s = (time.perf_counter() - start) / queries
+        start = time.perf_counter()
+        for state_from, state_to in pairs:
+            CompiledUCS.search(graph.withEndingStates([state_to]), state_from)
+        ucs_query_s = (time.perf_counter() - start) / queries
+
+        return {"preprocessing_s": preprocessing_s, "query_s": query_s, "speedup": ucs_query_s / query_s if query_s > 0 else 0.0}
+
+    @staticmethod
+    def replanningMetrics(state_space_descriptor, heuristic_descriptor, batch_size: int, rounds: int = 5, seed: int = 0) -> dict:
+        """Measures average LPA* repair time after batches of changes against compiled A* on the changed graph
+
+        Every change raises costs of all transitions leaving a random state, as a closure or traffic would,
+        so the heuristic stays consistent. Compiling the changed graph for A* is not timed.
+        """
+        graph = CompiledGraph.fromStateSpaceDescriptor(state_space_descriptor)
+        heuristic = graph.compileHeuristic(heuristic_descriptor)
+        planner = LPA_STAR(graph, heuristic)
+        planner.search()
+        rng = random.Random(seed)
+        replan_s = 0.0
+        research_s = 0.0
+        for i in range(rounds):
+            start = time.perf_counter()
+            for j in range(batch_size):
+                state = rng.randrange(graph.num_states)
+                for next_state, cost in graph.getStateTransitions(state):
+                    planner.updateTransition(state, next_state, planner.getTransitionCost(state, next_state) + rng.randint(1, 10))
+            planner.search()
+            replan_s += time.perf_counter() - start
+            changed_graph = planner.toCompiledGraph()
+            start = time.perf_counter()
+            CompiledA_STAR.search(changed_graph, heuristic)
+            research_s += time.perf_counter() - start
+
+        return {"replan_s": replan_s / rounds, "research_s": research_s / rounds, "speedup": research_s / replan_s if replan_s > 0 else 0.0}
+
+    @staticmethod
+    def run(families: list[str] = FAMILIES, max_states: int = 1000000, ch_max_states: int = 10000, repeat: int = 3, memory: bool = True, seed: int = 0, log = None,
+            replan_max_states: int = 100000) -> dict:
+        """Runs benchmark
+
+        Args:
+            families (list[str]): Families of instances to run, see Benchmark.FAMILIES
+            max_states (int): Generated instances with more states are skipped
+            ch_max_states (int): Largest grid on which contraction hierarchy is built
+            repeat (int): Maximum number of timed runs of every workload, see Benchmark.measure
+            memory (bool): If True peak memory of every workload is measured
+            seed (int): Seed of generated instances
+            log: Text file-like object to which every result is written as it is measured, None to stay quiet
+            replan_max_states (int): Largest grid on which replanning is measured
+
+        Returns:
+            dict: Metrics of every workload keyed by its name
+        """
+        results = {}
+
+        def record(name: str, metrics: dict) -> None:
+            results[name] = metrics
+            if(log is not None):
+                log.write(f"{name} {' '.join([f'{k}={v:.6g}' for k, v in metrics.items()])}\n")
+                log.flush()
+
+        def runWorkloads(prefix: str, workloads: list) -> None:
+            for name, function in workloads:
+                record(f"{prefix}/{name}", Benchmark.measure(function, repeat, memory))
+
+        scales = [x for x in Benchmark.SCALES if x <= max_states]
+        if("maps" in families):
+            for name, state_space_descriptor, heuristics in Benchmark.mapInstances():
+                runWorkloads(f"maps/{name}", Benchmark.stateSpaceWorkloads(state_space_descriptor, heuristics))
+        if("grid" in families):
+            for scale in scales:
+                side = round(math.sqrt(scale))
+                state_space_descriptor, heuristic_descriptor = MapGenerator.grid(side, side, seed)
+                runWorkloads(f"grid/{side}x{side}", Benchmark.stateSpaceWorkloads(state_space_descriptor, {"manhattan": heuristic_descriptor}))
+        if("geometric" in families):
+            for scale in scales:
+                state_space_descriptor, heuristic_descriptor = MapGenerator.geometric(scale, seed)
+                runWorkloads(f"geometric/{scale}", Benchmark.stateSpaceWorkloads(state_space_descriptor, {"euclidean": heuristic_descriptor}))
+        if("scalefree" in families):
+            for scale in scales:
+                state_space_descriptor, heuristic_descriptor = MapGenerator.scaleFree(scale, seed)
+                runWorkloads(f"scalefree/{scale}", Benchmark.stateSpaceWorkloads(state_space_descriptor, {"hops": heuristic_descriptor}))
+        if("puzzle" in families):
+            #8-puzzle has 181440 reachable boards, 15-puzzle boards are only searched with heuristics
+            for moves in (10, 20, 30):
+                runWorkloads(f"puzzle/3x3-{moves}", Benchmark.puzzleWorkloads(Benchmark.scrambledPuzzle(3, moves, seed), True))
+            for moves in (20, 40):
+                runWorkloads(f"puzzle/4x4-{moves}", Benchmark.puzzleWorkloads(Benchmark.scrambledPuzzle(4, moves, seed), False))
+        if("ch" in families):
+            for scale in [x for x in scales if x <= ch_max_states]:
+                side = round(math.sqrt(scale))
+                record(f"ch/grid-{side}x{side}", Benchmark.contractionHierarchyMetrics(MapGenerator.grid(side, side, seed)[0], seed=seed))
+        if("replan" in families):
+            for scale in [x for x in scales if x <= replan_max_states]:
+                side = round(math.sqrt(scale))
+                state_space_descriptor, heuristic_descriptor = MapGenerator.grid(side, side, seed)
+                for batch_size in Benchmark.REPLAN_BATCHES:
+                    record(f"replan/grid-{side}x{side}/batch-{batch_size}", Benchmark.replanningMetrics(state_space_descriptor, heuristic_descriptor, batch_size, seed=seed))
+
+        return results
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, threshold: float = 0.25) -> list[str]:
+        """Finds metrics which regressed by more than threshold relative to baseline
+
+        Workloads or metrics missing from either side are ignored, as are timings below MIN_WALL_S.
+
+        Returns:
+            list[str]: Description of every regression
+        """
+        regressions = []
+        for name, metrics in results.items():
+            baseline_metrics = baseline.get(name)
+            if(baseline_metrics is None):
+                continue
+            for metric, value in metrics.items():
+                baseline_value = baseline_metrics.get(metric)
+                if(baseline_value is None or baseline_value <= 0):
+                    continue
+                if(metric.endswith("_s") and max(value, baseline_value) < Benchmark.MIN_WALL_S):
+                    continue
+                if(metric == "expansions_per_s" and metrics["wall_s"] < Benchmark.MIN_WALL_S):
+                    continue
+                if(metric in Benchmark.HIGHER_IS_BETTER):
+                    regressed = value < baseline_value * (1 - threshold)
+                else:
+                    regressed = value > baseline_value * (1 + threshold)
+                if(regressed):
+                    regressions.append(f"{name} {metric}: {baseline_value:.6g} -> {value:.6g} ({(value / baseline_value - 1) * 100:+.1f}%)")
+
+        return regressions
+
+
+if(__name__=="__main__"):
+    flags_parser = argparse.ArgumentParser()
+
+    flags_parser.add_argument('--baseline', action="store", dest='baseline', default=None)
+    flags_parser.add_argument('--update', action="store_true", dest='update', default=False)
+    flags_parser.add_argument('--threshold', action="store", dest='threshold', type=float, default=0.25)
+    flags_parser.add_argument('--families', action="store", dest='families', default=",".join(Benchmark.FAMILIES))
+    flags_parser.add_argument('--max-states', action="store", dest='max_states', type=float, default=1e6)
+    flags_parser.add_argument('--ch-max-states', action="store", dest='ch_max_states', type=float, default=1e4)
+    flags_parser.add_argument('--replan-max-states', action="store", dest='replan_max_states', type=float, default=1e5)
+    flags_parser.add_argument('--repeat', action="store", dest='repeat', type=int, default=3)
+    flags_parser.add_argument('--no-memory', action="store_false", dest='memory', default=True)
+    flags_parser.add_argument('--seed', action="store", dest='seed', type=int, default=0)
+    args = flags_parser.parse_args()
+
+    families = args.families.split(",")
+    unknown = [x for x in families if x not in Benchmark.FAMILIES]
+    if(unknown):
+        print(f"Unknown benchmark families: {', '.join(unknown)}, expected: {', '.join(Benchmark.FAMILIES)}")
+        exit(2)
+    results = Benchmark.run(families, int(args.max_states), int(args.ch_max_states), args.repeat, args.memory, args.seed, sys.stdout,
+        int(args.replan_max_states))
+
+    if(args.baseline is None):
+        exit()
+    if(args.update or not os.path.exists(args.baseline)):
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"version": 1, "results": results}, file, indent=1, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        exit()
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+    regressions = Benchmark.compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"[REGRESSION]: {regression}")
+    if(regressions):
+        exit(1)
+    print(f"No regressions over {args.threshold * 100:.0f}%")
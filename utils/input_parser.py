@@ -1,11 +1,45 @@
 from enum import Enum, auto
 from data_strucutres.descriptors import StateSpaceDescriptor, HeuristicDescriptor
-import string
+import re
+import sys
+
+
+class ParseError(ValueError):
+    """Raised when state space or heuristic description is invalid
+
+    Attributes:
+        message (str): Description of the error
+        line_number (int): Line on which error occurred, starting from 1
+        column (int): Column at which error occurred, starting from 1
+        line (str): Content of the line
+    """
+    def __init__(self, message: str, line_number: int, column: int, line: str):
+        super().__init__(message, line_number, column, line)
+        self.message = message
+        self.line_number = line_number
+        self.column = column
+        self.line = line
+
+    def __str__(self) -> str:
+        return f"{self.message} (line {self.line_number}, column {self.column})"
 
 
 class Parser:
-    """Used to parse state space and heuristic space"""
-    allowed_characters = set(string.ascii_lowercase + string.ascii_uppercase + string.digits + "_ščćđžŠČĆĐŽ")
+    """Used to parse state space and heuristic space
+
+    Files are parsed line by line, every line is validated with a single precompiled regex.
+    """
+    allowed_characters = "_ščćđžŠČĆĐŽa-zA-Z0-9"
+    name_regex = f"[{allowed_characters}]+"
+    number_regex = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+
+    valid_string_pattern = re.compile(f"[{allowed_characters}]*")
+    valid_number_pattern = re.compile(number_regex)
+    starting_state_pattern = re.compile(name_regex)
+    ending_states_pattern = re.compile(f"{name_regex}(?: {name_regex})*")
+    transitions_pattern = re.compile(f"({name_regex}):((?: {name_regex},{number_regex})*)")
+    heuristic_pattern = re.compile(f"({name_regex}): ({number_regex})")
+    token_pattern = re.compile("[^ :,]+")
 
     class ParserStates(Enum):
         READING_STARTING_STATE=auto()
@@ -20,7 +54,7 @@ class Parser:
         Returns:
             bool: True if str_to_check contains only specified characters, False otherwise
         """
-        return set(str_to_check) <= Parser.allowed_characters
+        return Parser.valid_string_pattern.fullmatch(str_to_check) is not None
 
     @staticmethod
     def checkValidNumber(str_to_check: str) -> bool:
@@ -30,105 +64,148 @@ class Parser:
         Returns:
             bool: True if str_to_check can be converted to number, False otherwise
         """
-        try:
-            float(str_to_check)
-        except ValueError as e:
-            return False
-        
-        return True
+        return Parser.valid_number_pattern.fullmatch(str_to_check) is not None
 
     @staticmethod
-    def illegalString(line: str) -> None:
-        print(f"\"{line}\" contains illegal character")
-        exit()
-    
+    def readLines(source, chunk_size: int = None):
+        """Iterates over lines of source
+
+        Args:
+            source: Path to file or text file-like object
+            chunk_size (int): If specified, source is read in chunks of chunk_size characters
+                so only one chunk and one line are held in memory at a time
+        Yields:
+            str: Line content, possibly with trailing line ending
+        """
+        if(isinstance(source, str)):
+            with open(source, encoding="utf-8") as file:
+                yield from Parser.readLines(file, chunk_size)
+            return
+
+        if(chunk_size is None):
+            yield from source
+            return
+
+        remainder = ""
+        while(True):
+            chunk = source.read(chunk_size)
+            if(not chunk):
+                break
+            lines = (remainder + chunk).split("\n")
+            remainder = lines.pop()
+            yield from lines
+        if(remainder):
+            yield remainder
+
     @staticmethod
-    def illegalNumber(line: str) -> None:
-        print(f"\"{line}\" cannot be parsed to number")
-        exit()
+    def lineError(line_number: int, line: str, numbers_after_colon: bool = False) -> ParseError:
+        """Creates ParseError describing the first invalid token of the line
+
+        Only called after the line failed validation, so the happy path never tokenizes lines twice.
+
+        Args:
+            line_number (int): Line number starting from 1
+            line (str): Content of the line
+            numbers_after_colon (bool): True if tokens after ":" are numbers (heuristic lines),
+                otherwise only tokens after "," are numbers (transition lines)
+        Returns:
+            ParseError: Error with line and column of the first invalid token
+        """
+        for match in Parser.token_pattern.finditer(line):
+            token = match.group()
+            start = match.start()
+            if(line[start - 1:start] == "," or (numbers_after_colon and ":" in line[:start])):
+                if(Parser.valid_number_pattern.fullmatch(token) is None):
+                    return ParseError(f"\"{token}\" cannot be parsed to number", line_number, start + 1, line)
+            elif(Parser.valid_string_pattern.fullmatch(token) is None):
+                column = start + 1 + len(Parser.valid_string_pattern.match(token).group())
+                return ParseError(f"\"{token}\" contains illegal character", line_number, column, line)
+
+        return ParseError(f"\"{line}\" is not formatted correctly", line_number, 1, line)
 
     @staticmethod
-    def parseStateSpaceDescription(filePath: str) -> StateSpaceDescriptor:
-        """Parse state space
+    def parseStateSpaceLines(lines) -> StateSpaceDescriptor:
+        """Parse state space from lines
         Args:
-            filePath (str): Path to file
+            lines: Iterable of lines, see Parser.readLines
         Returns:
             StateSpaceDescriptor: State space descriptor
         """
         parser_state = Parser.ParserStates.READING_STARTING_STATE
         state_space_descriptor = StateSpaceDescriptor()
+        transitions = state_space_descriptor.transitions
+        transitions_match = Parser.transitions_pattern.fullmatch
+        intern = sys.intern
 
-        file = open(filePath, encoding="utf-8")
-
-        for line in file.readlines():
-            #remove newline
+        for line_number, line in enumerate(lines, 1):
             line = line.strip()
-            if(not line.startswith('#')):
-                if(parser_state==Parser.ParserStates.READING_TRANSITIONS):
-                    #parse transitions
-                    pos = line.find(":")
-                    fromState = line[0:pos]
-                    if(not Parser.checkValidString(fromState)):
-                        Parser.illegalString(fromState)
-                    #remove ":\s"
-                    line=line[pos+2:]
-                    if(line == ''):
-                        toStates=[]
-                    else:
-                        toStates=[tuple(x.split(",")) for x in line.split(" ")]
-                        for toStateWCost in toStates:
-                            if(not Parser.checkValidString(toStateWCost[0])):
-                                Parser.illegalString(toStateWCost[0])
-                            if(not Parser.checkValidNumber(toStateWCost[1])):
-                                Parser.illegalNumber(toStateWCost[1])
-
-                        toStates = [(x[0], float(x[1])) for x in toStates]
-                    state_space_descriptor.setTransitions(fromState, toStates)
-                elif(parser_state==Parser.ParserStates.READING_STARTING_STATE):
-                    #parse ending states
-                    #check if line contains valid characters
-                    if(not Parser.checkValidString(line)):
-                        Parser.illegalString(line)
-                    state_space_descriptor.starting_state = line
-                    parser_state=Parser.ParserStates.READING_ENDING_STATES
-                elif(parser_state==Parser.ParserStates.READING_ENDING_STATES):
-                    #parse starting state
-                    ending_states = line.split(" ")
-                    if(ending_states[-1]==""):
-                        Parser.illegalString(ending_states[len(ending_states) - 2] + " ")
-                    for state in ending_states:
-                        if(not Parser.checkValidString(state)):
-                            Parser.illegalString(state)
-                    state_space_descriptor.ending_states = ending_states
-                    parser_state=Parser.ParserStates.READING_TRANSITIONS
-            else:
-                #process comment
-                pass
-        file.close()
+            #skip comments and empty lines
+            if(not line or line[0] == '#'):
+                continue
+            if(parser_state==Parser.ParserStates.READING_TRANSITIONS):
+                match = transitions_match(line)
+                if(match is None):
+                    raise Parser.lineError(line_number, line)
+                toStates = []
+                for toStateWCost in match.group(2).split(" ")[1:]:
+                    state, cost = toStateWCost.split(",")
+                    toStates.append((intern(state), float(cost)))
+                transitions[intern(match.group(1))] = toStates
+            elif(parser_state==Parser.ParserStates.READING_STARTING_STATE):
+                if(Parser.starting_state_pattern.fullmatch(line) is None):
+                    raise Parser.lineError(line_number, line)
+                state_space_descriptor.starting_state = intern(line)
+                parser_state=Parser.ParserStates.READING_ENDING_STATES
+            elif(parser_state==Parser.ParserStates.READING_ENDING_STATES):
+                if(Parser.ending_states_pattern.fullmatch(line) is None):
+                    raise Parser.lineError(line_number, line)
+                state_space_descriptor.ending_states = [intern(state) for state in line.split(" ")]
+                parser_state=Parser.ParserStates.READING_TRANSITIONS
+
         return state_space_descriptor
 
     @staticmethod
-    def parseHeuristicDescriptor(filePath: str) -> HeuristicDescriptor:
-        """Parse heuristic space
+    def parseStateSpaceDescription(filePath, chunk_size: int = None) -> StateSpaceDescriptor:
+        """Parse state space
+        Args:
+            filePath: Path to file or text file-like object
+            chunk_size (int): If specified, file is read in chunks of chunk_size characters, see Parser.readLines
+        Returns:
+            StateSpaceDescriptor: State space descriptor, raises ParseError if file is invalid
+        """
+        return Parser.parseStateSpaceLines(Parser.readLines(filePath, chunk_size))
+
+    @staticmethod
+    def parseHeuristicLines(lines) -> HeuristicDescriptor:
+        """Parse heuristic space from lines
         Args:
-            filePath (str): Path to file
+            lines: Iterable of lines, see Parser.readLines
         Returns:
-            HeuristicSpaceDescriptor: Heuristic space descriptor
+            HeuristicDescriptor: Heuristic descriptor
         """
-        file = open(filePath, encoding="utf-8")
         heuristic_descriptor = HeuristicDescriptor()
-        
-        for line in file.readlines():
-            line = line.strip()
-            pos = line.find(":")
-            state = line[0:pos]
-            if(not Parser.checkValidString(state)):
-                Parser.illegalString(state)
-            value = line[pos+2:]
-            if(not Parser.checkValidNumber(value)):
-                Parser.illegalNumber(value)
-            heuristic_descriptor.addPair(state, float(value))
+        pairs = heuristic_descriptor.pairs
+        heuristic_match = Parser.heuristic_pattern.fullmatch
+        intern = sys.intern
 
-        file.close()
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if(not line):
+                continue
+            match = heuristic_match(line)
+            if(match is None):
+                raise Parser.lineError(line_number, line, True)
+            pairs[intern(match.group(1))] = float(match.group(2))
 
         return heuristic_descriptor
+
+    @staticmethod
+    def parseHeuristicDescriptor(filePath, chunk_size: int = None) -> HeuristicDescriptor:
+        """Parse heuristic space
+        Args:
+            filePath: Path to file or text file-like object
+            chunk_size (int): If specified, file is read in chunks of chunk_size characters, see Parser.readLines
+        Returns:
+            HeuristicSpaceDescriptor: Heuristic space descriptor, raises ParseError if file is invalid
+        """
+        return Parser.parseHeuristicLines(Parser.readLines(filePath, chunk_size))
@@ -0,0 +1,290 @@
+from data_strucutres.descriptors import StateSpaceDescriptor, HeuristicDescriptor
+import argparse
+import math
+import os
+import random
+
+
+class MapGenerator:
+    """Seeded generators of synthetic state spaces with admissible and consistent heuristics
+
+    Every generator returns the same state space and heuristic for the same arguments.
+    Costs and heuristic values are integers, so they survive writing to files unchanged.
+    Families are generated by MapGenerator.generate and written in Parser format by MapGenerator.write.
+    """
+    FAMILIES = ("grid", "obstacles", "geometric", "scalefree", "unreachable")
+
+    @staticmethod
+    def grid(width: int, height: int, seed: int = 0, max_cost: int = 10, obstacle_ratio: float = 0.0, wall: bool = False) -> tuple[StateSpaceDescriptor, HeuristicDescriptor]:
+        """Generates 4-connected grid with random costs from c0_0 to the opposite corner
+
+        Moving into a cell costs between 1 and max_cost, heuristic is Manhattan distance to the goal.
+        Obstacles are cells left out of the state space. A random monotone path from start to goal is
+        kept free of obstacles, so the goal stays reachable unless wall is set.
+
+        Args:
+            width (int): Number of columns
+            height (int): Number of rows
+            seed (int): Seed of costs and obstacles
+            max_cost (int): Highest cost of a move
+            obstacle_ratio (float): Probability of a cell being an obstacle
+            wall (bool): If True, a column of obstacles in front of the goal makes it unreachable
+
+        Returns:
+            tuple[StateSpaceDescriptor, HeuristicDescriptor]: State space and its heuristic
+        """
+        rng = random.Random(seed)
+        names = [[f"c{x}_{y}" for y in range(height)] for x in range(width)]
+        cell_costs = [[float(rng.randint(1, max_cost)) for y in range(height)] for x in range(width)]
+        free = [[rng.random() >= obstacle_ratio for y in range(height)] for x in range(width)]
+        x, y = 0, 0
+        free[0][0] = True
+        while(x < width - 1 or y < height - 1):
+            if(y == height - 1 or (x < width - 1 and rng.random() < 0.5)):
+                x += 1
+            else:
+                y += 1
+            free[x][y] = True
+        if(wall and width > 1):
+            for y in range(height):
+                free[width - 2][y] = False
+        state_space_descriptor = StateSpaceDescriptor()
+        heuristic_descriptor = HeuristicDescriptor()
+        state_space_descriptor.starting_state = names[0][0]
+        state_space_descriptor.ending_states = [names[width - 1][height - 1]]
+        for x in range(width):
+            for y in range(height):
+                if(not free[x][y]):
+                    continue
+                transitions = []
+                for next_x, next_y in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if(0 <= next_x < width and 0 <= next_y < height and free[next_x][next_y]):
+                        transitions.append((names[next_x][next_y], cell_costs[next_x][next_y]))
+                state_space_descriptor.setTransitions(names[x][y], transitions)
+                heuristic_descriptor.addPair(names[x][y], float(width - 1 - x + height - 1 - y))
+
+        return state_space_descriptor, heuristic_descriptor
+
+    @staticmethod
+    def largestComponent(transitions: list[list[tuple[str, float]]], names: list[str]) -> list[int]:
+        """Finds states of the largest connected component of a graph whose transitions go both ways"""
+        ids = {name: i for i, name in enumerate(names)}
+        component_of = [-1] * len(names)
+        largest = []
+        for root in range(len(names)):
+            if(component_of[root] != -1):
+                continue
+            component_of[root] = root
+            component = [root]
+            for state in component:
+                for name, cost in transitions[state]:
+                    next_state = ids[name]
+                    if(component_of[next_state] == -1):
+                        component_of[next_state] = root
+                        component.append(next_state)
+            if(len(component) > len(largest)):
+                largest = component
+
+        return largest
+
+    @staticmethod
+    def geometric(num_states: int, seed: int = 0, degree: float = 6.0, scale: int = 1000) -> tuple[StateSpaceDescriptor, HeuristicDescriptor]:
+        """Generates road-like random geometric graph
+
+        States are random points in a square of side scale, connected both ways when closer than the radius
+        giving average degree. Cost is the distance rounded up and heuristic is the straight line distance to
+        the goal rounded down. Starting state is the point closest to one corner, goal the closest to the opposite one.
+
+        Returns:
+            tuple[StateSpaceDescriptor, HeuristicDescriptor]: State space and its heuristic
+        """
+        rng = random.Random(seed)
+        points = [(rng.random() * scale, rng.random() * scale) for i in range(num_states)]
+        names = [f"v{i}" for i in range(num_states)]
+        radius = scale * math.sqrt(degree / (math.pi * num_states))
+        #points are bucketed into cells of side radius, so neighbours are in the same or adjacent cells
+        cells_per_side = max(1, int(scale / radius))
+        buckets = {}
+        for i, (x, y) in enumerate(points):
+            buckets.setdefault((min(int(x / radius), cells_per_side - 1), min(int(y / radius), cells_per_side - 1)), []).append(i)
+        transitions = [[] for i in range(num_states)]
+        radius_squared = radius * radius
+        for (cell_x, cell_y), bucket in buckets.items():
+            for next_cell in ((cell_x, cell_y), (cell_x + 1, cell_y - 1), (cell_x + 1, cell_y), (cell_x + 1, cell_y + 1), (cell_x, cell_y + 1)):
+                next_bucket = buckets.get(next_cell)
+                if(next_bucket is None):
+                    continue
+                same_cell = next_bucket is bucket
+                for i in bucket:
+                    x, y = points[i]
+                    for j in next_bucket:
+                        if(same_cell and j <= i):
+                            continue
+                        dx = points[j][0] - x
+                        dy = points[j][1] - y
+                        if(dx * dx + dy * dy < radius_squared):
+                            cost = float(math.ceil(math.sqrt(dx * dx + dy * dy)))
+                            transitions[i].append((names[j], cost))
+                            transitions[j].append((names[i], cost))
+
+        #search is between extreme points of the largest connected component
+        component = MapGenerator.largestComponent(transitions, names)
+        start = min(component, key=lambda i: points[i][0] + points[i][1])
+        goal = max(component, key=lambda i: points[i][0] + points[i][1])
+        goal_x, goal_y = points[goal]
+        state_space_descriptor = StateSpaceDescriptor()
+        heuristic_descriptor = HeuristicDescriptor()
+        state_space_descriptor.starting_state = names[start]
+        state_space_descriptor.ending_states = [names[goal]]
+        for i in range(num_states):
+            state_space_descriptor.setTransitions(names[i], transitions[i])
+            heuristic_descriptor.addPair(names[i], float(math.floor(math.hypot(points[i][0] - goal_x, points[i][1] - goal_y))))
+
+        return state_space_descriptor, heuristic_descriptor
+
+    @staticmethod
+    def scaleFree(num_states: int, seed: int = 0, edges_per_state: int = 2, max_cost: int = 10) -> tuple[StateSpaceDescriptor, HeuristicDescriptor]:
+        """Generates scale-free graph by preferential attachment
+
+        Every new state is connected both ways to edges_per_state existing states picked with probability
+        proportional to their degree, so a few hubs get most of the transitions. Costs are between 1 and
+        max_cost and heuristic is the number of transitions to the goal, which never exceeds the cost.
+        Search goes from the last state to the one added before it.
+
+        Returns:
+            tuple[StateSpaceDescriptor, HeuristicDescriptor]: State space and its heuristic
+        """
+        rng = random.Random(seed)
+        names = [f"n{i}" for i in range(num_states)]
+        transitions = [[] for i in range(num_states)]
+        #every state appears once per transition, so a uniform pick is proportional to degree
+        endpoints = []
+        for state in range(num_states):
+            targets = set()
+            if(state <= edges_per_state):
+                targets = set(range(state))
+            else:
+                while(len(targets) < edges_per_state):
+                    targets.add(rng.choice(endpoints))
+            for target in sorted(targets):
+                cost = float(rng.randint(1, max_cost))
+                transitions[state].append((names[target], cost))
+                transitions[target].append((names[state], cost))
+                endpoints += [state, target]
+
+        start = num_states - 1
+        goal = max(num_states - 2, 0)
+        hops = MapGenerator.hopDistances(transitions, names, goal)
+        state_space_descriptor = StateSpaceDescriptor()
+        heuristic_descriptor = HeuristicDescriptor()
+        state_space_descriptor.starting_state = names[start]
+        state_space_descriptor.ending_states = [names[goal]]
+        for i in range(num_states):
+            state_space_descriptor.setTransitions(names[i], transitions[i])
+            heuristic_descriptor.addPair(names[i], float(hops[i]))
+
+        return state_space_descriptor, heuristic_descriptor
+
+    @staticmethod
+    def hopDistances(transitions: list[list[tuple[str, float]]], names: list[str], goal: int) -> list[int]:
+        """Counts transitions on the shortest path from every state to goal of a graph whose transitions go both ways
+
+        Returns:
+            list[int]: Number of transitions of every state, 0 for states from which goal cannot be reached
+        """
+        ids = {name: i for i, name in enumerate(names)}
+        hops = [-1] * len(names)
+        hops[goal] = 0
+        queue = [goal]
+        for state in queue:
+            for name, cost in transitions[state]:
+                next_state = ids[name]
+                if(hops[next_state] == -1):
+                    hops[next_state] = hops[state] + 1
+                    queue.append(next_state)
+
+        return [max(x, 0) for x in hops]
+
+    @staticmethod
+    def generate(family: str, num_states: int, seed: int = 0, obstacle_ratio: float = 0.25) -> tuple[StateSpaceDescriptor, HeuristicDescriptor]:
+        """Generates state space of about num_states states
+
+        Args:
+            family (str): One of MapGenerator.FAMILIES:
+                grid: Square grid, see MapGenerator.grid
+                obstacles: Square grid with obstacle_ratio of cells blocked
+                geometric: Random geometric graph, see MapGenerator.geometric
+                scalefree: Preferential attachment graph, see MapGenerator.scaleFree
+                unreachable: Grid with obstacles whose goal is walled off
+            num_states (int): Number of states, grids use the nearest square
+            seed (int): Seed of the generator
+            obstacle_ratio (float): Probability of a grid cell being an obstacle
+
+        Returns:
+            tuple[StateSpaceDescriptor, HeuristicDescriptor]: State space and its admissible and consistent heuristic
+        """
+        side = max(2, round(math.sqrt(num_states)))
+        if(family == "grid"):
+            return MapGenerator.grid(side, side, seed)
+        if(family == "obstacles"):
+            return MapGenerator.grid(side, side, seed, obstacle_ratio=obstacle_ratio)
+        if(family == "geometric"):
+            return MapGenerator.geometric(num_states, seed)
+        if(family == "scalefree"):
+            return MapGenerator.scaleFree(num_states, seed)
+        if(family == "unreachable"):
+            return MapGenerator.grid(side, side, seed, obstacle_ratio=obstacle_ratio, wall=True)
+        raise ValueError(f"Unknown map family \"{family}\", expected one of: {', '.join(MapGenerator.FAMILIES)}")
+
+    @staticmethod
+    def formatNumber(value: float) -> str:
+        return str(int(value)) if value.is_integer() else str(value)
+
+    @staticmethod
+    def write(state_space_descriptor: StateSpaceDescriptor, heuristic_descriptor: HeuristicDescriptor, path: str, heuristic_path: str, comment: str = None) -> None:
+        """Writes state space and heuristic in the format read by Parser
+
+        Args:
+            state_space_descriptor (StateSpaceDescriptor): State space to write
+            heuristic_descriptor (HeuristicDescriptor): Heuristic to write
+            path (str): Path of the state space file
+            heuristic_path (str): Path of the heuristic file
+            comment (str): Written as the first line of the state space file after "#"
+        """
+        number = MapGenerator.formatNumber
+        with open(path, "w", encoding="utf-8") as file:
+            if(comment is not None):
+                file.write(f"# {comment}\n")
+            file.write(f"{state_space_descriptor.starting_state}\n")
+            file.write(f"{' '.join(state_space_descriptor.ending_states)}\n")
+            for state, transitions in state_space_descriptor.transitions.items():
+                file.write(f"{state}:{''.join([f' {x},{number(cost)}' for x, cost in transitions])}\n")
+        with open(heuristic_path, "w", encoding="utf-8") as file:
+            for state, value in heuristic_descriptor.pairs.items():
+                file.write(f"{state}: {number(value)}\n")
+
+    @staticmethod
+    def heuristicPath(path: str) -> str:
+        """Gets path of the heuristic file of state space file, named like the bundled maps, e.g. istra_heuristic.txt"""
+        root, extension = os.path.splitext(path)
+        return f"{root}_heuristic{extension or '.txt'}"
+
+
+if(__name__=="__main__"):
+    flags_parser = argparse.ArgumentParser()
+
+    flags_parser.add_argument('--family', action="store", dest='family', choices=MapGenerator.FAMILIES, default="grid")
+    flags_parser.add_argument('--states', action="store", dest='states', type=float, default=1e4)
+    flags_parser.add_argument('--seed', action="store", dest='seed', type=int, default=0)
+    flags_parser.add_argument('--obstacles', action="store", dest='obstacles', type=float, default=0.25)
+    flags_parser.add_argument('--output', action="store", dest='output', required=True)
+    args = flags_parser.parse_args()
+
+    state_space_descriptor, heuristic_descriptor = MapGenerator.generate(args.family, int(args.states), args.seed, args.obstacles)
+    heuristic_path = MapGenerator.heuristicPath(args.output)
+    MapGenerator.write(state_space_descriptor, heuristic_descriptor, args.output, heuristic_path,
+        f"family={args.family} states={int(args.states)} seed={args.seed} obstacles={args.obstacles}")
+    print(f"[STATES]: {len(state_space_descriptor.transitions)}")
+    print(f"[TRANSITIONS]: {sum(len(x) for x in state_space_descriptor.transitions.values())}")
+    print(f"[MAP]: {args.output}")
+    print(f"[HEURISTIC]: {heuristic_path}")
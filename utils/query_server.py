@@ -0,0 +1,405 @@
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.search_budget import SearchBudget
+from data_strucutres.descriptors import BudgetExceededResult
+from algorithms.compiled_search_algorithms import CompiledBFS, CompiledUCS, CompiledA_STAR
+from algorithms.heuristic_check import HeuristicCheck
+from algorithms.cost_to_go import ReverseDijkstra
+from utils.input_parser import Parser
+from utils.batch_query import BatchQuery
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import json
+import multiprocessing
+import os
+import stat
+import sys
+
+#maps of the worker process, set by _initWorker
+_worker_maps = None
+
+
+def _initWorker(maps: dict) -> None:
+    global _worker_maps
+    _worker_maps = maps
+
+
+def _answerRequest(request) -> str:
+    return QueryServer.answer(_worker_maps, request)
+
+
+class ServedMap:
+    """State space and heuristics loaded once and kept in memory by QueryServer
+
+    Attributes:
+        name (str): Name of the state space file without directory and extension, requests refer to the map by it
+        path (str): Path to the state space file
+        heuristic_paths (list[str]): Paths to heuristic files
+        graph (CompiledGraph): Compiled state space
+        heuristics (dict): Compiled heuristic keyed by name of its file without directory and extension
+        source_times: Modification time and size of every source file when it was loaded
+    """
+    def __init__(self, path: str, heuristic_paths: list[str] = ()):
+        self.path = path
+        self.heuristic_paths = list(heuristic_paths)
+        self.name = ServedMap.nameOf(path)
+        #read before parsing, so a change written during parsing is picked up by the next reload
+        self.source_times = self.readSourceTimes()
+        self.graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(path))
+        self.heuristics = {ServedMap.nameOf(x): self.graph.compileHeuristic(Parser.parseHeuristicDescriptor(x)) for x in self.heuristic_paths}
+        self._costs_to_go = None
+
+    @staticmethod
+    def nameOf(path: str) -> str:
+        return os.path.splitext(path.replace("\\", "/").split("/")[-1])[0]
+
+    def readSourceTimes(self) -> tuple:
+        """Gets modification time and size of every source file, None for a missing file"""
+        source_times = []
+        for path in [self.path] + self.heuristic_paths:
+            try:
+                file_stat = os.stat(path)
+                source_times.append((file_stat.st_mtime_ns, file_stat.st_size))
+            except OSError:
+                source_times.append(None)
+        return tuple(source_times)
+
+    def changed(self) -> bool:
+        """Checks if any source file changed since it was loaded"""
+        return self.readSourceTimes() != self.source_times
+
+    def costsToGo(self):
+        """Gets true cost to the nearest ending state of every state, computed on first use"""
+        if(self._costs_to_go is None):
+            self._costs_to_go = ReverseDijkstra.search(self.graph)
+        return self._costs_to_go
+
+    def __getstate__(self) -> dict:
+        #costs to go are computed again by every worker that needs them
+        state = self.__dict__.copy()
+        state["_costs_to_go"] = None
+        return state
+
+
+class QueryServer:
+    """Answers search, heuristic check and batch requests against maps loaded once
+
+    Clients connect over a Unix socket or TCP and send one request per line. A request is either
+    a JSON object or a plain line "START GOAL [GOAL ...]" of the default map, answered by UCS in the
+    format of BatchQuery. Every JSON request is answered by one JSON object on one line, with the "id" of the
+    request echoed and "error" set if the request is invalid. Answers are written in request order,
+    requests of one connection may still be run concurrently by the worker pool. JSON requests:
+
+        {"op": "search", "map": NAME, "alg": "bfs"|"ucs"|"astar", "start": STATE, "goals": [STATE, ...],
+            "heuristic": NAME, "deadline_ms": MS, "max_expansions": N, "max_frontier": N}
+        {"op": "check", "map": NAME, "check": "consistent"|"optimistic", "heuristic": NAME}
+        {"op": "batch", "map": NAME, "alg": "bfs"|"ucs", "queries": ["START GOAL", ...]}
+        {"op": "maps"}
+
+    Only "op" is required. Map defaults to the first loaded one, start and goals to those of its file,
+    algorithm to A* if a heuristic is given and UCS otherwise, limits to those of the server.
+    A* is only run towards the goals of the file, which its heuristic estimates.
+
+    CPU-bound requests are run on a pool of worker processes, the event loop only reads and writes lines.
+    Source files are polled for changes, a changed map is parsed again in the background and the
+    pool is replaced once it is loaded, so requests never see a partially loaded map.
+    """
+    OPERATIONS = ("search", "check", "batch", "maps")
+    ALGORITHMS = ("bfs", "ucs", "astar")
+    LIMITS = ("deadline_ms", "max_expansions", "max_frontier")
+    #JSON type of every request field the server reads, lists hold strings, other fields are ignored
+    FIELD_TYPES = {"op": str, "map": str, "alg": str, "start": str, "goals": list, "heuristic": str, "check": str, "queries": list, "query": str,
+        "deadline_ms": (int, float), "max_expansions": int, "max_frontier": int}
+
+    def __init__(self, maps: list[ServedMap], workers: int = None, limits: dict = None, reload_interval: float = 1.0, log = sys.stderr):
+        """
+        Args:
+            maps (list[ServedMap]): Maps to serve, the first one is the default
+            workers (int): Number of worker processes, os.cpu_count() if None, 0 answers requests in the event loop
+            limits (dict): Default SearchBudget limits of every search, keyed by QueryServer.LIMITS
+            reload_interval (float): Seconds between checks of source files, 0 disables reloading
+            log: Text file-like object to which server events are written, None to stay quiet
+        """
+        if(not maps):
+            raise ValueError("Query server needs at least one map")
+        self.maps = {x.name: x for x in maps}
+        self.default_map = maps[0].name
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.limits = {x: v for x, v in (limits or {}).items() if v is not None}
+        self.reload_interval = reload_interval
+        self.log = log
+        self.pool = None
+
+    def logEvent(self, event: str) -> None:
+        if(self.log is not None):
+            self.log.write(event + "\n")
+            self.log.flush()
+
+    @staticmethod
+    def parseAddress(address: str) -> tuple[str, str, int]:
+        """Parses "unix:PATH", "HOST:PORT" or "PORT" into (path, host, port), unused parts are None"""
+        if(address.startswith("unix:")):
+            return address[5:], None, None
+        host, _, port = address.rpartition(":")
+        if(not port.isdigit()):
+            raise ValueError(f"Invalid server address \"{address}\", expected unix:PATH, HOST:PORT or PORT")
+        return None, host or "127.0.0.1", int(port)
+
+    @staticmethod
+    def answer(maps: dict, request) -> str:
+        """Answers single request
+
+        Args:
+            maps (dict): Served maps keyed by name
+            request (dict): Request completed with defaults by QueryServer.prepareRequest
+
+        Returns:
+            str: Answer line without line ending
+        """
+        try:
+            QueryServer.checkFieldTypes(request)
+            if(request["op"] == "query"):
+                #plain line is answered in BatchQuery format
+                if(request["map"] not in maps):
+                    raise ValueError(f"Unknown map \"{request['map']}\", expected one of: {', '.join(maps)}")
+                return BatchQuery.answer(maps[request["map"]].graph, request["query"])
+            answer = QueryServer.answerRequest(maps, request)
+        except (KeyError, ValueError) as e:
+            answer = {"error": str(e) if not isinstance(e, KeyError) else f"unknown state {e}"}
+        if("id" in request):
+            answer["id"] = request["id"]
+        return json.dumps(answer)
+
+    @staticmethod
+    def answerRequest(maps: dict, request: dict) -> dict:
+        """Runs JSON request, raises KeyError for unknown states and ValueError if it is otherwise invalid"""
+        operation = request["op"]
+        if(operation == "maps"):
+            return {"maps": [{"name": x.name, "states": x.graph.num_states, "transitions": x.graph.num_transitions,
+                "heuristics": sorted(x.heuristics)} for x in maps.values()]}
+        served_map = maps.get(request["map"])
+        if(served_map is None):
+            raise ValueError(f"Unknown map \"{request['map']}\", expected one of: {', '.join(maps)}")
+        graph = served_map.graph
+        heuristic_name = request.get("heuristic")
+        if(heuristic_name is not None and heuristic_name not in served_map.heuristics):
+            raise ValueError(f"Unknown heuristic \"{heuristic_name}\" of map {served_map.name}, expected one of: {', '.join(served_map.heuristics)}")
+
+        if(operation == "batch"):
+            algorithm = request.get("alg", "ucs")
+            if(algorithm not in ("bfs", "ucs")):
+                raise ValueError(f"Unknown batch algorithm \"{algorithm}\", expected bfs or ucs")
+            if(not isinstance(request.get("queries"), list)):
+                raise ValueError("Batch needs a list of queries")
+            return {"answers": [BatchQuery.answer(graph, x, algorithm) for x in request["queries"]]}
+
+        if(operation == "check"):
+            if(heuristic_name is None):
+                raise ValueError("Heuristic check needs a heuristic")
+            heuristic = served_map.heuristics[heuristic_name]
+            check = request.get("check", "consistent")
+            if(check == "consistent"):
+                result = HeuristicCheck.checkConsistentVectorized(graph, heuristic, True)
+                violations = [[graph.names[result.sources[x]], graph.names[result.targets[x]]] for x in result.violations]
+                return {"consistent": result.consistent, "violations": violations}
+            if(check == "optimistic"):
+                costs_to_go = served_map.costsToGo()
+                violations = [graph.names[x] for x in range(graph.num_states) if heuristic[x] > costs_to_go[x]]
+                return {"optimistic": not violations, "violations": violations}
+            raise ValueError(f"Unknown check \"{check}\", expected consistent or optimistic")
+
+        if(operation != "search"):
+            raise ValueError(f"Unknown operation \"{operation}\", expected one of: {', '.join(QueryServer.OPERATIONS)}")
+        algorithm = request.get("alg", "astar" if heuristic_name is not None else "ucs")
+        if(algorithm not in QueryServer.ALGORITHMS):
+            raise ValueError(f"Unknown algorithm \"{algorithm}\", expected one of: {', '.join(QueryServer.ALGORITHMS)}")
+        starting_state = graph.getStateId(request["start"]) if "start" in request else graph.starting_state
+        if("goals" in request):
+            if(algorithm == "astar"):
+                raise ValueError("A* only searches towards goals of the map, which its heuristic estimates")
+            graph = graph.withEndingStates([graph.getStateId(x) for x in request["goals"]])
+        budget = None
+        if(any(x in request for x in QueryServer.LIMITS)):
+            budget = SearchBudget(request.get("deadline_ms"), request.get("max_expansions"), request.get("max_frontier"))
+
+        if(algorithm == "bfs"):
+            search_result = CompiledBFS.search(graph, starting_state, budget=budget)
+        elif(algorithm == "ucs"):
+            search_result = CompiledUCS.search(graph, starting_state, budget=budget)
+        else:
+            if(heuristic_name is None):
+                raise ValueError("A* needs a heuristic")
+            search_result = CompiledA_STAR.search(graph, served_map.heuristics[heuristic_name], starting_state, budget=budget)
+
+        answer = {"found_solution": search_result.found_solution, "states_visited": search_result.states_visited}
+        if(search_result.found_solution):
+            answer["path_length"] = search_result.path_length
+            answer["total_cost"] = search_result.total_cost
+            answer["path"] = search_result.path.strip().split(" => ")
+        if(isinstance(search_result, BudgetExceededResult)):
+            answer["budget_exceeded"] = search_result.reason
+        return answer
+
+    @staticmethod
+    def checkFieldTypes(request: dict) -> None:
+        """Checks JSON types of request fields, raises ValueError naming the first field of a wrong type"""
+        for field, value in request.items():
+            expected = QueryServer.FIELD_TYPES.get(field)
+            if(expected is None):
+                continue
+            #bool is an int in Python but not a number in a request
+            valid = isinstance(value, expected) and not isinstance(value, bool)
+            if(valid and expected is list):
+                valid = all(isinstance(x, str) for x in value)
+            if(not valid):
+                expected_name = "list of strings" if expected is list else "number" if isinstance(expected, tuple) else expected.__name__
+                raise ValueError(f"Invalid field \"{field}\": {json.dumps(value)}, expected {expected_name}")
+
+    def prepareRequest(self, line: str) -> dict:
+        """Parses request line and completes it with defaults of the server, raises ValueError if it is not a request"""
+        if(not line.startswith("{")):
+            return {"op": "query", "map": self.default_map, "query": line}
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e}")
+        if(not isinstance(request, dict) or "op" not in request):
+            raise ValueError("expected JSON object with \"op\"")
+        request.setdefault("map", self.default_map)
+        for limit, value in self.limits.items():
+            request.setdefault(limit, value)
+        return request
+
+    def startPool(self) -> None:
+        """Starts workers with current maps, requests already sent to the previous pool are finished by it"""
+        previous = self.pool
+        if(self.workers > 0):
+            if("fork" in multiprocessing.get_all_start_methods()):
+                #forked workers share arrays of the maps copy-on-write instead of unpickling them
+                context = multiprocessing.get_context("fork")
+            else:
+                context = multiprocessing.get_context()
+            self.pool = ProcessPoolExecutor(self.workers, context, _initWorker, (self.maps,))
+        if(previous is not None):
+            previous.shutdown(wait=False)
+
+    async def answerLine(self, line: str) -> str:
+        try:
+            request = self.prepareRequest(line)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        if(self.pool is None):
+            return QueryServer.answer(self.maps, request)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, _answerRequest, request)
+        except BrokenProcessPool:
+            #worker was killed, e.g. by the OOM killer, later requests get a new pool
+            self.startPool()
+            return json.dumps({"error": "worker process died while answering the request"})
+
+    async def serveConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Reads requests of one client and writes their answers in request order"""
+        #pending answers, bounded so a client that does not read its answers cannot queue requests forever
+        answers = asyncio.Queue(1024)
+
+        async def writeAnswers() -> None:
+            while(True):
+                answer = await answers.get()
+                if(answer is None):
+                    break
+                try:
+                    line = await answer
+                except Exception as e:
+                    #failure of one request must not stop answers to the following ones
+                    self.logEvent(f"[REQUEST_FAILED]: {e!r}")
+                    line = json.dumps({"error": f"internal error: {e!r}"})
+                writer.write((line + "\n").encode("utf-8"))
+                await writer.drain()
+
+        writing = asyncio.create_task(writeAnswers())
+        try:
+            while(True):
+                line = await reader.readline()
+                if(not line):
+                    break
+                line = line.decode("utf-8").strip()
+                if(not line or line.startswith("#")):
+                    continue
+                await answers.put(asyncio.ensure_future(self.answerLine(line)))
+            await answers.put(None)
+            await writing
+        except (ConnectionError, UnicodeDecodeError) as e:
+            self.logEvent(f"[CONNECTION_ERROR]: {e}")
+            writing.cancel()
+        except asyncio.CancelledError:
+            #server is shutting down
+            writing.cancel()
+        finally:
+            writer.close()
+
+    def reloadChanged(self) -> list[str]:
+        """Loads maps whose source files changed again, maps that fail to load are kept as they were
+
+        Returns:
+            list[str]: Names of reloaded maps
+        """
+        maps = dict(self.maps)
+        reloaded = []
+        for served_map in self.maps.values():
+            if(not served_map.changed()):
+                continue
+            try:
+                maps[served_map.name] = ServedMap(served_map.path, served_map.heuristic_paths)
+                reloaded.append(served_map.name)
+            except (OSError, ValueError) as e:
+                #file may be half written, it is loaded again once it changes
+                served_map.source_times = served_map.readSourceTimes()
+                self.logEvent(f"[RELOAD_FAILED]: {served_map.name} {e}")
+        self.maps = maps
+        return reloaded
+
+    async def watchMaps(self) -> None:
+        """Reloads changed maps every reload_interval seconds and replaces the pool after every reload"""
+        loop = asyncio.get_running_loop()
+        while(True):
+            await asyncio.sleep(self.reload_interval)
+            if(not any(x.changed() for x in self.maps.values())):
+                continue
+            #parsing runs on a thread, so requests are answered from the previous maps meanwhile
+            reloaded = await loop.run_in_executor(None, self.reloadChanged)
+            if(reloaded):
+                self.startPool()
+                self.logEvent(f"[RELOADED]: {' '.join(reloaded)}")
+
+    async def serve(self, address: str, ready: asyncio.Event = None) -> None:
+        """Serves requests until cancelled
+
+        Args:
+            address (str): "unix:PATH", "HOST:PORT" or "PORT" on localhost
+            ready (asyncio.Event): Set once the server accepts connections
+        """
+        path, host, port = QueryServer.parseAddress(address)
+        if(path is not None):
+            if(os.path.exists(path)):
+                if(not stat.S_ISSOCK(os.stat(path).st_mode)):
+                    raise ValueError(f"\"{path}\" exists and is not a socket")
+                #socket left by a server that did not exit cleanly
+                os.remove(path)
+            server = await asyncio.start_unix_server(self.serveConnection, path)
+        else:
+            server = await asyncio.start_server(self.serveConnection, host, port)
+        self.startPool()
+        watching = asyncio.create_task(self.watchMaps()) if self.reload_interval > 0 else None
+        self.logEvent(f"[LISTENING]: {address} {' '.join(self.maps)}")
+        if(ready is not None):
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if(watching is not None):
+                watching.cancel()
+            if(self.pool is not None):
+                self.pool.shutdown(wait=False, cancel_futures=True)
+            if(path is not None and os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode)):
+                os.remove(path)
@@ -0,0 +1,518 @@
+from data_strucutres.compiled_graph import CompiledGraph
+from data_strucutres.contraction_hierarchy import ContractionHierarchy
+from algorithms.landmarks import Landmarks
+from data_strucutres.pattern_database import PatternDatabase
+from utils.input_parser import Parser
+from array import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+
+
+class StringTable:
+    """Read only sequence of strings decoded lazily from a snapshot string blob
+
+    Attributes:
+        offsets (memoryview): Start of each string in blob, has len + 1 elements
+        blob (memoryview): UTF-8 encoded strings stored back to back
+    """
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class SnapshotFormat:
+    """Versioned binary file layout shared by all snapshots
+
+    Every snapshot starts with a header whose first fields are magic, version and flags, followed by
+    sections in native byte order, each aligned to 8 bytes. Snapshots of another version or byte order
+    are treated as missing, so they are rebuilt instead of misread.
+
+    Attributes:
+        magic (bytes): 8 bytes identifying the kind of snapshot
+        version (int): Version of the layout
+        header (struct.Struct): Header layout, starting with magic, version and flags
+        name (str): Kind of snapshot used in error messages
+    """
+    FLAG_BIG_ENDIAN = 2
+
+    def __init__(self, magic: bytes, version: int, header_format: str, name: str):
+        self.magic = magic
+        self.version = version
+        self.header = struct.Struct(header_format)
+        self.name = name
+
+    def write(self, path: str, header: tuple, sections, flags: int = 0) -> None:
+        """Writes snapshot to a temporary file first and then renames it, so readers never see a partial snapshot
+
+        Args:
+            path (str): Path of the snapshot file
+            header (tuple): Header fields following magic, version and flags
+            sections: Iterable of bytes-like objects, each written at an offset aligned to 8 bytes
+            flags (int): Flags of the snapshot, FLAG_BIG_ENDIAN is set on big endian machines
+        """
+        if(sys.byteorder == "big"):
+            flags |= SnapshotFormat.FLAG_BIG_ENDIAN
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, "wb") as file:
+            file.write(self.header.pack(self.magic, self.version, flags, *header))
+            for section in sections:
+                SnapshotFormat._pad(file)
+                file.write(section)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _pad(file) -> None:
+        padding = -file.tell() % 8
+        if(padding):
+            file.write(bytes(padding))
+
+    def unpackHeader(self, data) -> tuple:
+        """Unpacks header from the start of data
+
+        Returns:
+            tuple: Unpacked header if data starts with a header of this kind, version and byte order, None otherwise
+        """
+        if(len(data) < self.header.size):
+            return None
+        header = self.header.unpack_from(data)
+        magic, version, flags = header[:3]
+        big_endian = bool(flags & SnapshotFormat.FLAG_BIG_ENDIAN)
+        if(magic != self.magic or version != self.version or big_endian != (sys.byteorder == "big")):
+            return None
+        return header
+
+    def readHeader(self, path: str) -> tuple:
+        """Reads header of snapshot, None if file is missing or is not a snapshot of this kind, version and byte order"""
+        try:
+            with open(path, "rb") as file:
+                data = file.read(self.header.size)
+        except OSError as e:
+            return None
+        return self.unpackHeader(data)
+
+    def open(self, path: str) -> "SnapshotReader":
+        """Memory maps snapshot
+
+        Returns:
+            SnapshotReader: Reader of the sections following the header, raises ValueError if file is not
+                a snapshot of this kind, version and byte order
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        header = self.unpackHeader(view)
+        if(header is None):
+            raise ValueError(f"\"{path}\" is not a version {self.version} {self.name}")
+        return SnapshotReader(view, header, self.header.size)
+
+    def loadOrBuild(self, path: str, is_current, build, load):
+        """Loads snapshot, building it first if it is missing, of another version or byte order, or outdated
+
+        Args:
+            path (str): Path of the snapshot file
+            is_current: Called with unpacked header, returns False if snapshot does not match its sources
+            build: Called without arguments to (re)write snapshot at path
+            load: Called with path to load snapshot
+        """
+        header = self.readHeader(path)
+        if(header is None or not is_current(header)):
+            build()
+
+        return load(path)
+
+
+class SnapshotReader:
+    """Reads sections of a memory mapped snapshot one after another
+
+    Attributes:
+        view (memoryview): Whole mapped file
+        header (tuple): Unpacked header
+        position (int): Offset just after the last read section
+    """
+    def __init__(self, view: memoryview, header: tuple, position: int):
+        self.view = view
+        self.header = header
+        self.position = position
+
+    def section(self, format: str, count: int) -> memoryview:
+        """Gets next section of count values of array format, e.g. 'd', as a view into the mapped file"""
+        size = struct.calcsize(format) * count
+        self.position += -self.position % 8
+        values = self.view[self.position:self.position + size].cast(format)
+        self.position += size
+        return values
+
+
+class Snapshot:
+    """Versioned binary snapshot of a compiled state space and its heuristic
+
+    Snapshot layout (see SnapshotFormat):
+        header: magic, version, flags, number of states, transitions and ending states,
+                starting state, size of string blob, sha256 of source files
+        string table: uint64 offsets (states + 1) followed by UTF-8 blob
+        offsets: int64 (states + 1)
+        targets: int32 (transitions)
+        costs: float64 (transitions)
+        ending states: int32 (ending states)
+        heuristic: float64 (states), only if FLAG_HEURISTIC is set
+        goal reachability: uint8 (states), only if FLAG_PRUNED is set, see CompiledGraph.pruned
+    """
+    FORMAT = SnapshotFormat(b"SPASNAP\0", 1, "=8sIIqqqqq32s", "snapshot")
+    #flag 2 is SnapshotFormat.FLAG_BIG_ENDIAN
+    FLAG_HEURISTIC = 1
+    FLAG_PRUNED = 4
+
+    @staticmethod
+    def sourceHash(state_space_path: str, heuristic_path: str = None, prune: bool = False) -> bytes:
+        """Computes sha256 of state space file and heuristic file
+
+        Digest of a pruned snapshot differs, so a full snapshot is never loaded in place of a pruned one.
+
+        Returns:
+            bytes: Digest used to detect changed source files
+        """
+        digest = hashlib.sha256()
+        for path in (state_space_path, heuristic_path):
+            if(path is None):
+                continue
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+        if(prune):
+            digest.update(b"pruned\0")
+
+        return digest.digest()
+
+    @staticmethod
+    def defaultPath(state_space_path: str, heuristic_path: str = None, prune: bool = False) -> str:
+        """Gets path of the snapshot stored next to the state space file, pruned graph is stored apart from the full one"""
+        suffix = ".pruned.snap" if prune else ".snap"
+        if(heuristic_path is None):
+            return f"{state_space_path}{suffix}"
+        return f"{state_space_path}.{os.path.basename(heuristic_path)}{suffix}"
+
+    @staticmethod
+    def write(path: str, graph: CompiledGraph, heuristic = None, source_hash: bytes = bytes(32)) -> None:
+        """Writes snapshot of compiled graph
+
+        Args:
+            path (str): Path of the snapshot file
+            graph (CompiledGraph): Compiled state space
+            heuristic: Heuristic value of every state indexed by state id, None if there is no heuristic
+            source_hash (bytes): Digest of the source files, see Snapshot.sourceHash
+        """
+        encoded_names = [name.encode("utf-8") for name in graph.names]
+        string_offsets = array('Q', [0])
+        for encoded_name in encoded_names:
+            string_offsets.append(string_offsets[-1] + len(encoded_name))
+
+        flags = 0
+        sections = [string_offsets, b"".join(encoded_names), array('q', graph.offsets), array('i', graph.targets), array('d', graph.costs),
+            array('i', graph.ending_states)]
+        if(heuristic is not None):
+            flags |= Snapshot.FLAG_HEURISTIC
+            sections.append(array('d', heuristic))
+        if(graph.goal_reachable is not None):
+            flags |= Snapshot.FLAG_PRUNED
+            sections.append(bytes(graph.goal_reachable))
+        header = (graph.num_states, graph.num_transitions, len(graph.ending_states), graph.starting_state, string_offsets[-1], source_hash)
+        Snapshot.FORMAT.write(path, header, sections, flags)
+
+    @staticmethod
+    def load(path: str) -> tuple[CompiledGraph, object]:
+        """Memory maps snapshot
+
+        Arrays of the returned graph are views into the mapped file, nothing is parsed or copied.
+
+        Args:
+            path (str): Path of the snapshot file
+
+        Returns:
+            tuple[CompiledGraph, object]: Compiled graph and heuristic indexed by state id (None if snapshot has no heuristic)
+        """
+        reader = Snapshot.FORMAT.open(path)
+        magic, version, flags, num_states, num_transitions, num_ending_states, starting_state, blob_size, source_hash = reader.header
+
+        string_offsets = reader.section('Q', num_states + 1)
+        blob = reader.section('B', blob_size)
+        offsets = reader.section('q', num_states + 1)
+        targets = reader.section('i', num_transitions)
+        costs = reader.section('d', num_transitions)
+        ending_states = list(reader.section('i', num_ending_states))
+        heuristic = None
+        if(flags & Snapshot.FLAG_HEURISTIC):
+            heuristic = reader.section('d', num_states)
+        goal_reachable = None
+        if(flags & Snapshot.FLAG_PRUNED):
+            goal_reachable = reader.section('B', num_states)
+
+        graph = CompiledGraph(StringTable(string_offsets, blob), offsets, targets, costs, starting_state, ending_states, goal_reachable)
+
+        return graph, heuristic
+
+    @staticmethod
+    def compile(state_space_path: str, heuristic_path: str = None, snapshot_path: str = None, prune: bool = False) -> str:
+        """Parses source files and writes their snapshot
+
+        Args:
+            state_space_path (str): Path to state space file
+            heuristic_path (str): Path to heuristic file, None if snapshot should not contain heuristic
+            snapshot_path (str): Path of the snapshot file, Snapshot.defaultPath if None
+            prune (bool): If True dead ends are pruned from the graph before it is written, see CompiledGraph.pruned
+
+        Returns:
+            str: Path of the written snapshot
+        """
+        if(snapshot_path is None):
+            snapshot_path = Snapshot.defaultPath(state_space_path, heuristic_path, prune)
+        source_hash = Snapshot.sourceHash(state_space_path, heuristic_path, prune)
+        graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(state_space_path))
+        if(prune):
+            graph = graph.pruned()
+        heuristic = None
+        if(heuristic_path is not None):
+            heuristic = graph.compileHeuristic(Parser.parseHeuristicDescriptor(heuristic_path))
+        Snapshot.write(snapshot_path, graph, heuristic, source_hash)
+
+        return snapshot_path
+
+    @staticmethod
+    def loadOrCompile(state_space_path: str, heuristic_path: str = None, snapshot_path: str = None, prune: bool = False) -> tuple[CompiledGraph, object]:
+        """Loads snapshot of source files, (re)compiling it first if it is missing, outdated or source files changed
+
+        With prune, dead ends are pruned once when the snapshot is compiled and every later load reuses the pruned graph.
+
+        Returns:
+            tuple[CompiledGraph, object]: Compiled graph and heuristic indexed by state id (None if there is no heuristic)
+        """
+        if(snapshot_path is None):
+            snapshot_path = Snapshot.defaultPath(state_space_path, heuristic_path, prune)
+        source_hash = Snapshot.sourceHash(state_space_path, heuristic_path, prune)
+
+        return Snapshot.FORMAT.loadOrBuild(snapshot_path, lambda header: header[-1] == source_hash,
+            lambda: Snapshot.compile(state_space_path, heuristic_path, snapshot_path, prune), Snapshot.load)
+
+
+class HierarchySnapshot:
+    """Versioned binary snapshot of a contraction hierarchy, stored next to the state space file
+
+    Snapshot layout (see SnapshotFormat):
+        header: magic, version, flags, number of states, upward and downward edges,
+                preprocessing time in nanoseconds, sha256 of state space file
+        rank: int32 (states)
+        upward edges: int64 offsets (states + 1), int32 targets, float64 costs, int32 middles
+        downward edges: same as upward edges
+    """
+    FORMAT = SnapshotFormat(b"SPACH\0\0\0", 1, "=8sIIqqqq32s", "hierarchy snapshot")
+
+    @staticmethod
+    def defaultPath(state_space_path: str) -> str:
+        """Gets path of the hierarchy snapshot stored next to the state space file"""
+        return f"{state_space_path}.ch.snap"
+
+    @staticmethod
+    def write(path: str, hierarchy: ContractionHierarchy, source_hash: bytes = bytes(32), preprocessing_ns: int = 0) -> None:
+        """Writes snapshot of hierarchy
+
+        Args:
+            path (str): Path of the snapshot file
+            hierarchy (ContractionHierarchy): Hierarchy to write
+            source_hash (bytes): Digest of the state space file, see Snapshot.sourceHash
+            preprocessing_ns (int): Time it took to build hierarchy
+        """
+        header = (hierarchy.num_states, len(hierarchy.up_targets), len(hierarchy.down_targets), preprocessing_ns, source_hash)
+        HierarchySnapshot.FORMAT.write(path, header, [array('i', hierarchy.rank),
+            array('q', hierarchy.up_offsets), array('i', hierarchy.up_targets), array('d', hierarchy.up_costs), array('i', hierarchy.up_middles),
+            array('q', hierarchy.down_offsets), array('i', hierarchy.down_targets), array('d', hierarchy.down_costs), array('i', hierarchy.down_middles)])
+
+    @staticmethod
+    def load(path: str) -> ContractionHierarchy:
+        """Memory maps hierarchy snapshot, arrays of the returned hierarchy are views into the mapped file"""
+        reader = HierarchySnapshot.FORMAT.open(path)
+        magic, version, flags, num_states, num_up, num_down, preprocessing_ns, source_hash = reader.header
+
+        rank = reader.section('i', num_states)
+        up = (reader.section('q', num_states + 1), reader.section('i', num_up), reader.section('d', num_up), reader.section('i', num_up))
+        down = (reader.section('q', num_states + 1), reader.section('i', num_down), reader.section('d', num_down), reader.section('i', num_down))
+
+        return ContractionHierarchy(rank, *up, *down)
+
+    @staticmethod
+    def build(state_space_path: str, graph: CompiledGraph = None, snapshot_path: str = None) -> tuple[str, int]:
+        """Builds hierarchy of state space and writes its snapshot
+
+        Args:
+            state_space_path (str): Path to state space file
+            graph (CompiledGraph): Compiled state space, parsed from state_space_path if None
+            snapshot_path (str): Path of the snapshot file, HierarchySnapshot.defaultPath if None
+
+        Returns:
+            tuple[str, int]: Path of the written snapshot and preprocessing time in nanoseconds
+        """
+        if(snapshot_path is None):
+            snapshot_path = HierarchySnapshot.defaultPath(state_space_path)
+        if(graph is None):
+            graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(state_space_path))
+        start = time.perf_counter_ns()
+        hierarchy = ContractionHierarchy.fromCompiledGraph(graph)
+        preprocessing_ns = time.perf_counter_ns() - start
+        HierarchySnapshot.write(snapshot_path, hierarchy, Snapshot.sourceHash(state_space_path), preprocessing_ns)
+
+        return snapshot_path, preprocessing_ns
+
+    @staticmethod
+    def loadOrBuild(state_space_path: str, graph: CompiledGraph = None, snapshot_path: str = None) -> ContractionHierarchy:
+        """Loads hierarchy snapshot of state space, (re)building it first if it is missing, outdated or state space changed"""
+        if(snapshot_path is None):
+            snapshot_path = HierarchySnapshot.defaultPath(state_space_path)
+        source_hash = Snapshot.sourceHash(state_space_path)
+
+        return HierarchySnapshot.FORMAT.loadOrBuild(snapshot_path, lambda header: header[-1] == source_hash,
+            lambda: HierarchySnapshot.build(state_space_path, graph, snapshot_path), HierarchySnapshot.load)
+
+
+class LandmarkSnapshot:
+    """Versioned binary snapshot of ALT landmarks, stored next to the state space file
+
+    Snapshot layout (see SnapshotFormat):
+        header: magic, version, flags, number of states and landmarks,
+                preprocessing time in nanoseconds, sha256 of state space file
+        landmarks: int32 (landmarks)
+        distances from landmarks: float64 (landmarks * states), one row per landmark
+        distances to landmarks: float64 (landmarks * states), one row per landmark
+    """
+    FORMAT = SnapshotFormat(b"SPAALT\0\0", 1, "=8sIIqqq32s", "landmark snapshot")
+
+    @staticmethod
+    def defaultPath(state_space_path: str, k: int) -> str:
+        """Gets path of the snapshot of k landmarks stored next to the state space file"""
+        return f"{state_space_path}.alt{k}.snap"
+
+    @staticmethod
+    def write(path: str, landmarks: Landmarks, num_states: int, source_hash: bytes = bytes(32), preprocessing_ns: int = 0) -> None:
+        """Writes snapshot of landmarks"""
+        rows = [array('d', distances) for distances in landmarks.from_distances + landmarks.to_distances]
+        LandmarkSnapshot.FORMAT.write(path, (num_states, landmarks.k, preprocessing_ns, source_hash), [array('i', landmarks.landmarks)] + rows)
+
+    @staticmethod
+    def load(path: str) -> Landmarks:
+        """Memory maps landmark snapshot, distance arrays of the returned landmarks are views into the mapped file"""
+        reader = LandmarkSnapshot.FORMAT.open(path)
+        magic, version, flags, num_states, k, preprocessing_ns, source_hash = reader.header
+        landmarks = list(reader.section('i', k))
+        rows = [reader.section('d', num_states) for i in range(2 * k)]
+
+        return Landmarks(landmarks, rows[:k], rows[k:])
+
+    @staticmethod
+    def build(state_space_path: str, k: int, graph: CompiledGraph = None, snapshot_path: str = None) -> tuple[str, int]:
+        """Selects landmarks of state space and writes their snapshot
+
+        Args:
+            state_space_path (str): Path to state space file
+            k (int): Number of landmarks
+            graph (CompiledGraph): Compiled state space, parsed from state_space_path if None
+            snapshot_path (str): Path of the snapshot file, LandmarkSnapshot.defaultPath if None
+
+        Returns:
+            tuple[str, int]: Path of the written snapshot and preprocessing time in nanoseconds
+        """
+        if(snapshot_path is None):
+            snapshot_path = LandmarkSnapshot.defaultPath(state_space_path, k)
+        if(graph is None):
+            graph = CompiledGraph.fromStateSpaceDescriptor(Parser.parseStateSpaceDescription(state_space_path))
+        start = time.perf_counter_ns()
+        landmarks = Landmarks.fromCompiledGraph(graph, k)
+        preprocessing_ns = time.perf_counter_ns() - start
+        LandmarkSnapshot.write(snapshot_path, landmarks, graph.num_states, Snapshot.sourceHash(state_space_path), preprocessing_ns)
+
+        return snapshot_path, preprocessing_ns
+
+    @staticmethod
+    def loadOrBuild(state_space_path: str, k: int, graph: CompiledGraph = None, snapshot_path: str = None) -> Landmarks:
+        """Loads landmark snapshot of state space, (re)building it first if it is missing, outdated or state space changed"""
+        if(snapshot_path is None):
+            snapshot_path = LandmarkSnapshot.defaultPath(state_space_path, k)
+        source_hash = Snapshot.sourceHash(state_space_path)
+
+        return LandmarkSnapshot.FORMAT.loadOrBuild(snapshot_path, lambda header: header[-1] == source_hash,
+            lambda: LandmarkSnapshot.build(state_space_path, k, graph, snapshot_path), LandmarkSnapshot.load)
+
+
+class PatternDatabaseSnapshot:
+    """Versioned binary snapshot of a puzzle pattern database
+
+    Puzzles have no source file, so snapshot is identified by its path and header: puzzle size, goal and pattern.
+
+    Snapshot layout (see SnapshotFormat):
+        header: magic, version, flags, puzzle size, packed goal, number of entries,
+                preprocessing time in nanoseconds, pattern tiles padded with zeros to 16 bytes
+        table: uint8 (entries)
+    """
+    FORMAT = SnapshotFormat(b"SPAPDB\0\0", 1, "=8sIIqqqq16s", "pattern database snapshot")
+
+    @staticmethod
+    def defaultPath(directory: str, size: int, goal: int, pattern: tuple) -> str:
+        """Gets path of the snapshot of pattern database in directory"""
+        return os.path.join(directory, f"pdb{size}_{goal:x}_{bytes(pattern).hex()}.snap")
+
+    @staticmethod
+    def write(path: str, database: PatternDatabase, preprocessing_ns: int = 0) -> None:
+        """Writes snapshot of pattern database"""
+        header = (database.size, database.goal, len(database.table), preprocessing_ns, bytes(database.pattern))
+        PatternDatabaseSnapshot.FORMAT.write(path, header, [database.table])
+
+    @staticmethod
+    def load(path: str) -> PatternDatabase:
+        """Memory maps pattern database snapshot, table of the returned database is a view into the mapped file"""
+        reader = PatternDatabaseSnapshot.FORMAT.open(path)
+        magic, version, flags, size, goal, num_entries, preprocessing_ns, pattern = reader.header
+
+        return PatternDatabase(size, goal, tuple(pattern.rstrip(b"\0")), reader.section('B', num_entries))
+
+    @staticmethod
+    def build(directory: str, puzzle, pattern: tuple, snapshot_path: str = None) -> tuple[str, int]:
+        """Builds pattern database of puzzle and writes its snapshot
+
+        Args:
+            directory (str): Directory in which snapshot is stored
+            puzzle (NPuzzle): Puzzle whose ending state is the goal of the database
+            pattern (tuple): Tiles of the pattern
+            snapshot_path (str): Path of the snapshot file, PatternDatabaseSnapshot.defaultPath if None
+
+        Returns:
+            tuple[str, int]: Path of the written snapshot and preprocessing time in nanoseconds
+        """
+        if(snapshot_path is None):
+            snapshot_path = PatternDatabaseSnapshot.defaultPath(directory, puzzle.size, puzzle.ending_states[0], pattern)
+        start = time.perf_counter_ns()
+        database = PatternDatabase.build(puzzle, pattern)
+        preprocessing_ns = time.perf_counter_ns() - start
+        PatternDatabaseSnapshot.write(snapshot_path, database, preprocessing_ns)
+
+        return snapshot_path, preprocessing_ns
+
+    @staticmethod
+    def loadOrBuild(directory: str, puzzle, pattern: tuple) -> PatternDatabase:
+        """Loads pattern database snapshot from directory, building it first if it is missing or outdated"""
+        snapshot_path = PatternDatabaseSnapshot.defaultPath(directory, puzzle.size, puzzle.ending_states[0], pattern)
+        goal = puzzle.ending_states[0]
+
+        return PatternDatabaseSnapshot.FORMAT.loadOrBuild(snapshot_path,
+            lambda header: header[3:5] == (puzzle.size, goal) and header[-1].rstrip(b"\0") == bytes(pattern),
+            lambda: PatternDatabaseSnapshot.build(directory, puzzle, pattern, snapshot_path), PatternDatabaseSnapshot.load)
@@ -2,9 +2,9 @@ import time
 
 def measure_time(func):
     def wrapper(*args, **kwargs):
-        start = time.time()
+        start = time.perf_counter()
         ret_value = func(*args, **kwargs)
-        end = time.time()
+        end = time.perf_counter()
         print(end - start)
         return ret_value
     